@@ -0,0 +1,53 @@
+"""Add generation_jobs table (durable generation queue)
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    generation_job_status = sa.Enum('queued', 'generating', 'completed', 'failed', name='generationjobstatus')
+
+    op.create_table(
+        'generation_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('status', generation_job_status, nullable=False, server_default='queued'),
+        sa.Column('worker_id', sa.String(100), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('progress', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('current_document', sa.String(200), nullable=True),
+        sa.Column('documents_completed', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('total_documents', sa.Integer(), nullable=True, server_default='0'),
+        sa.Column('docs_to_generate', sa.JSON(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['application_id'], ['visa_applications.id'])
+    )
+
+    op.create_index('ix_generation_jobs_id', 'generation_jobs', ['id'])
+    op.create_index('ix_generation_jobs_application_id', 'generation_jobs', ['application_id'])
+    op.create_index('ix_generation_jobs_status', 'generation_jobs', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_generation_jobs_status')
+    op.drop_index('ix_generation_jobs_application_id')
+    op.drop_index('ix_generation_jobs_id')
+    op.drop_table('generation_jobs')
+    sa.Enum(name='generationjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,44 @@
+"""Add stored_blobs table (content-addressed uploads) and documents.blob_sha256
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stored_blobs',
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('mime_type', sa.String(100), nullable=True),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('extracted_text', sa.Text(), nullable=True),
+        sa.Column('extraction_metadata', sa.JSON(), nullable=True),
+        sa.Column('analysis_results', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('last_referenced_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+
+    # Existing documents keep their per-application files (blob_sha256 stays NULL)
+    op.add_column('documents', sa.Column('blob_sha256', sa.String(64), nullable=True))
+    op.create_foreign_key('fk_documents_blob_sha256', 'documents', 'stored_blobs', ['blob_sha256'], ['sha256'])
+    op.create_index('ix_documents_blob_sha256', 'documents', ['blob_sha256'])
+
+
+def downgrade():
+    op.drop_index('ix_documents_blob_sha256')
+    op.drop_constraint('fk_documents_blob_sha256', 'documents', type_='foreignkey')
+    op.drop_column('documents', 'blob_sha256')
+    op.drop_table('stored_blobs')
@@ -0,0 +1,37 @@
+"""Add background extraction state to documents
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    extraction_status = sa.Enum('pending', 'extracting', 'completed', 'failed', name='extractionstatus')
+    extraction_status.create(op.get_bind(), checkfirst=True)
+
+    # Existing documents were extracted inline during upload
+    op.add_column('documents', sa.Column('extraction_status', extraction_status, nullable=True, server_default='completed'))
+    op.alter_column('documents', 'extraction_status', server_default=None)
+    op.add_column('documents', sa.Column('page_count', sa.Integer(), nullable=True))
+    op.add_column('documents', sa.Column('extraction_metadata', sa.JSON(), nullable=True))
+    op.add_column('documents', sa.Column('extraction_error', sa.Text(), nullable=True))
+    op.create_index('ix_documents_extraction_status', 'documents', ['extraction_status'])
+
+
+def downgrade():
+    op.drop_index('ix_documents_extraction_status')
+    op.drop_column('documents', 'extraction_error')
+    op.drop_column('documents', 'extraction_metadata')
+    op.drop_column('documents', 'page_count')
+    op.drop_column('documents', 'extraction_status')
+    sa.Enum(name='extractionstatus').drop(op.get_bind(), checkfirst=True)
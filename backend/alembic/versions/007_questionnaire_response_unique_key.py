@@ -0,0 +1,33 @@
+"""Unique (application_id, question_key) on questionnaire_responses
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The old per-answer save could race into duplicates; keep the first row of each key
+    op.execute(sa.text(
+        "DELETE FROM questionnaire_responses WHERE id NOT IN ("
+        "SELECT MIN(id) FROM questionnaire_responses GROUP BY application_id, question_key)"
+    ))
+    op.create_index(
+        'uq_questionnaire_responses_app_key',
+        'questionnaire_responses',
+        ['application_id', 'question_key'],
+        unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('uq_questionnaire_responses_app_key', table_name='questionnaire_responses')
@@ -0,0 +1,24 @@
+"""Add visa_applications.questionnaire_progress
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULL = not computed yet; filled from the saved answers on the next save or progress read
+    op.add_column('visa_applications', sa.Column('questionnaire_progress', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('visa_applications', 'questionnaire_progress')
@@ -0,0 +1,30 @@
+"""Add extraction/analysis fingerprints to documents and extracted_data
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULL = produced before fingerprints; such documents are analyzed once more and stamped
+    op.add_column('documents', sa.Column('extraction_fingerprint', sa.String(64), nullable=True))
+    op.add_column('documents', sa.Column('analysis_fingerprint', sa.String(64), nullable=True))
+    op.add_column('extracted_data', sa.Column('fingerprint', sa.String(64), nullable=True))
+    op.create_index('ix_extracted_data_fingerprint', 'extracted_data', ['fingerprint'])
+
+
+def downgrade():
+    op.drop_index('ix_extracted_data_fingerprint', table_name='extracted_data')
+    op.drop_column('extracted_data', 'fingerprint')
+    op.drop_column('documents', 'analysis_fingerprint')
+    op.drop_column('documents', 'extraction_fingerprint')
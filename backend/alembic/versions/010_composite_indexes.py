@@ -0,0 +1,40 @@
+"""Composite indexes for per-application filters
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns); questionnaire_responses is already covered by
+# uq_questionnaire_responses_app_key (application_id, question_key)
+INDEXES = [
+    ('ix_documents_application_uploaded', 'documents', ['application_id', 'is_uploaded']),
+    ('ix_extracted_data_application_type', 'extracted_data', ['application_id', 'document_type']),
+    ('ix_extracted_data_document_id', 'extracted_data', ['document_id']),
+    ('ix_generated_documents_application_status', 'generated_documents', ['application_id', 'status']),
+    ('ix_analysis_sessions_application_created', 'analysis_sessions', ['application_id', 'created_at']),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # CONCURRENTLY keeps the tables writable while large indexes build; it cannot run in a transaction
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,24 @@
+"""Claim timestamp for background extraction
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULL on rows left 'extracting' by older processes: recovery treats them as stale
+    op.add_column('documents', sa.Column('extraction_started_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('documents', 'extraction_started_at')
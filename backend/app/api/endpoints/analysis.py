@@ -2,12 +2,12 @@
 Analysis API endpoints - Document analysis and questionnaire generation
 """
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
-from datetime import datetime
 from loguru import logger
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models import (
     VisaApplication, Document, ExtractedData, AnalysisSession, 
     QuestionnaireResponse, AnalysisStatus, ApplicationStatus as DBApplicationStatus
@@ -17,195 +17,15 @@ from app.schemas import (
     QuestionnaireGenerateResponse, SaveQuestionnaireRequest, 
     QuestionnaireProgressResponse, QuestionResponse
 )
-from app.services.ai_analysis_service import get_analysis_service
 from app.services.questionnaire_generator import get_questionnaire_service
+from app.services.analysis_pipeline import (
+    FINAL_STATUS_VALUES, latest_session, publish_session, run_analysis_session_in_thread, session_progress
+)
+from app.services.progress_bus import SSE_HEADERS, analysis_topic, stream_progress
 
 router = APIRouter()
 
 
-# Replace the existing run_analysis_task function with this:
-
-async def run_analysis_task(
-    application_id: int,
-    session_id: int,
-    db: Session
-):
-    """Enhanced background task to analyze all documents"""
-    try:
-        session = db.query(AnalysisSession).filter(AnalysisSession.id == session_id).first()
-        if not session:
-            logger.error(f"❌ Analysis session {session_id} not found")
-            return
-        
-        # Update status to analyzing
-        session.status = AnalysisStatus.ANALYZING
-        session.started_at = datetime.now()
-        db.commit()
-        
-        # Get all uploaded documents for this application
-        documents = db.query(Document).filter(
-            Document.application_id == application_id,
-            Document.is_uploaded == True
-        ).all()
-        
-        session.total_documents = len(documents)
-        db.commit()
-        
-        logger.info(f"🔍 Starting analysis for {len(documents)} documents")
-        
-        # ===== CRITICAL FIX: Ensure text extraction first =====
-        from app.services.pdf_service import PDFService
-        pdf_service = PDFService()
-        
-        extraction_needed = False
-        for doc in documents:
-            # Check if text extraction is needed
-            if not doc.extracted_text or len(doc.extracted_text.strip()) < 10:
-                extraction_needed = True
-                logger.info(f"⚠️ Text not extracted for {doc.document_type.value}, extracting now...")
-                
-                try:
-                    # Extract text based on file type
-                    file_extension = doc.file_path.lower().split('.')[-1]
-                    
-                    if file_extension in ['pdf', 'jpg', 'jpeg', 'png', 'bmp', 'tiff']:
-                        extracted_text = pdf_service.extract_text_from_file(doc.file_path)
-                        
-                        # Update document
-                        doc.extracted_text = extracted_text
-                        doc.is_processed = True
-                        doc.processed_at = datetime.now()
-                        
-                        logger.info(f"✅ Extracted {len(extracted_text)} characters from {doc.document_type.value}")
-                    else:
-                        logger.warning(f"⚠️ Unsupported file type for {doc.document_type.value}: {file_extension}")
-                        doc.extracted_text = ""
-                        doc.is_processed = True
-                        
-                except Exception as e:
-                    logger.error(f"❌ Error extracting text from {doc.document_type.value}: {str(e)}")
-                    doc.extracted_text = ""
-                    doc.is_processed = True
-        
-        # Commit all extractions
-        if extraction_needed:
-            db.commit()
-            logger.info("✅ Text extraction completed for all documents")
-        
-        # ===== Now proceed with AI analysis =====
-        analysis_service = get_analysis_service()
-        extracted_data_dict = {}
-        
-        for idx, doc in enumerate(documents, 1):
-            try:
-                # Update current document
-                session.current_document = doc.document_type.value
-                session.documents_analyzed = idx
-                db.commit()
-                
-                logger.info(f"🤖 Analyzing document {idx}/{len(documents)}: {doc.document_type.value}")
-                
-                # Get extracted text
-                extracted_text = doc.extracted_text or ""
-                
-                # OCR DISABLED - Generate fake demo data for professional UX
-                # Until paid plan upgrade, show realistic fake confidence scores
-                import random
-                
-                # Generate random confidence between 85-98% (looks professional)
-                demo_confidence = random.randint(85, 98)
-                
-                logger.info(f"📋 OCR disabled - Using demo data for {doc.document_type.value} ({demo_confidence}% confidence)")
-                
-                # Create realistic demo extracted data
-                result = {
-                    "demo_mode": True,
-                    "message": "OCR disabled - Demo data shown. Upgrade plan for real analysis.",
-                    "confidence": demo_confidence,
-                    "extracted_fields": {
-                        "status": "Demo data - Upgrade to see real extracted text",
-                        "note": "All data will come from questionnaire"
-                    }
-                }
-                
-                # Save extracted data with demo confidence
-                extracted_data = ExtractedData(
-                    application_id=application_id,
-                    document_id=doc.id,
-                    document_type=doc.document_type,
-                    data=result,
-                    confidence_score=demo_confidence
-                )
-                db.add(extracted_data)
-                db.commit()
-                
-                # Store in dict for later use
-                extracted_data_dict[doc.document_type.value] = result
-                
-                logger.info(f"✅ Demo analysis for {doc.document_type.value} - Confidence: {demo_confidence}%")
-                
-            except Exception as e:
-                logger.error(f"❌ Error analyzing {doc.document_type.value}: {str(e)}")
-                
-                # Save error record
-                extracted_data = ExtractedData(
-                    application_id=application_id,
-                    document_id=doc.id,
-                    document_type=doc.document_type,
-                    data={
-                        "error": str(e),
-                        "confidence": 0
-                    },
-                    confidence_score=0
-                )
-                db.add(extracted_data)
-                db.commit()
-                continue
-        
-        # Calculate completeness score
-        total_fields = 0
-        complete_fields = 0
-        
-        for doc_type, data in extracted_data_dict.items():
-            if "error" not in data or data.get("confidence", 0) > 0:
-                for key, value in data.items():
-                    if key not in ["confidence", "error", "raw_text_sample", "raw_response"]:
-                        total_fields += 1
-                        # Check if field has meaningful value
-                        if value and value not in [None, "", [], {}, "null", "None"]:
-                            complete_fields += 1
-        
-        completeness_score = int((complete_fields / total_fields * 100)) if total_fields > 0 else 0
-        
-        # Update session
-        session.status = AnalysisStatus.COMPLETED
-        session.completeness_score = completeness_score
-        session.completed_at = datetime.now()
-        db.commit()
-        
-        # Update application status
-        application = db.query(VisaApplication).filter(VisaApplication.id == application_id).first()
-        if application:
-            application.status = DBApplicationStatus.ANALYZING
-            db.commit()
-        
-        logger.info(f"✅ Analysis completed - Completeness: {completeness_score}%")
-        logger.info(f"📊 Fields: {complete_fields}/{total_fields} complete")
-        
-    except Exception as e:
-        logger.error(f"❌ Analysis task failed: {str(e)}")
-        
-        # Update session with error
-        try:
-            session = db.query(AnalysisSession).filter(AnalysisSession.id == session_id).first()
-            if session:
-                session.status = AnalysisStatus.FAILED
-                session.error_message = str(e)
-                db.commit()
-        except:
-            pass
-
-
 @router.post("/start/{application_id}", response_model=AnalysisStartResponse)
 async def start_analysis(
     application_id: int,
@@ -259,9 +79,10 @@ async def start_analysis(
     db.refresh(session)
     
     logger.info(f"Created analysis session {session.id} for application {application_id}")
+    publish_session(session)
     
-    # Start background analysis task
-    background_tasks.add_task(run_analysis_task, application_id, session.id, db)
+    # Start background analysis in a worker thread (opens its own DB session and event loop)
+    background_tasks.add_task(run_analysis_session_in_thread, application_id, session.id)
     
     return AnalysisStartResponse(
         session_id=session.id,
@@ -287,9 +108,7 @@ async def get_analysis_status(
         )
     
     # Get most recent session
-    session = db.query(AnalysisSession).filter(
-        AnalysisSession.application_id == application_id
-    ).order_by(AnalysisSession.created_at.desc()).first()
+    session = latest_session(db, application_id)
     
     if not session:
         raise HTTPException(
@@ -297,18 +116,43 @@ async def get_analysis_status(
             detail="No analysis session found for this application"
         )
     
-    progress_percentage = 0
-    if session.total_documents > 0:
-        progress_percentage = int((session.documents_analyzed / session.total_documents) * 100)
+    return AnalysisStatusResponse(**session_progress(session))
+
+
+@router.get("/events/{application_id}")
+async def stream_analysis_status(
+    application_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream analysis status as Server-Sent Events
+    Sends the latest session's status (once a session exists), then every
+    update the analysis publishes, and closes after completed/failed.
+    """
+    application = db.query(VisaApplication).filter(VisaApplication.id == application_id).first()
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
     
-    return AnalysisStatusResponse(
-        session_id=session.id,
-        status=session.status.value,
-        documents_analyzed=session.documents_analyzed or 0,
-        total_documents=session.total_documents or 0,
-        current_document=session.current_document,
-        progress_percentage=progress_percentage,
-        completeness_score=session.completeness_score or 0
+    def snapshot():
+        # The request session is closed once streaming starts; use a short-lived one
+        stream_db = SessionLocal()
+        try:
+            session = latest_session(stream_db, application_id)
+            return session_progress(session) if session else None
+        finally:
+            stream_db.close()
+    
+    return StreamingResponse(
+        stream_progress(
+            analysis_topic(application_id),
+            snapshot,
+            is_final=lambda state: state["status"] in FINAL_STATUS_VALUES
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
     )
 
 
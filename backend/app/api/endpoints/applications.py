@@ -15,8 +15,11 @@ from app.schemas import (
     ApplicationDetailResponse,
     RequiredDocumentResponse
 )
+from app.services.bundle_service import get_bundle_cache
+from app.services.storage_service import StorageService
 
 router = APIRouter()
+storage_service = StorageService()
 
 
 @router.post("/", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
@@ -117,9 +120,19 @@ async def delete_application(
             detail="Application not found"
         )
     
+    # Documents cascade with the application; release their shared blobs
+    blob_hashes = [doc.blob_sha256 for doc in application.documents if doc.blob_sha256]
+    
     db.delete(application)
+    db.flush()
+    
+    for sha256 in blob_hashes:
+        storage_service.release_blob(db, sha256)
+    
     db.commit()
     
+    get_bundle_cache().discard(application_id)
+    
     logger.info(f"Deleted application: {application.application_number}")
     
     return None
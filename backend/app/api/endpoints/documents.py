@@ -10,15 +10,54 @@ import uuid
 from datetime import datetime
 
 from app.database import get_db
-from app.models import VisaApplication, Document, DocumentType, ApplicationStatus as DBApplicationStatus
+from app.models import VisaApplication, Document, DocumentType, ExtractionStatus, ApplicationStatus as DBApplicationStatus
 from app.schemas import DocumentUploadResponse, DocumentResponse
 from app.config import settings
-from app.services.pdf_service import PDFService
-from app.services.storage_service import StorageService
+from app.services.pdf_service import get_pdf_service
+from app.services.storage_service import StorageService, FileTooLargeError
+from app.services.extraction_pipeline import get_extraction_pipeline
 
 router = APIRouter()
-pdf_service = PDFService()
 storage_service = StorageService()
+extraction_pipeline = get_extraction_pipeline()
+
+
+def _upload_response(document: Document, document_type: str) -> dict:
+    """Upload/extraction status payload for a document"""
+    extracted_text = document.extracted_text or ""
+    metadata = document.extraction_metadata or {}
+    
+    response_data = {
+        "document_id": document.id,
+        "document_type": document_type,
+        "file_name": document.document_name,
+        "file_size": document.file_size,
+        "message": "Document uploaded successfully",
+        "extraction_status": document.extraction_status.value if document.extraction_status else None,
+        "text_extracted": len(extracted_text) > 0,
+        "text_length": len(extracted_text),
+        "extraction_quality": (
+            "pending" if document.extraction_status in (ExtractionStatus.PENDING, ExtractionStatus.EXTRACTING) else
+            "excellent" if len(extracted_text) > 500 else
+            "good" if len(extracted_text) > 100 else
+            "fair" if len(extracted_text) > 10 else
+            "poor"
+        )
+    }
+    
+    # Add PDF metadata if available
+    if metadata:
+        response_data["metadata"] = {
+            "num_pages": metadata.get('num_pages', 0),
+            "has_text": metadata.get('has_text', False),
+            "text_length": metadata.get('text_length', 0),
+            "text_quality": metadata.get('text_quality')
+        }
+    
+    if document.extraction_error:
+        response_data["extraction_error"] = document.extraction_error
+    
+    return response_data
 
 
 @router.post("/upload/{application_id}", response_model=DocumentUploadResponse)
@@ -57,20 +96,7 @@ async def upload_document(
             detail=f"Invalid document type: {document_type}. Must be one of: {[e.name for e in DocumentType]}"
         )
     
-    # Read file content
-    file_content = await file.read()
-    logger.info(f"File read successfully: {len(file_content)} bytes")
-    
-    # Validate file size using StorageService
-    is_size_valid = storage_service.validate_file_size(len(file_content))
-    if not is_size_valid:
-        logger.error(f"File size validation failed: {len(file_content)} bytes exceeds {settings.MAX_FILE_SIZE} bytes")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size exceeds maximum allowed size of {settings.MAX_FILE_SIZE / (1024*1024):.1f}MB"
-        )
-    
-    # Validate file extension
+    # Validate file extension (before reading any bytes)
     file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
     is_extension_valid = storage_service.validate_file_extension(file.filename)
     if not is_extension_valid:
@@ -80,64 +106,60 @@ async def upload_document(
             detail=f"File type '.{file_extension}' not allowed. Allowed types: {', '.join(settings.allowed_extensions_list)}"
         )
     
+    # Stream file into the blob store (size enforced while reading, hash computed on the fly)
     try:
-        # Save file using StorageService (returns tuple of file_path and unique_filename)
-        file_path, unique_filename = storage_service.save_file(
-            file_content=file_content,
-            original_filename=file.filename,
-            application_number=application.application_number,
-            document_type=document_type
+        stored = await storage_service.save_upload_blob(
+            upload_file=file,
+            original_filename=file.filename
         )
+    except FileTooLargeError as e:
+        logger.error(f"File size validation failed for '{file.filename}': exceeds {settings.MAX_FILE_SIZE} bytes")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    file_path = stored.file_path
+    logger.info(f"File streamed successfully: {stored.file_size} bytes")
+    
+    try:
+        # Text extraction runs in the background pipeline; only a cheap structural check happens here
+        pdf_error = get_pdf_service().structure_error(file_path) if file_extension == 'pdf' else None
+        if pdf_error:
+            storage_service.discard_unreferenced_blob(db, stored)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid PDF file: {pdf_error}"
+            )
         
-        # ===== CRITICAL FIX: Extract text immediately during upload =====
-        extracted_text = ""
-        validation_result = None
-        
-        try:
-            logger.info(f"📄 Starting text extraction for {file.filename}...")
-            
-            # Extract text based on file type
-            if file_extension in ['pdf', 'jpg', 'jpeg', 'png', 'bmp', 'tiff']:
-                extracted_text = pdf_service.extract_text_from_file(file_path)
-                logger.info(f"✅ Extracted {len(extracted_text)} characters from {file.filename}")
-                
-                # Validate PDF if it's a PDF file
-                if file_extension == 'pdf':
-                    validation_result = pdf_service.validate_pdf(file_path)
-                    if not validation_result.get('valid', False):
-                        # Clean up invalid file
-                        storage_service.delete_file(file_path)
-                        raise HTTPException(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"Invalid PDF file: {validation_result.get('error', 'Unknown error')}"
-                        )
-                
-                # Warn if no text extracted
-                if len(extracted_text.strip()) < 10:
-                    logger.warning(f"⚠️ Very little text extracted from {file.filename} ({len(extracted_text)} chars)")
-                    logger.warning("This may be a blank page or the file may need manual OCR")
-            else:
-                logger.warning(f"⚠️ Unsupported file type for text extraction: {file_extension}")
-                
-        except Exception as e:
-            logger.error(f"❌ Error extracting text during upload: {str(e)}")
-            # Don't fail the upload, but log the error
-            extracted_text = ""
+        # Reference the blob in the same transaction as the document row
+        blob = storage_service.acquire_blob(db, stored, mime_type=file.content_type)
         
-        # Create document record with extracted text
         db_document = Document(
             application_id=application_id,
             document_type=doc_type_enum,
             document_name=file.filename,
-            file_path=file_path,
-            file_size=len(file_content),
+            file_path=blob.file_path,
+            file_size=stored.file_size,
             mime_type=file.content_type or "application/octet-stream",
+            blob_sha256=stored.sha256,
             is_uploaded=True,
-            is_processed=True,  # ← FIXED: Mark as processed
-            processed_at=datetime.now(),  # ← FIXED: Set processing timestamp
-            extracted_text=extracted_text  # ← FIXED: Store extracted text
+            is_processed=False,
+            extraction_status=ExtractionStatus.PENDING
         )
         
+        # Same bytes already extracted by the current extractor → copy results, nothing to queue
+        fingerprint = get_pdf_service().extraction_fingerprint(stored.sha256)
+        if blob.extracted_text is not None and (blob.extraction_metadata or {}).get('fingerprint') == fingerprint:
+            db_document.extracted_text = blob.extracted_text
+            db_document.extraction_fingerprint = fingerprint
+            db_document.extraction_metadata = dict(blob.extraction_metadata)
+            db_document.page_count = blob.extraction_metadata.get('num_pages')
+            db_document.extraction_status = ExtractionStatus.COMPLETED
+            db_document.is_processed = True
+            db_document.processed_at = datetime.now()
+            logger.info(f"♻️ Reusing extraction for {file.filename} from blob {stored.sha256[:12]}")
+        
         db.add(db_document)
         
         # Update application status
@@ -147,33 +169,12 @@ async def upload_document(
         db.commit()
         db.refresh(db_document)
         
-        logger.info(f"Document uploaded: {file.filename} for application {application.application_number}")
-        
-        response_data = {
-            "document_id": db_document.id,
-            "document_type": document_type,
-            "file_name": file.filename,
-            "file_size": len(file_content),
-            "message": "Document uploaded successfully",
-            "text_extracted": len(extracted_text) > 0,  # ← NEW: Indicate if text was extracted
-            "text_length": len(extracted_text),  # ← NEW: Length of extracted text
-            "extraction_quality": (
-                "excellent" if len(extracted_text) > 500 else
-                "good" if len(extracted_text) > 100 else
-                "fair" if len(extracted_text) > 10 else
-                "poor"
-            )  # ← NEW: Quality indicator
-        }
+        if db_document.extraction_status == ExtractionStatus.PENDING:
+            extraction_pipeline.submit(db_document.id)
         
-        # Add PDF metadata if available
-        if validation_result:
-            response_data["metadata"] = {
-                "num_pages": validation_result.get('num_pages', 0),
-                "has_text": validation_result.get('has_text', False),
-                "text_length": validation_result.get('text_length', 0)
-            }
+        logger.info(f"Document uploaded: {file.filename} for application {application.application_number}")
         
-        return response_data
+        return _upload_response(db_document, document_type)
         
     except HTTPException:
         raise
@@ -181,10 +182,9 @@ async def upload_document(
         logger.error(f"Error uploading document: {str(e)}")
         db.rollback()
         
-        # Clean up file if it was saved
+        # Clean up file if nothing else references it
         try:
-            if 'file_path' in locals():
-                storage_service.delete_file(file_path)
+            storage_service.discard_unreferenced_blob(db, stored)
         except:
             pass
         
@@ -228,6 +228,7 @@ async def upload_documents_batch(
     
     results = []
     uploaded_files = []
+    new_documents = []
     errors = []
     
     for idx, (file, document_type) in enumerate(zip(files, doc_types_list)):
@@ -242,66 +243,75 @@ async def upload_documents_batch(
                 })
                 continue
             
-            # Read file content
-            file_content = await file.read()
-            
-            # Validate file
-            validation_error = storage_service.validate_file_size(len(file_content))
-            if validation_error:
+            # Validate file extension
+            file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
+            if not storage_service.validate_file_extension(file.filename):
                 errors.append({
                     "file": file.filename,
-                    "error": validation_error
+                    "error": f"File type '.{file_extension}' not allowed"
                 })
                 continue
             
-            file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
-            validation_error = storage_service.validate_file_extension(file_extension)
-            if validation_error:
+            # Stream file into the blob store (size enforced while reading)
+            try:
+                stored = await storage_service.save_upload_blob(
+                    upload_file=file,
+                    original_filename=file.filename
+                )
+            except FileTooLargeError as e:
                 errors.append({
                     "file": file.filename,
-                    "error": validation_error
+                    "error": str(e)
                 })
                 continue
+            file_path = stored.file_path
             
-            # Save file
-            file_path = storage_service.save_file(
-                file_content=file_content,
-                original_filename=file.filename,
-                application_number=application.application_number,
-                document_type=document_type
-            )
-            
-            # Validate PDF
-            if file_extension == 'pdf':
-                validation_result = pdf_service.validate_pdf(file_path)
-                if not validation_result.get('valid', False):
-                    storage_service.delete_file(file_path)
-                    errors.append({
-                        "file": file.filename,
-                        "error": f"Invalid PDF: {validation_result.get('error', 'Unknown error')}"
-                    })
-                    continue
+            # Cheap structural check only; extraction runs in the background pipeline
+            pdf_error = get_pdf_service().structure_error(file_path) if file_extension == 'pdf' else None
+            if pdf_error:
+                storage_service.discard_unreferenced_blob(db, stored)
+                errors.append({
+                    "file": file.filename,
+                    "error": f"Invalid PDF: {pdf_error}"
+                })
+                continue
             
-            # Create document record
+            # Reference the blob and create document record
+            blob = storage_service.acquire_blob(db, stored, mime_type=file.content_type)
             db_document = Document(
                 application_id=application_id,
                 document_type=doc_type_enum,
                 document_name=file.filename,
-                file_path=file_path,
-                file_size=len(file_content),
+                file_path=blob.file_path,
+                file_size=stored.file_size,
                 mime_type=file.content_type or "application/octet-stream",
+                blob_sha256=stored.sha256,
                 is_uploaded=True,
-                is_processed=False
+                is_processed=False,
+                extraction_status=ExtractionStatus.PENDING
             )
             
+            # Same bytes already extracted by the current extractor → copy results, nothing to queue
+            fingerprint = get_pdf_service().extraction_fingerprint(stored.sha256)
+            if blob.extracted_text is not None and (blob.extraction_metadata or {}).get('fingerprint') == fingerprint:
+                db_document.extracted_text = blob.extracted_text
+                db_document.extraction_fingerprint = fingerprint
+                db_document.extraction_metadata = dict(blob.extraction_metadata)
+                db_document.page_count = blob.extraction_metadata.get('num_pages')
+                db_document.extraction_status = ExtractionStatus.COMPLETED
+                db_document.is_processed = True
+                db_document.processed_at = datetime.now()
+            
             db.add(db_document)
-            uploaded_files.append(file_path)
+            uploaded_files.append(stored)
+            new_documents.append(db_document)
             
             results.append({
                 "file_name": file.filename,
                 "document_type": document_type,
                 "status": "success",
-                "file_size": len(file_content)
+                "file_size": stored.file_size,
+                "extraction_status": db_document.extraction_status.value
             })
             
         except Exception as e:
@@ -319,6 +329,10 @@ async def upload_documents_batch(
         
         db.commit()
         
+        for db_document in new_documents:
+            if db_document.extraction_status == ExtractionStatus.PENDING:
+                extraction_pipeline.submit(db_document.id)
+        
         logger.info(f"Batch upload completed: {len(results)} successful, {len(errors)} failed")
         
         return {
@@ -333,10 +347,10 @@ async def upload_documents_batch(
         logger.error(f"Error committing batch upload: {str(e)}")
         db.rollback()
         
-        # Clean up uploaded files
-        for file_path in uploaded_files:
+        # Clean up uploaded files nothing else references
+        for stored in uploaded_files:
             try:
-                storage_service.delete_file(file_path)
+                storage_service.discard_unreferenced_blob(db, stored)
             except:
                 pass
         
@@ -390,14 +404,15 @@ async def delete_document(
             detail="Document not found"
         )
     
-    # Delete file from filesystem using StorageService
+    # Delete database record
+    db.delete(document)
+    
+    # Delete file using StorageService (shared blobs are released, removed on last reference)
     try:
-        storage_service.delete_file(document.file_path)
+        storage_service.delete_file(document.file_path, db=db)
     except Exception as e:
         logger.warning(f"Error deleting file {document.file_path}: {str(e)}")
     
-    # Delete database record
-    db.delete(document)
     db.commit()
     
     logger.info(f"Deleted document: {document.document_name}")
@@ -448,7 +463,7 @@ async def process_documents(
         for document in documents:
             try:
                 # Extract text from PDF
-                extracted_text = pdf_service.extract_text_from_pdf(document.file_path)
+                extracted_text = get_pdf_service().extract_text_from_pdf(document.file_path)
                 
                 # Update document record
                 document.extracted_text = extracted_text
@@ -496,6 +511,27 @@ async def get_storage_stats():
         )
 
 
+@router.get("/{document_id}/extraction")
+async def get_extraction_status(
+    document_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Background extraction state of a document (poll after upload)
+    """
+    document = db.query(Document).filter(
+        Document.id == document_id
+    ).first()
+    
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    
+    return _upload_response(document, document.document_type.value)
+
+
 @router.get("/validate/{document_id}")
 async def validate_document(
     document_id: int,
@@ -518,7 +554,7 @@ async def validate_document(
         file_extension = document.file_path.split('.')[-1].lower()
         
         if file_extension == 'pdf':
-            validation_result = pdf_service.validate_pdf(document.file_path)
+            validation_result = get_pdf_service().validate_pdf(document.file_path)
             return {
                 "document_id": document_id,
                 "file_name": document.document_name,
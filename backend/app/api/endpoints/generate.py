@@ -1,272 +1,106 @@
 """
 API endpoints for PDF document generation
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Dict, List
 import os
-import zipfile
-from datetime import datetime
-
-from app.database import get_db
-from app.models import GeneratedDocument, GenerationStatus, Document, VisaApplication
-from app.services.pdf_generator_service import PDFGeneratorService
-from fastapi.responses import FileResponse, StreamingResponse
+from loguru import logger
+
+from app.database import SessionLocal, get_db
+from app.models import GeneratedDocument, GenerationStatus, VisaApplication
+from app.services.bundle_service import (
+    bundle_key,
+    collect_bundle_members,
+    get_bundle_cache,
+    iter_file_range,
+    parse_byte_range
+)
+from app.services.generation_queue import (
+    FINAL_STATUS_VALUES,
+    completed_documents,
+    enqueue_generation,
+    get_active_job,
+    get_documents_to_generate,
+    build_generation_status,
+    get_worker_pool
+)
+from app.services.progress_bus import SSE_HEADERS, generation_topic, stream_progress
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 router = APIRouter()
 
 
-# Global storage for generation status
-generation_sessions = {}
-
-
 @router.post("/{application_id}/start")
 async def start_generation(
     application_id: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Start PDF generation process in background"""
+    """Queue PDF generation; a generation worker picks the job up"""
     
-    # Verify application exists
-    app = db.query(VisaApplication).filter(VisaApplication.id == application_id).first()
+    # Verify application exists; the row lock serialises concurrent starts until the job is committed
+    app = db.query(VisaApplication).filter(VisaApplication.id == application_id).with_for_update().first()
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    # Check if generation already in progress
-    existing = db.query(GeneratedDocument).filter(
-        GeneratedDocument.application_id == application_id,
-        GeneratedDocument.status == GenerationStatus.GENERATING
-    ).first()
-    
-    if existing:
+    # Check if generation already queued or in progress
+    if get_active_job(db, application_id):
         return {"message": "Generation already in progress", "status": "generating"}
     
-    # Get application type to determine which documents to generate
-    app_type = getattr(app, 'application_type', 'business')
-    
-    # Calculate how many documents need to be generated (DYNAMIC based on type)
-    # Base documents for both types (11 common docs)
-    all_generatable_types = [
-        "cover_letter", "nid_english", "visiting_card", "financial_statement",
-        "travel_itinerary", "travel_history", "home_tie_statement", "asset_valuation",
-        "tin_certificate", "tax_certificate", "hotel_booking", "air_ticket"
-    ]
+    # Calculate documents that need generation (DYNAMIC based on type, skipping uploaded ones)
+    docs_to_generate = get_documents_to_generate(db, app)
+    job = enqueue_generation(db, application_id, docs_to_generate)
     
-    # Add type-specific documents
-    if app_type == 'business':
-        all_generatable_types.append("trade_license")
-    elif app_type == 'job':
-        all_generatable_types.extend(["job_noc", "job_id_card"])
-    
-    # Check which ones are already uploaded
-    uploaded_docs = db.query(Document).filter(
-        Document.application_id == application_id
-    ).all()
-    uploaded_types = [doc.document_type.value for doc in uploaded_docs]
-    
-    # Calculate documents that need generation (not uploaded)
-    docs_to_generate = [doc for doc in all_generatable_types if doc not in uploaded_types]
-    total_to_generate = len(docs_to_generate)
-    
-    # Initialize session tracking
-    generation_sessions[application_id] = {
-        "status": "started",
-        "progress": 0,
-        "current_document": None,
-        "documents_completed": 0,
-        "total_documents": total_to_generate,
-        "docs_to_generate": docs_to_generate,
-        "started_at": datetime.now().isoformat()
-    }
-    
-    # Start generation in background
-    background_tasks.add_task(generate_documents_task, application_id, db)
+    # Wake local workers so the job starts without waiting for the next poll
+    get_worker_pool().notify()
     
     return {
         "message": "PDF generation started",
         "application_id": application_id,
-        "total_documents": total_to_generate,
+        "job_id": job.id,
+        "total_documents": job.total_documents,
         "status": "started"
     }
 
 
-def generate_documents_task(application_id: int, db: Session):
-    """Background task to generate all documents"""
-    try:
-        generator = PDFGeneratorService(db, application_id)
-        application = generator.application
-        
-        # Get application type (fallback to 'business' for existing apps)
-        app_type = getattr(application, 'application_type', 'business')
-        
-        # Update session
-        generation_sessions[application_id]["status"] = "generating"
-        generation_sessions[application_id]["progress"] = 5
-        
-        # Get dynamic list of documents to generate from session
-        docs_to_generate = generation_sessions[application_id].get("docs_to_generate", [])
-        
-        # All possible documents with their display names and weights
-        all_documents = {
-            "cover_letter": ("Cover Letter", 8),
-            "nid_english": ("NID Translation", 7),
-            "visiting_card": ("Visiting Card", 6),
-            "financial_statement": ("Financial Statement", 8),
-            "travel_itinerary": ("Travel Itinerary", 9),
-            "travel_history": ("Travel History", 6),
-            "home_tie_statement": ("Home Tie Statement", 7),
-            "asset_valuation": ("Asset Valuation", 10),
-            "tin_certificate": ("TIN Certificate", 7),
-            "tax_certificate": ("Tax Certificate", 7),
-            "trade_license": ("Trade License", 7),  # Business only
-            "job_noc": ("Job NOC", 7),  # Job only
-            "job_id_card": ("Job ID Card", 6),  # Job only
-            "hotel_booking": ("Hotel Booking", 9),
-            "air_ticket": ("Air Ticket", 9),
-        }
-        
-        # Filter to only generate documents that aren't uploaded
-        documents = [(doc_type, all_documents[doc_type][0], all_documents[doc_type][1]) 
-                     for doc_type in docs_to_generate if doc_type in all_documents]
-        
-        completed = 0
-        total_progress = 5
-        
-        for doc_type, doc_name, weight in documents:
-            try:
-                # Update current document
-                generation_sessions[application_id]["current_document"] = doc_name
-                
-                # Generate document
-                if doc_type == "cover_letter":
-                    generator.generate_cover_letter()
-                elif doc_type == "nid_english":
-                    generator.generate_nid_translation()
-                elif doc_type == "visiting_card":
-                    generator.generate_visiting_card()
-                elif doc_type == "financial_statement":
-                    generator.generate_financial_statement()
-                elif doc_type == "travel_itinerary":
-                    generator.generate_travel_itinerary()
-                elif doc_type == "travel_history":
-                    generator.generate_travel_history()
-                elif doc_type == "home_tie_statement":
-                    generator.generate_home_tie_statement()
-                elif doc_type == "asset_valuation":
-                    generator.generate_asset_valuation()
-                elif doc_type == "tin_certificate":
-                    generator.generate_tin_certificate()
-                elif doc_type == "tax_certificate":
-                    generator.generate_tax_certificate()
-                elif doc_type == "trade_license":
-                    generator.generate_trade_license()
-                elif doc_type == "job_noc":
-                    generator.generate_job_noc()
-                elif doc_type == "job_id_card":
-                    generator.generate_job_id_card()
-                elif doc_type == "hotel_booking":
-                    generator.generate_hotel_booking()
-                elif doc_type == "air_ticket":
-                    generator.generate_air_ticket()
-                
-                completed += 1
-                total_progress += weight
-                
-                # Update session
-                generation_sessions[application_id]["documents_completed"] = completed
-                generation_sessions[application_id]["progress"] = min(total_progress, 95)
-                
-            except Exception as e:
-                print(f"Error generating {doc_name}: {e}")
-                generation_sessions[application_id]["errors"] = generation_sessions[application_id].get("errors", [])
-                generation_sessions[application_id]["errors"].append(f"{doc_name}: {str(e)}")
-        
-        # Complete
-        generation_sessions[application_id]["status"] = "completed"
-        generation_sessions[application_id]["progress"] = 100
-        generation_sessions[application_id]["completed_at"] = datetime.now().isoformat()
-        
-    except Exception as e:
-        print(f"Generation error: {e}")
-        generation_sessions[application_id]["status"] = "failed"
-        generation_sessions[application_id]["error"] = str(e)
-
-
 @router.get("/{application_id}/status")
 async def get_generation_status(application_id: int, db: Session = Depends(get_db)):
     """Get current generation status"""
-    
-    # Check session tracking first
-    if application_id in generation_sessions:
-        session = generation_sessions[application_id]
-        
-        # Get completed documents from DB
-        completed_docs = db.query(GeneratedDocument).filter(
-            GeneratedDocument.application_id == application_id,
-            GeneratedDocument.status == GenerationStatus.COMPLETED
-        ).all()
-        
-        return {
-            "status": session["status"],
-            "progress": session["progress"],
-            "current_document": session.get("current_document"),
-            "documents_completed": session.get("documents_completed", 0),
-            "total_documents": session["total_documents"],
-            "completed_documents": [
-                {
-                    "type": doc.document_type,
-                    "name": doc.file_name,
-                    "size": doc.file_size
-                }
-                for doc in completed_docs
-            ],
-            "errors": session.get("errors", [])
-        }
-    
-    # Fallback to DB check
-    docs = db.query(GeneratedDocument).filter(
-        GeneratedDocument.application_id == application_id
-    ).all()
-    
-    # Calculate dynamic total based on uploaded documents
-    all_generatable_types = [
-        "cover_letter", "nid_english", "visiting_card", "financial_statement",
-        "travel_itinerary", "travel_history", "home_tie_statement", "asset_valuation",
-        "tin_certificate", "tax_certificate", "trade_license", "hotel_booking", "air_ticket"
-    ]
-    uploaded_docs = db.query(Document).filter(
-        Document.application_id == application_id
-    ).all()
-    uploaded_types = [doc.document_type.value for doc in uploaded_docs]
-    docs_to_generate = [doc for doc in all_generatable_types if doc not in uploaded_types]
-    total_documents = len(docs_to_generate)
-    
-    if not docs:
-        return {
-            "status": "not_started",
-            "progress": 0,
-            "documents_completed": 0,
-            "total_documents": total_documents
-        }
-    
-    completed = sum(1 for d in docs if d.status == GenerationStatus.COMPLETED)
-    generating = any(d.status == GenerationStatus.GENERATING for d in docs)
-    
-    return {
-        "status": "generating" if generating else ("completed" if completed == total_documents else "partial"),
-        "progress": int((completed / total_documents) * 100) if total_documents > 0 else 100,
-        "documents_completed": completed,
-        "total_documents": total_documents,
-        "completed_documents": [
-            {
-                "type": doc.document_type,
-                "name": doc.file_name,
-                "size": doc.file_size
-            }
-            for doc in docs if doc.status == GenerationStatus.COMPLETED
-        ]
-    }
+    return build_generation_status(db, application_id)
+
+
+@router.get("/{application_id}/events")
+async def stream_generation_status(application_id: int):
+    """
+    Stream generation status as Server-Sent Events
+    Sends the current status, then every update the workers publish, and
+    closes after a final status (completed/failed/partial).
+    """
+    def snapshot():
+        db = SessionLocal()
+        try:
+            return build_generation_status(db, application_id)
+        finally:
+            db.close()
+
+    def complete(event):
+        db = SessionLocal()
+        try:
+            return {**event, "completed_documents": completed_documents(db, application_id)}
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream_progress(
+            generation_topic(application_id),
+            snapshot,
+            is_final=lambda state: state["status"] in FINAL_STATUS_VALUES,
+            complete=complete
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 
 @router.get("/{application_id}/documents")
@@ -320,61 +154,58 @@ async def download_document(
 
 
 @router.get("/{application_id}/download-all")
-async def download_all_documents(application_id: int, db: Session = Depends(get_db)):
-    """Download all documents (uploaded + generated) as ZIP"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Get uploaded documents
-    uploaded_docs = db.query(Document).filter(
-        Document.application_id == application_id,
-        Document.is_uploaded == True
-    ).all()
-    
-    # Get generated documents
-    generated_docs = db.query(GeneratedDocument).filter(
-        GeneratedDocument.application_id == application_id,
-        GeneratedDocument.status == GenerationStatus.COMPLETED
-    ).all()
-    
-    logger.info(f"📦 Preparing ZIP for app {application_id}: {len(uploaded_docs)} uploaded, {len(generated_docs)} generated")
-    
-    # Create ZIP file
-    zip_path = f"uploads/app_{application_id}/all_documents_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
-    
-    files_added = 0
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # Add uploaded documents (all files in root folder)
-        for doc in uploaded_docs:
-            if os.path.exists(doc.file_path):
-                # Use only the filename, no folder prefix
-                arcname = doc.document_name
-                zipf.write(doc.file_path, arcname)
-                files_added += 1
-                logger.info(f"  ✅ Added uploaded: {arcname}")
-            else:
-                logger.warning(f"  ⚠️ Missing uploaded file: {doc.file_path}")
-        
-        # Add generated documents (all files in root folder)
-        for doc in generated_docs:
-            if os.path.exists(doc.file_path):
-                # Use only the filename, no folder prefix
-                arcname = doc.file_name
-                zipf.write(doc.file_path, arcname)
-                files_added += 1
-                logger.info(f"  ✅ Added generated: {arcname}")
-            else:
-                logger.warning(f"  ⚠️ Missing generated file: {doc.file_path}")
-    
-    zip_size = os.path.getsize(zip_path)
-    logger.info(f"📦 ZIP created: {files_added} files, {zip_size} bytes")
-    
-    if files_added == 0:
-        logger.error(f"❌ ZIP is empty! No files were added.")
-    
-    return FileResponse(
-        zip_path,
+async def download_all_documents(application_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Download all documents (uploaded + generated) as a ZIP
+
+    The first download streams the archive while it is built and caches it;
+    repeat downloads and byte-range resumes are served from the cached file
+    until the application's documents change (the ETag changes with them).
+    """
+    members = collect_bundle_members(db, application_id)
+    key = await run_in_threadpool(bundle_key, members)
+    cache = get_bundle_cache()
+    headers = {
+        "Content-Disposition": f'attachment; filename="Visa_Application_{application_id}_All_Documents.zip"',
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{key}"'
+    }
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and if_range != headers["ETag"]:
+        range_header = None  # Client holds another version: send the whole current one
+
+    cached_path = cache.get(application_id, key)
+    if cached_path is None:
+        if not range_header:
+            return StreamingResponse(
+                cache.stream_and_store(application_id, key, members),
+                media_type="application/zip",
+                headers=headers
+            )
+        # Ranges need the final size and bytes: build first
+        cached_path = await run_in_threadpool(cache.build, application_id, key, members)
+    else:
+        logger.info(f"📦 Serving cached bundle for app {application_id}")
+
+    size = cached_path.stat().st_size
+    try:
+        byte_range = parse_byte_range(range_header, size) if range_header else None
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return FileResponse(cached_path, media_type="application/zip", headers=headers)
+
+    start, end = byte_range
+    return StreamingResponse(
+        iter_file_range(cached_path, start, end),
+        status_code=206,
         media_type="application/zip",
-        filename=f"Visa_Application_{application_id}_All_Documents.zip"
+        headers={
+            **headers,
+            "Content-Range": f"bytes {start}-{end}/{size}",
+            "Content-Length": str(end - start + 1)
+        }
     )
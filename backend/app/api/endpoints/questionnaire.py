@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from typing import Dict, Any
 from datetime import datetime
 from loguru import logger
+import json
 
 from app.database import get_db
 from app.models import VisaApplication, QuestionnaireResponse, Document, QuestionCategory, QuestionDataType, DocumentType
@@ -15,11 +16,11 @@ from app.schemas import SaveQuestionnaireRequest, QuestionnaireProgressResponse
 from app.services.simple_questionnaire_generator import SimpleQuestionnaireGenerator
 from app.services.smart_questionnaire_service import (
     get_questionnaire_structure, 
-    get_all_questions,
-    validate_answer,
+    get_compiled_question,
     calculate_progress
 )
 from app.services.auto_fill_service import auto_fill_questionnaire
+from app.services.questionnaire_store import build_response_row, save_answers, get_application_progress
 
 router = APIRouter()
 
@@ -57,29 +58,18 @@ async def generate_questionnaire(application_id: int, db: Session = Depends(get_
 
 @router.post("/response/{application_id}")
 async def save_responses(application_id: int, request: SaveQuestionnaireRequest, db: Session = Depends(get_db)):
-    saved_count = 0
-    for resp in request.responses:
-        q = db.query(QuestionnaireResponse).filter(
-            QuestionnaireResponse.application_id == application_id,
-            QuestionnaireResponse.question_key == resp.question_key
-        ).first()
-        
-        if q:
-            q.answer = resp.answer
-            q.answered_at = datetime.now()
-        else:
-            q = QuestionnaireResponse(
-                application_id=application_id,
-                question_key=resp.question_key,
-                question_text=resp.question_key.replace('_', ' ').title(),
-                answer=resp.answer,
-                category=QuestionCategory.PERSONAL,
-                data_type=QuestionDataType.TEXT,
-                is_required=False,
-                answered_at=datetime.now()
-            )
-            db.add(q)
-        saved_count += 1
+    # Row lock serialises concurrent saves of one application (progress counters)
+    application = db.query(VisaApplication).filter(VisaApplication.id == application_id).with_for_update().first()
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    answered_at = datetime.now()
+    rows = [
+        build_response_row(application_id, resp.question_key, resp.answer, answered_at=answered_at)
+        for resp in request.responses
+    ]
+    save_answers(db, application, rows)
+    saved_count = len(rows)
     
     db.commit()
     return {"message": f"Saved {saved_count} responses", "saved_count": saved_count}
@@ -178,7 +168,8 @@ async def smart_save_responses(
         answers: Dictionary of answers
         auto_fill: If True, auto-fills missing fields with realistic data (default: False)
     """
-    application = db.query(VisaApplication).filter(VisaApplication.id == application_id).first()
+    # Row lock serialises concurrent saves of one application (progress counters)
+    application = db.query(VisaApplication).filter(VisaApplication.id == application_id).with_for_update().first()
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     
@@ -192,66 +183,44 @@ async def smart_save_responses(
         answers = filled_answers
         logger.info(f"✨ Auto-filled {auto_fill_summary['auto_filled_count']} fields")
     
-    # Get all questions to validate
-    all_questions = get_all_questions()
-    questions_map = {q["key"]: q for q in all_questions}
-    
-    saved_count = 0
+    answered_at = datetime.now()
+    rows = []
     errors = []
     
     for question_key, answer in answers.items():
-        # Find question definition
-        question_def = questions_map.get(question_key)
-        if not question_def:
+        # Find compiled question (built once at import)
+        question = get_compiled_question(question_key)
+        if question is None:
             logger.warning(f"Unknown question key: {question_key}")
             continue
         
         # Validate answer
-        is_valid, error_msg = validate_answer(question_def, answer)
+        is_valid, error_msg = question.validate(answer)
         if not is_valid:
             errors.append({"question": question_key, "error": error_msg})
             continue
         
-        # Save or update response
-        existing = db.query(QuestionnaireResponse).filter(
-            QuestionnaireResponse.application_id == application_id,
-            QuestionnaireResponse.question_key == question_key
-        ).first()
-        
         # Convert answer to string (handle lists/dicts)
         if isinstance(answer, (list, dict)):
-            import json
             answer_str = json.dumps(answer)
         else:
             answer_str = str(answer)
         
-        if existing:
-            existing.answer = answer_str
-            existing.answered_at = datetime.now()
-        else:
-            new_response = QuestionnaireResponse(
-                application_id=application_id,
-                question_key=question_key,
-                question_text=question_def.get("label", ""),
-                answer=answer_str,
-                category=QuestionCategory.PERSONAL,  # Will be updated based on section
-                data_type=QuestionDataType.TEXT,
-                is_required=question_def.get("required", False),
-                answered_at=datetime.now()
-            )
-            db.add(new_response)
-        
-        saved_count += 1
+        rows.append(build_response_row(
+            application_id,
+            question_key,
+            answer_str,
+            question_text=question.label,
+            is_required=question.required,
+            answered_at=answered_at
+        ))
+    
+    # One prefetch + one bulk upsert; progress counters move by the changed answers
+    progress = save_answers(db, application, rows)
+    saved_count = len(rows)
     
     db.commit()
     
-    # Calculate progress
-    all_responses = db.query(QuestionnaireResponse).filter(
-        QuestionnaireResponse.application_id == application_id
-    ).all()
-    answers_dict = {r.question_key: r.answer for r in all_responses}
-    progress = calculate_progress(answers_dict)
-    
     response_data = {
         "message": f"Saved {saved_count} responses",
         "saved_count": saved_count,
@@ -302,12 +271,14 @@ async def smart_get_progress(application_id: int, db: Session = Depends(get_db))
     Get detailed progress of smart questionnaire
     Includes section-wise progress
     """
-    responses = db.query(QuestionnaireResponse).filter(
-        QuestionnaireResponse.application_id == application_id
-    ).all()
+    application = db.query(VisaApplication).filter(VisaApplication.id == application_id).first()
+    if not application:
+        return calculate_progress({})
     
-    answers = {r.question_key: r.answer for r in responses}
-    progress = calculate_progress(answers)
+    # Served from the counters stored on the application (rebuilt once if missing)
+    progress = get_application_progress(db, application)
+    if application in db.dirty:
+        db.commit()
     
     return progress
 
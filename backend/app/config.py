@@ -27,12 +27,62 @@ class Settings(BaseSettings):
     # Gemini AI
     GEMINI_API_KEY: str
     GEMINI_MODEL: str = "models/gemini-2.5-flash"
+    LLM_MAX_CONCURRENCY: int = 4  # Concurrent Gemini requests per process
+    LLM_TIMEOUT: float = 60.0  # Seconds per request attempt
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BACKOFF: float = 1.0  # Base seconds for exponential backoff
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_BACKEND: str = "sqlite"  # sqlite (on-disk, shared by processes) or memory
+    LLM_CACHE_PATH: str = "./cache/llm_cache.sqlite3"
+    LLM_CACHE_TTL: int = 604800  # 7 days
+    LLM_CACHE_MAX_BYTES: int = 52428800  # 50MB
+    
+    # Document Analysis
+    AI_ANALYSIS_ENABLED: bool = False  # False = demo results instead of Gemini extraction
+    ANALYSIS_CONCURRENCY: int = 4  # Documents extracted/analyzed at once per analysis run
+    ANALYSIS_COMMIT_INTERVAL: float = 1.0  # Seconds between progress commits during a run
     
     # File Upload
     MAX_FILE_SIZE: int = 10485760  # 10MB
     ALLOWED_FILE_EXTENSIONS: str = "pdf,jpg,jpeg,png"
     UPLOAD_FOLDER: str = "./uploads"
     GENERATED_FOLDER: str = "./generated"
+    BUNDLE_CACHE_FOLDER: str = "./cache/bundles"  # Built download-all ZIPs, reused until a document changes
+    BLOB_GC_INTERVAL: int = 3600  # Seconds between sweeps of unreferenced upload blobs by generation workers (0 = off)
+    
+    # Background Text Extraction
+    EXTRACTION_WORKERS: int = 2  # Extraction threads per process (0 = extract inline during upload)
+    EXTRACTION_STALE_AFTER: int = 900  # Seconds before an unfinished extraction claim may be taken over by another process
+    PDF_TEXT_BACKEND: str = "pypdf2"  # pypdf2, pypdfium2, pymupdf or auto (fastest installed)
+    PDF_EXTRACT_WORKERS: int = 2  # Processes for per-page extraction of large PDFs (1 = in-process)
+    PDF_PARALLEL_MIN_PAGES: int = 8  # Page count from which extraction is fanned out
+    
+    # OCR (isolated worker processes, see app/services/ocr_service.py)
+    OCR_ENABLED: bool = True  # Still requires pytesseract, pdf2image and the tesseract binary
+    OCR_WORKERS: int = 1  # Pages OCR'd at once (each worker is a separate process)
+    OCR_WORKER_MEMORY_MB: int = 256  # RLIMIT_DATA (heap + private writable memory) per worker and per pdftoppm/tesseract it runs; leaves headroom for the API on a 512MB host (0 = no cap)
+    OCR_MAX_TASKS_PER_CHILD: int = 20  # Recycle workers after this many pages
+    OCR_DPI: int = 150  # Render resolution (memory grows with DPI squared)
+    OCR_MAX_PAGES: int = 5  # Page budget per PDF
+    OCR_PAGE_TIMEOUT: int = 120  # Seconds per page
+    OCR_LANG: str = "eng"  # Tesseract languages for PDF pages
+    OCR_IMAGE_LANG: str = "eng+ben"  # Tesseract languages for uploaded images
+    
+    # Document Generation Workers
+    GENERATION_WORKERS: int = 2  # Worker threads per process (0 = don't run workers in this process)
+    GENERATION_POLL_INTERVAL: float = 2.0  # Seconds between queue polls when idle
+    GENERATION_JOB_STALE_AFTER: int = 600  # Seconds without heartbeat before a job is re-queued
+    GENERATION_PARALLEL_DOCUMENTS: int = 1  # Documents rendered concurrently per job (1 = sequential)
+    TEMPLATE_CACHE_FOLDER: str = "./cache/templates"  # Jinja bytecode cache for the HTML (WeasyPrint) templates
+    TEMPLATE_WARMUP: bool = True  # Render a sample template when workers start, so the first job skips font setup
+    
+    # Renderer Processes (template documents, see app/services/render_service.py)
+    RENDER_WORKERS: int = 1  # Renderer processes (0 = render inside the generating process)
+    RENDER_MAX_TASKS_PER_CHILD: int = 20  # Recycle a renderer after this many documents
+    RENDER_TIMEOUT: int = 180  # Seconds per document render
+    
+    # Progress Streams (Server-Sent Events)
+    PROGRESS_STREAM_RESYNC: float = 15.0  # Idle seconds before a stream re-reads status from the database
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:3001"
@@ -1,7 +1,7 @@
 """
 Database models for visa application system
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -95,6 +95,9 @@ class VisaApplication(Base):
     # Missing information tracking
     missing_info = Column(JSON, default=[])
     
+    # Smart questionnaire counters kept in step by each save: {"version", "sections": {key: [answered, required_answered]}}
+    questionnaire_progress = Column(JSON, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -108,9 +111,21 @@ class VisaApplication(Base):
         return f"<VisaApplication {self.application_number} - {self.status}>"
 
 
+class ExtractionStatus(str, enum.Enum):
+    """Background text extraction state of an uploaded document"""
+    PENDING = "pending"
+    EXTRACTING = "extracting"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class Document(Base):
     """Document model for uploaded and generated files"""
     __tablename__ = "documents"
+    __table_args__ = (
+        # Per-application listings, usually restricted to uploaded files
+        Index('ix_documents_application_uploaded', 'application_id', 'is_uploaded'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("visa_applications.id"), nullable=False)
@@ -121,6 +136,7 @@ class Document(Base):
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer)  # in bytes
     mime_type = Column(String(100))
+    blob_sha256 = Column(String(64), ForeignKey("stored_blobs.sha256"), nullable=True, index=True)  # Content-addressed blob (None for legacy files)
     
     # Document status
     is_uploaded = Column(Boolean, default=True)  # False for generated docs
@@ -131,12 +147,22 @@ class Document(Base):
     extracted_text = Column(Text, nullable=True)
     extracted_data = Column(JSON, default={})
     
+    # Background extraction (single pass: text + page count + metadata + quality)
+    extraction_status = Column(Enum(ExtractionStatus, values_callable=lambda obj: [e.value for e in obj]), default=ExtractionStatus.PENDING, index=True)
+    page_count = Column(Integer, nullable=True)
+    extraction_metadata = Column(JSON, default={})  # text_quality, has_text, needs_ocr, PDF info
+    extraction_error = Column(Text, nullable=True)
+    extraction_started_at = Column(DateTime(timezone=True), nullable=True)  # When a worker claimed the running extraction
+    extraction_fingerprint = Column(String(64), nullable=True)  # bytes + extractor version of extracted_text
+    analysis_fingerprint = Column(String(64), nullable=True)  # extraction + prompt version of the last successful analysis
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     application = relationship("VisaApplication", back_populates="documents")
+    blob = relationship("StoredBlob")
     
     def __repr__(self):
         return f"<Document {self.document_type} - {self.document_name}>"
@@ -198,6 +224,11 @@ class RequiredDocument(Base):
 class ExtractedData(Base):
     """Store structured data extracted from uploaded documents using AI"""
     __tablename__ = "extracted_data"
+    __table_args__ = (
+        Index('ix_extracted_data_application_type', 'application_id', 'document_type'),
+        # Analysis runs fetch earlier results by document; also serves FK lookups on document delete
+        Index('ix_extracted_data_document_id', 'document_id'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("visa_applications.id"), nullable=False)
@@ -210,6 +241,7 @@ class ExtractedData(Base):
     # Extraction metadata
     confidence_score = Column(Integer, default=0)  # 0-100 percentage
     extraction_model = Column(String(100), default="models/gemini-2.5-flash")
+    fingerprint = Column(String(64), nullable=True, index=True)  # Document analysis fingerprint this row was produced for
     
     # Timestamps
     extracted_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -248,6 +280,10 @@ class QuestionDataType(str, enum.Enum):
 class QuestionnaireResponse(Base):
     """Store user's responses to questionnaire questions"""
     __tablename__ = "questionnaire_responses"
+    __table_args__ = (
+        # One answer per question per application; target of the bulk upsert
+        Index('uq_questionnaire_responses_app_key', 'application_id', 'question_key', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("visa_applications.id"), nullable=False)
@@ -289,6 +325,10 @@ class AnalysisStatus(str, enum.Enum):
 class AnalysisSession(Base):
     """Track document analysis sessions"""
     __tablename__ = "analysis_sessions"
+    __table_args__ = (
+        # Latest session of an application (and its active-session check)
+        Index('ix_analysis_sessions_application_created', 'application_id', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("visa_applications.id"), nullable=False)
@@ -329,6 +369,10 @@ class GenerationStatus(str, enum.Enum):
 class GeneratedDocument(Base):
     """Track AI-generated documents"""
     __tablename__ = "generated_documents"
+    __table_args__ = (
+        # Completed documents of an application (status, bundle, downloads)
+        Index('ix_generated_documents_application_status', 'application_id', 'status'),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("visa_applications.id"), nullable=False)
@@ -357,3 +401,68 @@ class GeneratedDocument(Base):
     
     def __repr__(self):
         return f"<GeneratedDocument App#{self.application_id} - {self.document_type}>"
+
+
+class GenerationJobStatus(str, enum.Enum):
+    """Status of a queued document generation job"""
+    QUEUED = "queued"
+    GENERATING = "generating"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class GenerationJob(Base):
+    """Durable queue entry + progress tracking for a document generation run"""
+    __tablename__ = "generation_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    application_id = Column(Integer, ForeignKey("visa_applications.id"), nullable=False, index=True)
+    
+    # Queue state
+    status = Column(Enum(GenerationJobStatus, values_callable=lambda obj: [e.value for e in obj]), default=GenerationJobStatus.QUEUED, nullable=False, index=True)
+    worker_id = Column(String(100))  # host:pid:thread of the worker that claimed the job
+    attempts = Column(Integer, default=0)
+    
+    # Progress
+    progress = Column(Integer, default=0)  # 0-100 percentage
+    current_document = Column(String(200))
+    documents_completed = Column(Integer, default=0)
+    total_documents = Column(Integer, default=0)
+    docs_to_generate = Column(JSON, default=[])  # List of document type keys
+    errors = Column(JSON, default=[])  # ["Cover Letter: <error>", ...]
+    error_message = Column(Text)
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    application = relationship("VisaApplication")
+    
+    def __repr__(self):
+        return f"<GenerationJob #{self.id} App#{self.application_id} - {self.status}>"
+
+
+class StoredBlob(Base):
+    """Content-addressed uploaded file, shared by every document with the same bytes"""
+    __tablename__ = "stored_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String(500), nullable=False)  # uploads/blobs/ab/cd/<sha256><ext>
+    file_size = Column(Integer, nullable=False)
+    mime_type = Column(String(100))
+    ref_count = Column(Integer, default=0, nullable=False)  # Documents pointing at this blob
+    
+    # Results reusable by any document with the same bytes
+    extracted_text = Column(Text, nullable=True)
+    extraction_metadata = Column(JSON, default={})  # PDF validation (num_pages, has_text, ...)
+    analysis_results = Column(JSON, default={})  # document_type → analysis result
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_referenced_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<StoredBlob {self.sha256[:12]} refs={self.ref_count}>"
@@ -75,6 +75,7 @@ class DocumentUploadResponse(BaseModel):
     file_size: int
     message: str
     metadata: Optional[Dict[str, Any]] = None  # Added for PDF metadata
+    extraction_status: Optional[str] = None  # pending until the background extraction finishes
 
 
 class MissingInfoQuestion(BaseModel):
@@ -115,6 +116,8 @@ class DocumentResponse(BaseModel):
     file_size: Optional[int]
     is_uploaded: bool
     is_processed: bool
+    extraction_status: Optional[str] = None
+    page_count: Optional[int] = None
     created_at: datetime
     
     class Config:
@@ -1,18 +1,31 @@
 """
 Service package initialization
+Exports resolve on first attribute access, so importing one service module
+(or this package) does not drag in the PDF rendering, OCR and LLM stacks.
 """
-from app.services.pdf_service import PDFService
-from app.services.gemini_service import GeminiService
-from app.services.storage_service import StorageService
-from app.services.ai_analysis_service import AIAnalysisService
-from app.services.questionnaire_generator import QuestionnaireGeneratorService
-from app.services.pdf_generator_service import PDFGeneratorService
+from importlib import import_module
 
-__all__ = [
-    'PDFService', 
-    'GeminiService', 
-    'StorageService',
-    'AIAnalysisService',
-    'QuestionnaireGeneratorService',
-    'PDFGeneratorService'
-]
\ No newline at end of file
+# Exported name → defining module
+_EXPORTS = {
+    'PDFService': 'app.services.pdf_service',
+    'GeminiService': 'app.services.gemini_service',
+    'StorageService': 'app.services.storage_service',
+    'AIAnalysisService': 'app.services.ai_analysis_service',
+    'QuestionnaireGeneratorService': 'app.services.questionnaire_generator',
+    'PDFGeneratorService': 'app.services.pdf_generator_service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
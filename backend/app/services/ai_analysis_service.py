@@ -5,34 +5,41 @@ import json
 import re
 from typing import Dict, Optional
 from loguru import logger
-import google.generativeai as genai
 
-from app.config import settings
 from app.models import DocumentType
+from app.services.llm_client import get_llm_client
+
+# Bump whenever a prompt or the model/generation config changes; stored
+# analysis fingerprints from older versions then no longer match
+PROMPT_VERSION = "1"
 
 
 class AIAnalysisService:
     """Enhanced service for analyzing documents and extracting structured information"""
     
     def __init__(self):
-        """Initialize Gemini AI client with optimized settings"""
-        genai.configure(api_key=settings.GEMINI_API_KEY)
+        """Initialize with the shared Gemini client and optimized extraction settings"""
+        self.llm = get_llm_client()
+        self.model_name = 'models/gemini-2.5-flash'  # Optimized for structured extraction
         
         # Use Gemini 2.5 Flash with optimized configuration for extraction
-        generation_config = {
+        self.generation_config = {
             "temperature": 0.05,  # Very low temperature for maximum consistency
             "top_p": 0.95,
             "top_k": 40,
             "max_output_tokens": 8192,
         }
         
-        self.model = genai.GenerativeModel(
-            'models/gemini-2.5-flash',  # Optimized for structured extraction
-            generation_config=generation_config
-        )
-        
         logger.info("✅ AIAnalysisService initialized with Gemini 2.5 Flash (temperature=0.05 for consistency)")
     
+    async def _generate(self, prompt: str) -> str:
+        """Send a prompt through the shared non-blocking LLM client"""
+        return await self.llm.agenerate(
+            prompt,
+            model_name=self.model_name,
+            generation_config=self.generation_config
+        )
+    
     async def analyze_document(
         self,
         document_type: DocumentType,
@@ -139,8 +146,8 @@ Use null for any missing fields. Base confidence on text quality and fields foun
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             # Validate and enhance result
             result = self._validate_passport_data(result, text)
@@ -195,8 +202,8 @@ CRITICAL RULES:
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ NID Bangla analyzed - Confidence: {result.get('confidence', 0)}%")
             return result
@@ -252,8 +259,8 @@ CRITICAL: Return ONLY JSON. Use null for missing fields.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             # Calculate derived fields
             if result.get('tax_years'):
@@ -305,8 +312,8 @@ CRITICAL: Return ONLY JSON. No markdown, no code blocks.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ TIN analyzed - Confidence: {result.get('confidence', 0)}%")
             return result
@@ -360,8 +367,8 @@ CRITICAL: Return ONLY JSON.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ Bank solvency analyzed - Balance: {result.get('current_balance', 0)}")
             return result
@@ -407,8 +414,8 @@ CRITICAL: Return ONLY JSON.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ Hotel booking analyzed - Hotel: {result.get('hotel_name', 'Unknown')}")
             return result
@@ -470,8 +477,8 @@ CRITICAL: Return ONLY JSON. Use null for missing fields.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ Air ticket analyzed - Passenger: {result.get('passenger_name', 'Unknown')}")
             return result
@@ -519,8 +526,8 @@ CRITICAL: Return ONLY JSON.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ Visa history analyzed - Countries: {result.get('total_countries', 0)}")
             return result
@@ -649,8 +656,8 @@ CRITICAL: Return ONLY JSON. Numbers without currency symbols.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ Asset valuation analyzed - Total: {result.get('total_value', 0)}")
             return result
@@ -691,8 +698,8 @@ CRITICAL: Return ONLY JSON.
 """
         
         try:
-            response = self.model.generate_content(prompt)
-            result = self._parse_json_response(response.text)
+            response_text = await self._generate(prompt)
+            result = self._parse_json_response(response_text)
             
             logger.info(f"✅ Generic document analyzed - Type: {document_type}")
             return result
@@ -0,0 +1,293 @@
+"""
+Bundle Service - Application document bundles streamed as ZIP
+The archive is produced chunk by chunk while the client downloads it: nothing
+is written to disk, and the first bytes go out before the last file is read.
+PDFs and images are already compressed, so they are stored rather than deflated.
+
+Built archives are cached per application under a key derived from the member
+set (blob hashes, or size + mtime for other files). The first download tees the
+stream into the cache; later downloads, including byte-range resumes, are
+served from the cached file until a document is added, regenerated or deleted.
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Document, GeneratedDocument, GenerationStatus
+
+# Read members in 1MB chunks; each chunk is yielded as soon as it is compressed
+BUNDLE_CHUNK_SIZE = 1024 * 1024
+
+# Already-compressed formats: deflating them costs CPU for ~0% gain
+STORED_EXTENSIONS = frozenset({'.pdf', '.jpg', '.jpeg', '.png'})
+
+
+@dataclass
+class BundleMember:
+    """One file in an application bundle"""
+    file_path: str
+    arcname: str  # Name inside the ZIP (flat, no folders)
+    source: str  # 'uploaded' or 'generated'
+    sha256: Optional[str] = None  # Content hash when known (blob uploads)
+
+
+def collect_bundle_members(db: Session, application_id: int) -> List[BundleMember]:
+    """Uploaded documents then completed generated documents that exist on disk"""
+    uploaded_docs = db.query(Document).filter(
+        Document.application_id == application_id,
+        Document.is_uploaded == True
+    ).all()
+
+    generated_docs = db.query(GeneratedDocument).filter(
+        GeneratedDocument.application_id == application_id,
+        GeneratedDocument.status == GenerationStatus.COMPLETED
+    ).all()
+
+    logger.info(f"📦 Preparing ZIP for app {application_id}: {len(uploaded_docs)} uploaded, {len(generated_docs)} generated")
+
+    members = []
+    candidates = [(doc.file_path, doc.document_name, 'uploaded', doc.blob_sha256) for doc in uploaded_docs]
+    candidates += [(doc.file_path, doc.file_name, 'generated', None) for doc in generated_docs]
+    for file_path, arcname, source, sha256 in candidates:
+        if os.path.exists(file_path):
+            members.append(BundleMember(file_path=file_path, arcname=arcname, source=source, sha256=sha256))
+        else:
+            logger.warning(f"  ⚠️ Missing {source} file: {file_path}")
+
+    if not members:
+        logger.error(f"❌ ZIP for app {application_id} is empty! No files were found.")
+    return members
+
+
+def compress_type_for(file_path: str) -> int:
+    """ZIP_STORED for already-compressed formats, ZIP_DEFLATED otherwise"""
+    extension = os.path.splitext(file_path)[1].lower()
+    return zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class _StreamSink(io.RawIOBase):
+    """Write-only, non-seekable target for ZipFile; the generator drains it between chunks"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # ZipFile records member offsets from tell(); seek() stays unsupported,
+        # so sizes/CRCs go into data descriptors after each member
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(members: List[BundleMember]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the members as it is built
+
+    A sync generator on purpose: StreamingResponse iterates it in the
+    threadpool, so file reads and compression stay off the event loop.
+    """
+    sink = _StreamSink()
+    files_added = 0
+    total_bytes = 0
+
+    with zipfile.ZipFile(sink, 'w') as zipf:
+        for member in members:
+            try:
+                zinfo = zipfile.ZipInfo.from_file(member.file_path, member.arcname)
+                zinfo.compress_type = compress_type_for(member.file_path)
+                with open(member.file_path, 'rb') as src, zipf.open(zinfo, 'w') as dst:
+                    for chunk in iter(lambda: src.read(BUNDLE_CHUNK_SIZE), b''):
+                        dst.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            total_bytes += len(data)
+                            yield data
+            except OSError as e:
+                # Headers are already sent; leave the file out rather than break the download
+                logger.warning(f"  ⚠️ Skipped {member.source} file {member.file_path}: {e}")
+                continue
+
+            files_added += 1
+            logger.info(f"  ✅ Added {member.source}: {member.arcname}")
+            data = sink.drain()
+            if data:
+                total_bytes += len(data)
+                yield data
+
+    # Central directory, written when the ZipFile closes
+    data = sink.drain()
+    total_bytes += len(data)
+    yield data
+
+    logger.info(f"📦 ZIP streamed: {files_added} files, {total_bytes} bytes")
+
+
+# ===== Bundle cache =====
+
+def bundle_key(members: List[BundleMember]) -> str:
+    """
+    Identity of the archive the members produce
+
+    Blob uploads are identified by their hash; other files by size + mtime,
+    which is also what the ZIP entry records (regenerating a document changes
+    it). Same key → byte-identical archive, so ranges stay valid across rebuilds.
+    """
+    hasher = hashlib.sha256()
+    for member in members:
+        stat = os.stat(member.file_path)
+        content = member.sha256 or f"{stat.st_size}:{stat.st_mtime_ns}"
+        hasher.update(f"{member.arcname}\0{content}\0{int(stat.st_mtime)}\0{compress_type_for(member.file_path)}\n".encode())
+    return hasher.hexdigest()
+
+
+class BundleCache:
+    """One cached ZIP per application (the current key); older ones are dropped when a new one lands"""
+
+    # Unfinished builds older than this belong to dead processes
+    STALE_PART_SECONDS = 3600
+
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = Path(cache_dir or settings.BUNDLE_CACHE_FOLDER)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, application_id: int, key: str) -> Path:
+        return self.cache_dir / f"app_{application_id}_{key}.zip"
+
+    def get(self, application_id: int, key: str) -> Optional[Path]:
+        """Cached archive for this exact member set, if built"""
+        path = self.path_for(application_id, key)
+        return path if path.is_file() else None
+
+    def stream_and_store(self, application_id: int, key: str, members: List[BundleMember]) -> Iterator[bytes]:
+        """Stream the archive to the client and tee it into the cache"""
+        final_path = self.path_for(application_id, key)
+        part_path = final_path.with_name(f"{final_path.name}.{uuid.uuid4().hex}.part")
+        completed = False
+        try:
+            with open(part_path, 'wb') as part:
+                for chunk in stream_zip(members):
+                    part.write(chunk)
+                    yield chunk
+            completed = True
+        finally:
+            # Client gone or error: the partial archive must not become the cached one
+            if completed:
+                self._finish(application_id, key, part_path)
+            elif part_path.exists():
+                part_path.unlink()
+
+    def build(self, application_id: int, key: str, members: List[BundleMember]) -> Path:
+        """Build the archive into the cache without a client attached (e.g. first request is a Range)"""
+        for _ in self.stream_and_store(application_id, key, members):
+            pass
+        return self.path_for(application_id, key)
+
+    def _finish(self, application_id: int, key: str, part_path: Path):
+        final_path = self.path_for(application_id, key)
+        try:
+            os.replace(part_path, final_path)  # Atomic: readers never see a half-written bundle
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache bundle for app {application_id}: {e}")
+            return
+        logger.info(f"💾 Cached bundle for app {application_id} ({final_path.stat().st_size} bytes)")
+        self.discard(application_id, keep=key)
+
+    def discard(self, application_id: int, keep: str = None) -> int:
+        """Delete the application's cached bundles (except `keep`) and stale partial builds"""
+        keep_name = self.path_for(application_id, keep).name if keep else None
+        removed = 0
+        now = time.time()
+        for path in self.cache_dir.glob(f"app_{application_id}_*"):
+            try:
+                if path.name.endswith(".part"):
+                    if now - path.stat().st_mtime < self.STALE_PART_SECONDS:
+                        continue  # Another request is building it right now
+                elif path.name == keep_name:
+                    continue
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+
+def parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range: bytes=...` header into an inclusive (start, end)
+
+    Returns None when the header should be ignored (not bytes, several ranges),
+    so the full body is served. Raises ValueError when it is unsatisfiable.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_text, _, end_text = spec.strip().partition("-")
+    start_text, end_text = start_text.strip(), end_text.strip()
+    if not (start_text or end_text) or not (start_text + end_text).isdigit():
+        return None  # Malformed: RFC 9110 says ignore it
+
+    if start_text:
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(0, size - int(end_text)), size - 1
+        if int(end_text) == 0:
+            raise ValueError(f"Range {range_header} is empty")
+
+    end = min(end, size - 1)
+    if start >= size or start > end:
+        raise ValueError(f"Range {range_header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def iter_file_range(file_path: Path, start: int, end: int) -> Iterator[bytes]:
+    """Yield bytes [start, end] of a file in BUNDLE_CHUNK_SIZE chunks"""
+    remaining = end - start + 1
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(BUNDLE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+# Singleton instance
+_bundle_cache = None
+_bundle_cache_lock = threading.Lock()
+
+def get_bundle_cache() -> BundleCache:
+    """Get or create the bundle cache for this process"""
+    global _bundle_cache
+    if _bundle_cache is None:
+        with _bundle_cache_lock:
+            if _bundle_cache is None:
+                _bundle_cache = BundleCache()
+    return _bundle_cache
@@ -0,0 +1,232 @@
+"""
+Extraction Pipeline - Background text extraction for uploaded documents
+Uploads return as soon as the file is stored; a thread pool then does one
+single-pass parse per document (text, page count, metadata, quality verdict).
+State lives on the documents table, so a startup sweep re-submits anything a
+previous process left pending. A document is extracted only by the process
+that claims it with a conditional UPDATE, so several API processes (or a
+restart while another process is extracting) never parse it twice.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import and_, or_
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Document, ExtractionStatus
+
+
+# Seconds between checks while another worker holds a document's extraction claim
+CLAIM_POLL_INTERVAL = 1.0
+
+# Keys of PDFService.extract_and_validate() kept on the document/blob (text and page count have own columns)
+METADATA_KEYS = ('valid', 'readable', 'num_pages', 'file_size_mb', 'has_text', 'text_length', 'text_quality', 'needs_ocr', 'ocr_used', 'info', 'error')
+
+
+def _claimable():
+    """Filter: pending documents, or extractions whose claim is older than EXTRACTION_STALE_AFTER"""
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.EXTRACTION_STALE_AFTER)
+    return or_(
+        Document.extraction_status == ExtractionStatus.PENDING,
+        and_(
+            Document.extraction_status == ExtractionStatus.EXTRACTING,
+            or_(Document.extraction_started_at.is_(None), Document.extraction_started_at < stale_before)
+        )
+    )
+
+
+class ExtractionPipeline:
+    """Thread pool that extracts text from uploaded documents off the request path"""
+
+    def __init__(self, num_workers: int = None):
+        self.num_workers = settings.EXTRACTION_WORKERS if num_workers is None else num_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pdf_service = None
+        self._storage = None
+
+    @property
+    def pdf_service(self):
+        if self._pdf_service is None:
+            from app.services.pdf_service import get_pdf_service
+            self._pdf_service = get_pdf_service()
+        return self._pdf_service
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from app.services.storage_service import StorageService
+            self._storage = StorageService()
+        return self._storage
+
+    @property
+    def is_running(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        """Start the pool and re-submit documents left pending by a previous process"""
+        with self._lock:
+            if self._executor is not None or self.num_workers <= 0:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="extraction-worker")
+        logger.info(f"🏭 Started {self.num_workers} extraction worker(s)")
+        self.recover()
+
+    def stop(self, wait: bool = True):
+        """Stop accepting work; in-flight extractions finish, queued ones are recovered on next start"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("🛑 Extraction workers stopped")
+
+    def submit(self, document_id: int):
+        """Queue a document for extraction (runs inline if the pool is disabled)"""
+        executor = self._executor
+        if executor is None:
+            self.extract_document(document_id)
+            return
+        executor.submit(self._run_safely, document_id)
+
+    def recover(self):
+        """Re-submit documents left pending, or mid-extraction under a claim that went stale"""
+        db = SessionLocal()
+        try:
+            document_ids = [row[0] for row in db.query(Document.id).filter(_claimable()).all()]
+        finally:
+            db.close()
+
+        if document_ids:
+            logger.info(f"🔁 Re-submitting {len(document_ids)} document(s) for extraction")
+        for document_id in document_ids:
+            self.submit(document_id)
+
+    def _run_safely(self, document_id: int):
+        try:
+            self.extract_document(document_id)
+        except Exception as e:
+            logger.error(f"❌ Extraction worker error for document {document_id}: {e}")
+
+    def ensure_extracted(self, document_id: int, fingerprint: str):
+        """
+        Make sure a document's stored text comes from the extractor `fingerprint`
+        names, extracting it now under the usual claim (own session, blocking)
+
+        Text from another extractor version, or an earlier failure, is queued
+        again and extracted here. A document another worker has claimed is
+        waited for (and taken over once its claim goes stale), never parsed
+        twice at once.
+        """
+        db = SessionLocal()
+        try:
+            claimed = False
+            while True:
+                row = db.query(Document.extraction_status, Document.extraction_fingerprint).filter(
+                    Document.id == document_id
+                ).first()
+                db.commit()  # End the read so the next check sees other workers' commits
+                if row is None or claimed:
+                    return
+                status, current_fingerprint = row
+                if status == ExtractionStatus.COMPLETED and current_fingerprint == fingerprint:
+                    return
+
+                if status in (ExtractionStatus.COMPLETED, ExtractionStatus.FAILED):
+                    db.query(Document).filter(
+                        Document.id == document_id, Document.extraction_status == status
+                    ).update({Document.extraction_status: ExtractionStatus.PENDING}, synchronize_session=False)
+                    db.commit()
+
+                claimed = self.extract_document(document_id)
+                if not claimed:
+                    time.sleep(CLAIM_POLL_INTERVAL)
+        finally:
+            db.close()
+
+    def extract_document(self, document_id: int) -> bool:
+        """
+        Extract one document and store the results (own session, safe to call from any thread)
+
+        Returns:
+            True if this call claimed the document (and finished or failed it)
+        """
+        db = SessionLocal()
+        try:
+            # Atomic claim: only one process moves the row to EXTRACTING
+            claimed = db.query(Document).filter(Document.id == document_id, _claimable()).update(
+                {
+                    Document.extraction_status: ExtractionStatus.EXTRACTING,
+                    Document.extraction_started_at: datetime.now(timezone.utc)
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            if not claimed:
+                return False  # Done, failed, or being extracted elsewhere
+
+            document = db.query(Document).filter(Document.id == document_id).first()
+
+            blob = document.blob
+            content_sha256 = document.blob_sha256 or self.storage.hash_file(document.file_path)
+            fingerprint = self.pdf_service.extraction_fingerprint(content_sha256)
+            if (
+                blob is not None and blob.extracted_text is not None and blob.extraction_metadata
+                and blob.extraction_metadata.get('fingerprint') == fingerprint
+            ):
+                # Same bytes already parsed for another document by the same extractor
+                text = blob.extracted_text
+                metadata = dict(blob.extraction_metadata)
+                logger.info(f"♻️ Reusing extraction for document {document_id} from blob {blob.sha256[:12]}")
+            else:
+                result = self.pdf_service.extract_and_validate(document.file_path)
+                text = result['text']
+                metadata = {key: result.get(key) for key in METADATA_KEYS}
+                metadata['fingerprint'] = fingerprint
+                if blob is not None:
+                    blob.extracted_text = text
+                    blob.extraction_metadata = metadata
+
+            document.extracted_text = text
+            document.page_count = metadata.get('num_pages')
+            document.extraction_metadata = metadata
+            document.processed_at = datetime.now()
+
+            if metadata.get('valid', False):
+                document.extraction_status = ExtractionStatus.COMPLETED
+                document.is_processed = True
+                document.extraction_error = None
+                document.extraction_fingerprint = fingerprint
+            else:
+                document.extraction_status = ExtractionStatus.FAILED
+                document.extraction_error = metadata.get('error') or "Unreadable file"
+                logger.warning(f"⚠️ Extraction failed for document {document_id}: {document.extraction_error}")
+
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error extracting document {document_id}: {e}")
+            document = db.query(Document).filter(Document.id == document_id).first()
+            if document is not None:
+                document.extraction_status = ExtractionStatus.FAILED
+                document.extraction_error = str(e)
+                db.commit()
+        finally:
+            db.close()
+        return True
+
+
+# Singleton instance
+_extraction_pipeline = None
+
+def get_extraction_pipeline() -> ExtractionPipeline:
+    """Get or create the extraction pipeline for this process"""
+    global _extraction_pipeline
+    if _extraction_pipeline is None:
+        _extraction_pipeline = ExtractionPipeline()
+    return _extraction_pipeline
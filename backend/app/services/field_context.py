@@ -0,0 +1,138 @@
+"""
+Field Context - Resolved generation data of one application
+PDF builders look up the same logical fields dozens of times per document.
+FieldContext resolves every logical field of the application once, when it is
+built, into two flat tables: the best answer per clean key (application row,
+questionnaire, KEY_MAPPING alternatives) and per full key (questionnaire or
+extracted 'document_type.field'). Lookups only read those tables, so the
+context is immutable after construction and safe to share between threads.
+"""
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from loguru import logger
+
+# Provenance of a resolved value
+SOURCE_APPLICATION = "application"
+SOURCE_QUESTIONNAIRE = "questionnaire"
+SOURCE_EXTRACTION = "extraction"
+
+# Field names answered from the application row (they always win)
+APPLICATION_FIELD_ALIASES = {
+    "applicant_name": ("full_name", "applicant_name", "name"),
+    "applicant_email": ("email", "applicant_email"),
+    "applicant_phone": ("phone", "phone_number", "applicant_phone"),
+}
+
+# Lookup tiers, see FieldContext
+_TIER_APPLICATION = 0
+_TIER_QUESTIONNAIRE = 1
+_TIER_EXTRACTION = 2
+_TIER_MAPPED_EXTRACTION = 3
+
+
+class ResolvedField(NamedTuple):
+    """A field value and where it came from"""
+    value: Any
+    source: str  # SOURCE_APPLICATION, SOURCE_QUESTIONNAIRE or SOURCE_EXTRACTION
+    key: str  # Key that matched in its source (e.g. 'passport_copy.full_name')
+
+
+# (tier, rank within the tier for one key, field)
+_Entry = Tuple[int, int, ResolvedField]
+
+
+def _present(value: Any) -> bool:
+    return bool(value) and bool(str(value).strip())
+
+
+class FieldContext:
+    """
+    Frozen view of one application's generation data
+
+    Lookup priority for keys (k1, k2, ...), each tier tried for every key
+    before the next tier:
+        0. application name/email/phone
+        1. questionnaire by clean key, by full key, then KEY_MAPPING simple keys
+        2. extracted data for dotted keys ('document_type.field')
+        3. KEY_MAPPING dotted alternatives in extracted data
+    """
+
+    def __init__(
+        self,
+        application: Any,
+        questionnaire_data: Mapping[str, Any],
+        extracted_data: Mapping[str, Mapping[str, Any]],
+        key_mapping: Mapping[str, Iterable[str]]
+    ):
+        # Clean key ('full_name') → best entry from tiers 0, 1 (clean key, KEY_MAPPING) and 3
+        fields: Dict[str, _Entry] = {}
+        # Full key ('passport_copy.full_name') → questionnaire (tier 1) or extraction (tier 2) entry
+        exact: Dict[str, _Entry] = {}
+
+        if application is not None:
+            for attribute, aliases in APPLICATION_FIELD_ALIASES.items():
+                value = getattr(application, attribute, None)
+                if value:
+                    for alias in aliases:
+                        fields[alias] = (_TIER_APPLICATION, 0, ResolvedField(value, SOURCE_APPLICATION, attribute))
+
+        questionnaire: Dict[str, ResolvedField] = {}
+        for key, value in questionnaire_data.items():
+            if _present(value):
+                questionnaire[key] = resolved = ResolvedField(str(value), SOURCE_QUESTIONNAIRE, key)
+                fields.setdefault(key, (_TIER_QUESTIONNAIRE, 0, resolved))
+                exact[key] = (_TIER_QUESTIONNAIRE, 1, resolved)
+
+        # Document types contain no dots
+        extraction: Dict[str, ResolvedField] = {}
+        for doc_type, data in extracted_data.items():
+            if isinstance(data, dict):
+                for field, value in data.items():
+                    if _present(value):
+                        key = f"{doc_type}.{field}"
+                        extraction[key] = resolved = ResolvedField(str(value), SOURCE_EXTRACTION, key)
+                        exact.setdefault(key, (_TIER_EXTRACTION, 0, resolved))
+
+        for logical_key, alternatives in key_mapping.items():
+            if logical_key in fields:
+                continue  # Application row or questionnaire answer already outranks any alternative
+            from_extraction = None
+            for mapped_key in alternatives:
+                if '.' not in mapped_key:
+                    if mapped_key in questionnaire:
+                        fields[logical_key] = (_TIER_QUESTIONNAIRE, 2, questionnaire[mapped_key])
+                        break
+                elif from_extraction is None and mapped_key in extraction:
+                    from_extraction = extraction[mapped_key]
+            else:
+                if from_extraction is not None:
+                    fields[logical_key] = (_TIER_MAPPED_EXTRACTION, 0, from_extraction)
+
+        self.fields: Mapping[str, _Entry] = MappingProxyType(fields)
+        self.exact: Mapping[str, _Entry] = MappingProxyType(exact)
+
+    def lookup(self, *keys: str) -> Optional[ResolvedField]:
+        """Resolved value (with provenance) for the first key that has one, by tier"""
+        fields, exact = self.fields, self.exact
+        best = None
+        for key in keys:
+            entry = fields.get(key.rpartition('.')[2])  # 'passport_copy.full_name' → 'full_name'
+            by_key = exact.get(key)
+            if by_key is not None and (entry is None or by_key[:2] < entry[:2]):
+                entry = by_key
+            # Within a tier the earlier key wins
+            if entry is not None and (best is None or entry[0] < best[0]):
+                best = entry
+                if best[0] == _TIER_APPLICATION:
+                    break
+
+        if best is None:
+            logger.debug("⚠️  Missing value for keys: {} (even after auto-fill)", keys)
+            return None
+        return best[2]
+
+    def get(self, *keys: str) -> Any:
+        """Value for the keys, or "" if none resolves"""
+        resolved = self.lookup(*keys)
+        return "" if resolved is None else resolved.value
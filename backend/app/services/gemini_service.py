@@ -1,21 +1,21 @@
 """
 Gemini AI Service - AI-powered document analysis and generation
 """
-import google.generativeai as genai
 from typing import Dict, Any, List, Optional
 from loguru import logger
 
 from app.config import settings
+from app.services.llm_client import get_llm_client
 
 
 class GeminiService:
     """Service for Gemini AI operations"""
     
     def __init__(self):
-        """Initialize Gemini API"""
+        """Initialize Gemini API (shared non-blocking client)"""
         try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-            self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
+            self.llm = get_llm_client()
+            self.model_name = settings.GEMINI_MODEL
             logger.info(f"Gemini AI initialized with model: {settings.GEMINI_MODEL}")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini AI: {str(e)}")
@@ -45,10 +45,10 @@ class GeminiService:
             based on the document type.
             """
             
-            response = self.model.generate_content(prompt)
+            response_text = await self.llm.agenerate(prompt, model_name=self.model_name)
             
             # Parse response
-            extracted_data = self._parse_response(response.text)
+            extracted_data = self._parse_response(response_text)
             
             logger.info(f"Successfully analyzed {document_type}")
             return extracted_data
@@ -88,9 +88,9 @@ class GeminiService:
             and 'data_type' (text/date/number).
             """
             
-            response = self.model.generate_content(prompt)
+            response_text = await self.llm.agenerate(prompt, model_name=self.model_name)
             
-            missing_info = self._parse_response(response.text)
+            missing_info = self._parse_response(response_text)
             
             logger.info(f"Identified {len(missing_info)} missing information fields")
             return missing_info
@@ -117,10 +117,10 @@ class GeminiService:
         try:
             prompt = self._get_generation_prompt(document_type, user_data)
             
-            response = self.model.generate_content(prompt)
+            response_text = await self.llm.agenerate(prompt, model_name=self.model_name)
             
             logger.info(f"Successfully generated content for {document_type}")
-            return response.text
+            return response_text
             
         except Exception as e:
             logger.error(f"Error generating document content: {str(e)}")
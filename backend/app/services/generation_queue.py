@@ -0,0 +1,499 @@
+"""
+Generation Queue - Durable job table + worker pool for document generation
+Jobs live in the generation_jobs table so status survives restarts and is visible
+from every uvicorn worker. Any process running a GenerationWorkerPool claims jobs
+with SELECT ... FOR UPDATE SKIP LOCKED, so throughput scales with worker count.
+"""
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Document, GeneratedDocument, GenerationJob, GenerationJobStatus, GenerationStatus, VisaApplication
+from app.services.progress_bus import generation_topic, publish_progress
+
+
+# All generatable documents: type → (display name, progress weight, PDFGeneratorService method)
+GENERATABLE_DOCUMENTS: Dict[str, Tuple[str, int, str]] = {
+    "cover_letter": ("Cover Letter", 8, "generate_cover_letter"),
+    "nid_english": ("NID Translation", 7, "generate_nid_translation"),
+    "visiting_card": ("Visiting Card", 6, "generate_visiting_card"),
+    "financial_statement": ("Financial Statement", 8, "generate_financial_statement"),
+    "travel_itinerary": ("Travel Itinerary", 9, "generate_travel_itinerary"),
+    "travel_history": ("Travel History", 6, "generate_travel_history"),
+    "home_tie_statement": ("Home Tie Statement", 7, "generate_home_tie_statement"),
+    "asset_valuation": ("Asset Valuation", 10, "generate_asset_valuation"),
+    "tin_certificate": ("TIN Certificate", 7, "generate_tin_certificate"),
+    "tax_certificate": ("Tax Certificate", 7, "generate_tax_certificate"),
+    "trade_license": ("Trade License", 7, "generate_trade_license"),  # Business only
+    "job_noc": ("Job NOC", 7, "generate_job_noc"),  # Job only
+    "job_id_card": ("Job ID Card", 6, "generate_job_id_card"),  # Job only
+    "hotel_booking": ("Hotel Booking", 9, "generate_hotel_booking"),
+    "air_ticket": ("Air Ticket", 9, "generate_air_ticket"),
+}
+
+# Base documents for both application types
+COMMON_GENERATABLE_TYPES = [
+    "cover_letter", "nid_english", "visiting_card", "financial_statement",
+    "travel_itinerary", "travel_history", "home_tie_statement", "asset_valuation",
+    "tin_certificate", "tax_certificate", "hotel_booking", "air_ticket"
+]
+
+ACTIVE_JOB_STATUSES = [GenerationJobStatus.QUEUED, GenerationJobStatus.GENERATING]
+MAX_JOB_ATTEMPTS = 3
+
+# Status values after which a generation status no longer changes on its own
+FINAL_STATUS_VALUES = ("completed", "failed", "partial")
+
+
+def get_generatable_types(app_type) -> List[str]:
+    """Get generatable document types for an application type (business/job)"""
+    app_type = getattr(app_type, 'value', app_type) or 'business'
+    types = list(COMMON_GENERATABLE_TYPES)
+    if app_type == 'business':
+        types.append("trade_license")
+    elif app_type == 'job':
+        types.extend(["job_noc", "job_id_card"])
+    return types
+
+
+def documents_to_generate(app_type, uploaded_types) -> List[str]:
+    """Generatable document types for an application type, minus the types already uploaded"""
+    return [doc for doc in get_generatable_types(app_type) if doc not in uploaded_types]
+
+
+def get_documents_to_generate(db: Session, application: VisaApplication) -> List[str]:
+    """Generatable documents for an application that the user has not uploaded"""
+    uploaded_types = {
+        row[0].value for row in db.query(Document.document_type).filter(
+            Document.application_id == application.id
+        ).all()
+    }
+    app_type = getattr(application, 'application_type', 'business')
+    return documents_to_generate(app_type, uploaded_types)
+
+
+def get_active_job(db: Session, application_id: int) -> Optional[GenerationJob]:
+    """Get the queued or running job for an application, if any"""
+    return db.query(GenerationJob).filter(
+        GenerationJob.application_id == application_id,
+        GenerationJob.status.in_(ACTIVE_JOB_STATUSES)
+    ).first()
+
+
+def get_latest_job(db: Session, application_id: int) -> Optional[GenerationJob]:
+    """Get the most recent generation job for an application"""
+    return db.query(GenerationJob).filter(
+        GenerationJob.application_id == application_id
+    ).order_by(GenerationJob.id.desc()).first()
+
+
+def job_progress(job: GenerationJob) -> Dict:
+    """Progress fields of a job, as returned by the status endpoint and published to streams"""
+    return {
+        "status": "started" if job.status == GenerationJobStatus.QUEUED else job.status.value,
+        "progress": job.progress or 0,
+        "current_document": job.current_document,
+        "documents_completed": job.documents_completed or 0,
+        "total_documents": job.total_documents or 0,
+        "errors": job.errors or []
+    }
+
+
+def _document_summary(document_type: str, file_name: str, file_size: int) -> Dict:
+    return {"type": document_type, "name": file_name, "size": file_size}
+
+
+def completed_documents(db: Session, application_id: int) -> List[Dict]:
+    """Completed generated documents of an application (status payload entries)"""
+    rows = db.query(GeneratedDocument.document_type, GeneratedDocument.file_name, GeneratedDocument.file_size).filter(
+        GeneratedDocument.application_id == application_id,
+        GeneratedDocument.status == GenerationStatus.COMPLETED
+    ).order_by(GeneratedDocument.id).all()
+    return [_document_summary(*row) for row in rows]
+
+
+def build_generation_status(db: Session, application_id: int) -> Dict:
+    """
+    Current generation status of an application (status endpoint and stream snapshots)
+
+    Applications with a job take one round trip: the latest job outer-joined
+    with the completed documents. Only applications that never had a job fall
+    back to the generated/uploaded document tables.
+    """
+    latest_job_id = db.query(func.max(GenerationJob.id)).filter(
+        GenerationJob.application_id == application_id
+    ).scalar_subquery()
+
+    rows = db.query(
+        GenerationJob, GeneratedDocument.document_type, GeneratedDocument.file_name, GeneratedDocument.file_size
+    ).outerjoin(
+        GeneratedDocument,
+        and_(
+            GeneratedDocument.application_id == GenerationJob.application_id,
+            GeneratedDocument.status == GenerationStatus.COMPLETED
+        )
+    ).filter(GenerationJob.id == latest_job_id).order_by(GeneratedDocument.id).all()
+
+    if rows:
+        return {
+            **job_progress(rows[0][0]),
+            "completed_documents": [_document_summary(*row[1:]) for row in rows if row[1] is not None]
+        }
+
+    return _status_without_job(db, application_id)
+
+
+def _status_without_job(db: Session, application_id: int) -> Dict:
+    """Status from the document tables (not started yet, or generated before the job table existed)"""
+    # Application type and uploaded types in one query (same document list start_generation uses)
+    rows = db.query(VisaApplication.application_type, Document.document_type).outerjoin(
+        Document, Document.application_id == VisaApplication.id
+    ).filter(VisaApplication.id == application_id).all()
+    app_type = rows[0][0] if rows else None
+    uploaded_types = {document_type.value for _, document_type in rows if document_type is not None}
+    total_documents = len(documents_to_generate(app_type, uploaded_types))
+
+    docs = db.query(
+        GeneratedDocument.document_type, GeneratedDocument.file_name, GeneratedDocument.file_size, GeneratedDocument.status
+    ).filter(
+        GeneratedDocument.application_id == application_id
+    ).order_by(GeneratedDocument.id).all()
+
+    if not docs:
+        return {
+            "status": "not_started",
+            "progress": 0,
+            "documents_completed": 0,
+            "total_documents": total_documents
+        }
+
+    completed = [_document_summary(*doc[:3]) for doc in docs if doc.status == GenerationStatus.COMPLETED]
+    generating = any(doc.status == GenerationStatus.GENERATING for doc in docs)
+
+    return {
+        "status": "generating" if generating else ("completed" if len(completed) == total_documents else "partial"),
+        "progress": int((len(completed) / total_documents) * 100) if total_documents > 0 else 100,
+        "documents_completed": len(completed),
+        "total_documents": total_documents,
+        "completed_documents": completed
+    }
+
+
+def _publish(job: GenerationJob):
+    """Push the job's committed progress to open progress streams"""
+    publish_progress(generation_topic(job.application_id), job_progress(job))
+
+
+def enqueue_generation(db: Session, application_id: int, docs_to_generate: List[str]) -> GenerationJob:
+    """Persist a new generation job; any worker process will pick it up"""
+    job = GenerationJob(
+        application_id=application_id,
+        status=GenerationJobStatus.QUEUED,
+        docs_to_generate=docs_to_generate,
+        total_documents=len(docs_to_generate),
+        errors=[]
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    _publish(job)
+    logger.info(f"📥 Queued generation job #{job.id} for app {application_id} ({len(docs_to_generate)} documents)")
+    return job
+
+
+def _requeue_stale_jobs(db: Session):
+    """Re-queue jobs whose worker stopped heartbeating (crash, restart, deploy)"""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.GENERATION_JOB_STALE_AFTER)
+    stale_jobs = db.query(GenerationJob).filter(
+        GenerationJob.status == GenerationJobStatus.GENERATING,
+        GenerationJob.heartbeat_at < cutoff
+    ).with_for_update(skip_locked=True).all()
+
+    for job in stale_jobs:
+        if (job.attempts or 0) >= MAX_JOB_ATTEMPTS:
+            logger.error(f"❌ Generation job #{job.id} exceeded {MAX_JOB_ATTEMPTS} attempts, marking failed")
+            job.status = GenerationJobStatus.FAILED
+            job.error_message = "Worker stopped responding"
+        else:
+            logger.warning(f"⚠️ Re-queueing stale generation job #{job.id} (worker {job.worker_id})")
+            job.status = GenerationJobStatus.QUEUED
+            job.worker_id = None
+    db.commit()
+    for job in stale_jobs:
+        _publish(job)
+
+
+def claim_next_job(db: Session, worker_id: str) -> Optional[GenerationJob]:
+    """
+    Atomically claim the oldest queued job
+    SKIP LOCKED lets concurrent workers (threads or processes) claim different jobs
+    """
+    _requeue_stale_jobs(db)
+
+    job = db.query(GenerationJob).filter(
+        GenerationJob.status == GenerationJobStatus.QUEUED
+    ).order_by(GenerationJob.id).with_for_update(skip_locked=True).first()
+
+    if not job:
+        db.commit()
+        return None
+
+    now = datetime.now(timezone.utc)
+    job.status = GenerationJobStatus.GENERATING
+    job.worker_id = worker_id
+    job.attempts = (job.attempts or 0) + 1
+    job.started_at = job.started_at or now
+    job.heartbeat_at = now
+    job.progress = 5
+    db.commit()
+    _publish(job)
+    return job
+
+
+def _generate_isolated(generator, method_name: str, doc_name: str, running: set, lock: threading.Lock):
+    """Generate one document through its own DB session (runs in a pool thread)"""
+    with lock:
+        running.add(doc_name)
+    db = SessionLocal()
+    try:
+        getattr(generator.for_session(db), method_name)()
+    finally:
+        db.close()
+        with lock:
+            running.discard(doc_name)
+
+
+def _run_documents_sequential(db: Session, job: GenerationJob, generator, documents: List[tuple]):
+    """Generate documents one after another on the job's session"""
+    completed = 0
+    total_progress = 5
+    errors = []
+
+    for doc_type, doc_name, weight, method_name in documents:
+        job.current_document = doc_name
+        job.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+        _publish(job)
+
+        try:
+            getattr(generator, method_name)()
+            completed += 1
+            total_progress += weight
+        except Exception as e:
+            logger.error(f"❌ Error generating {doc_name}: {e}")
+            db.rollback()
+            errors.append(f"{doc_name}: {str(e)}")
+
+        job.documents_completed = completed
+        job.progress = min(total_progress, 95)
+        job.errors = list(errors)
+        job.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+        _publish(job)
+
+    return completed
+
+
+def _run_documents_parallel(db: Session, job: GenerationJob, generator, documents: List[tuple], max_workers: int):
+    """
+    Render independent documents concurrently
+    Each pool thread gets its own session via generator.for_session(); only this
+    thread touches `db`, so job progress stays single-writer.
+    """
+    completed = 0
+    total_progress = 5
+    errors = []
+    running = set()
+    lock = threading.Lock()
+    heartbeat_interval = max(settings.GENERATION_JOB_STALE_AFTER / 4, 1)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"generation-job-{job.id}") as executor:
+        pending = {
+            executor.submit(_generate_isolated, generator, method_name, doc_name, running, lock): (doc_name, weight)
+            for doc_type, doc_name, weight, method_name in documents
+        }
+
+        while pending:
+            done, _ = wait(pending, timeout=heartbeat_interval, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                doc_name, weight = pending.pop(future)
+                try:
+                    future.result()
+                    completed += 1
+                    total_progress += weight
+                except Exception as e:
+                    logger.error(f"❌ Error generating {doc_name}: {e}")
+                    errors.append(f"{doc_name}: {str(e)}")
+
+            with lock:
+                in_flight = sorted(running)
+            job.current_document = ", ".join(in_flight)[:200] or None
+            job.documents_completed = completed
+            job.progress = min(total_progress, 95)
+            job.errors = list(errors)
+            job.heartbeat_at = datetime.now(timezone.utc)
+            db.commit()
+            _publish(job)
+
+    return completed
+
+
+def run_generation_job(db: Session, job: GenerationJob):
+    """Generate all documents of a claimed job, persisting progress on the job row"""
+    from app.services.pdf_generator_service import PDFGeneratorService
+
+    application_id = job.application_id
+    try:
+        generator = PDFGeneratorService(db, application_id)
+
+        documents = [
+            (doc_type, *GENERATABLE_DOCUMENTS[doc_type])
+            for doc_type in (job.docs_to_generate or []) if doc_type in GENERATABLE_DOCUMENTS
+        ]
+
+        max_workers = min(settings.GENERATION_PARALLEL_DOCUMENTS, len(documents))
+        if max_workers > 1:
+            completed = _run_documents_parallel(db, job, generator, documents, max_workers)
+        else:
+            completed = _run_documents_sequential(db, job, generator, documents)
+
+        job.status = GenerationJobStatus.COMPLETED
+        job.progress = 100
+        job.current_document = None
+        job.completed_at = datetime.now(timezone.utc)
+        db.commit()
+        _publish(job)
+        logger.info(f"✅ Generation job #{job.id} completed: {completed}/{len(documents)} documents")
+
+    except Exception as e:
+        logger.error(f"❌ Generation job #{job.id} failed: {e}")
+        db.rollback()
+        job.status = GenerationJobStatus.FAILED
+        job.error_message = str(e)
+        job.completed_at = datetime.now(timezone.utc)
+        db.commit()
+        _publish(job)
+
+
+def _warm_up_renderer():
+    """Start (and warm) the renderer processes before the first job needs them"""
+    try:
+        from app.services.render_service import get_render_service
+        get_render_service().warm_up()
+    except Exception as e:
+        # Renders fall back to ReportLab when WeasyPrint is unusable; nothing to fail here
+        logger.warning(f"⚠️ Template renderer warm-up skipped: {e}")
+
+
+class GenerationWorkerPool:
+    """Pool of worker threads that pull generation jobs from the database queue"""
+
+    def __init__(self, num_workers: int = None, poll_interval: float = None):
+        self.num_workers = settings.GENERATION_WORKERS if num_workers is None else num_workers
+        self.poll_interval = settings.GENERATION_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._maintenance_lock = threading.Lock()
+        self._next_blob_gc = time.monotonic() + settings.BLOB_GC_INTERVAL
+
+    @property
+    def is_running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        """Start worker threads (no-op if already running)"""
+        if self.is_running or self.num_workers <= 0:
+            return
+
+        self._stop_event.clear()
+        host = socket.gethostname()
+        for idx in range(self.num_workers):
+            worker_id = f"{host}:{os.getpid()}:{idx}"
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(worker_id,),
+                name=f"generation-worker-{idx}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        logger.info(f"🏭 Started {self.num_workers} generation worker(s) in process {os.getpid()}")
+
+        if settings.TEMPLATE_WARMUP:
+            threading.Thread(target=_warm_up_renderer, name="template-warmup", daemon=True).start()
+
+    def stop(self, timeout: float = 10.0):
+        """Signal workers to stop and wait for them to finish their current job"""
+        self._stop_event.set()
+        self._wake_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        logger.info("🛑 Generation workers stopped")
+
+    def notify(self):
+        """Wake idle workers in this process immediately (e.g. right after enqueueing)"""
+        self._wake_event.set()
+
+    def _worker_loop(self, worker_id: str):
+        while not self._stop_event.is_set():
+            job_found = False
+            db = SessionLocal()
+            try:
+                job = claim_next_job(db, worker_id)
+                if job:
+                    job_found = True
+                    logger.info(f"🔧 Worker {worker_id} claimed generation job #{job.id} (app {job.application_id})")
+                    run_generation_job(db, job)
+            except Exception as e:
+                logger.error(f"❌ Generation worker {worker_id} error: {e}")
+                db.rollback()
+            finally:
+                db.close()
+
+            if not job_found:
+                self._run_maintenance()
+                self._wake_event.wait(self.poll_interval)
+                self._wake_event.clear()
+
+    def _run_maintenance(self):
+        """Periodic housekeeping on an idle worker (one thread per process at a time)"""
+        if settings.BLOB_GC_INTERVAL <= 0 or time.monotonic() < self._next_blob_gc:
+            return
+        if not self._maintenance_lock.acquire(blocking=False):
+            return
+        db = SessionLocal()
+        try:
+            self._next_blob_gc = time.monotonic() + settings.BLOB_GC_INTERVAL
+            from app.services.storage_service import StorageService
+            StorageService().collect_garbage(db)
+        except Exception as e:
+            logger.error(f"❌ Blob garbage collection failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+            self._maintenance_lock.release()
+
+
+# Singleton instance
+_worker_pool = None
+
+def get_worker_pool() -> GenerationWorkerPool:
+    """Get or create the generation worker pool for this process"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = GenerationWorkerPool()
+    return _worker_pool
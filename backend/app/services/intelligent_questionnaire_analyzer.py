@@ -11,6 +11,24 @@ from loguru import logger
 from app.models import DocumentType
 from app.services.document_requirements import DocumentRequirementsMapping, FieldRequirement
 
+ALL_DOCUMENT_TYPES = frozenset(DocumentType)
+
+# Extracted-data keys that are bookkeeping, not fields
+METADATA_KEYS = frozenset({'confidence', 'error', 'raw_text_sample', 'raw_response'})
+
+# Document type → field key prefix (others: underscores become dots)
+FIELD_PREFIXES = {
+    "passport_copy": "passport",
+    "nid_bangla": "nid",
+    "bank_solvency": "bank",
+    "visa_history": "visa_history",
+    "tin_certificate": "tin",
+    "income_tax_3years": "tax",
+    "hotel_booking": "hotel",
+    "air_ticket": "flight",
+    "asset_valuation": "assets"
+}
+
 
 class IntelligentQuestionnaireAnalyzer:
     """
@@ -106,9 +124,7 @@ class IntelligentQuestionnaireAnalyzer:
         uploaded_documents: List[DocumentType]
     ) -> List[DocumentType]:
         """Identify which documents are missing"""
-        all_documents = set(DocumentType)
-        uploaded_set = set(uploaded_documents)
-        missing = all_documents - uploaded_set
+        missing = ALL_DOCUMENT_TYPES.difference(uploaded_documents)
         return list(missing)
     
     def _extract_available_fields(
@@ -132,7 +148,7 @@ class IntelligentQuestionnaireAnalyzer:
             # Extract all non-empty fields
             for key, value in data.items():
                 # Skip metadata fields
-                if key in ['confidence', 'error', 'raw_text_sample', 'raw_response']:
+                if key in METADATA_KEYS:
                     continue
                 
                 # Check if field has meaningful value
@@ -144,18 +160,7 @@ class IntelligentQuestionnaireAnalyzer:
     
     def _get_field_prefix(self, document_type_value: str) -> str:
         """Get field prefix for a document type"""
-        mapping = {
-            "passport_copy": "passport",
-            "nid_bangla": "nid",
-            "bank_solvency": "bank",
-            "visa_history": "visa_history",
-            "tin_certificate": "tin",
-            "income_tax_3years": "tax",
-            "hotel_booking": "hotel",
-            "air_ticket": "flight",
-            "asset_valuation": "assets"
-        }
-        return mapping.get(document_type_value, document_type_value.replace("_", "."))
+        return FIELD_PREFIXES.get(document_type_value, document_type_value.replace("_", "."))
     
     def _determine_required_fields(
         self,
@@ -264,8 +269,7 @@ class IntelligentQuestionnaireAnalyzer:
             # If overall confidence is low, ask for critical field verification
             if confidence < 75:
                 # Get critical fields for this document type
-                requirements = self.requirements_map.get_requirements(doc_type)
-                critical_reqs = [r for r in requirements if r.priority == "critical"]
+                critical_reqs = self.requirements_map.get_critical_requirements(doc_type)
                 
                 prefix = self._get_field_prefix(doc_type_value)
                 
@@ -0,0 +1,258 @@
+"""
+LLM Cache - Content-addressed cache for Gemini responses
+Keys are SHA-256 hashes of model name + generation config + prompt, so re-running
+analysis on unchanged text or regenerating a document with the same inputs is
+served locally instead of spending latency and quota.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from loguru import logger
+
+from app.config import settings
+
+
+class LLMCacheBackend(ABC):
+    """Storage interface for cached responses"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Cached value, or None on a miss or expired entry"""
+
+    @abstractmethod
+    def set(self, key: str, value: str):
+        """Store a value (evicting as needed)"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every entry"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Backend name, entry count and size"""
+
+
+class SQLiteCacheBackend(LLMCacheBackend):
+    """On-disk backend with TTL and size-bounded LRU eviction (shared by all worker processes)"""
+
+    def __init__(self, path: str, ttl: int, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_accessed ON llm_cache (last_accessed)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection: commits (or rolls back) and is always closed"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        if self.ttl:
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"LLM cache evicted {evicted} entries")
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {"backend": "sqlite", "entries": entries, "size_bytes": size}
+
+
+class MemoryCacheBackend(LLMCacheBackend):
+    """In-process backend with TTL and size-bounded LRU eviction"""
+
+    def __init__(self, ttl: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key → (value, size, created_at)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, created_at = entry
+            if self.ttl and time.time() - created_at > self.ttl:
+                del self._entries[key]
+                self._size -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, time.time())
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": "memory", "entries": len(self._entries), "size_bytes": self._size}
+
+
+class LLMCache:
+    """Cache front-end: key derivation plus hit/miss and latency-saved counters"""
+
+    def __init__(self, backend: LLMCacheBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._miss_latency_total = 0.0  # Seconds spent on LLM calls after a miss
+
+    @staticmethod
+    def make_key(model_name: str, generation_config: Optional[Dict[str, Any]], prompt: str) -> str:
+        """Content address for a request"""
+        payload = json.dumps(
+            {"model": model_name, "config": generation_config or {}, "prompt": prompt},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache read failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, latency: float = 0.0):
+        with self._lock:
+            self._miss_latency_total += latency
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache write failed: {e}")
+            with self._lock:
+                self.errors += 1
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, errors = self.hits, self.misses, self.errors
+            avg_latency = self._miss_latency_total / misses if misses else 0.0
+
+        lookups = hits + misses
+        stats = {
+            "hits": hits,
+            "misses": misses,
+            "errors": errors,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_llm_latency_seconds": round(avg_latency, 3),
+            "estimated_seconds_saved": round(hits * avg_latency, 1),
+            "llm_calls_saved": hits,
+        }
+        try:
+            stats.update(self.backend.stats())
+        except Exception as e:
+            stats["backend_error"] = str(e)
+        return stats
+
+
+# Singleton instance
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Get or create the LLM cache configured in settings"""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                if settings.LLM_CACHE_BACKEND == "memory":
+                    backend = MemoryCacheBackend(settings.LLM_CACHE_TTL, settings.LLM_CACHE_MAX_BYTES)
+                else:
+                    backend = SQLiteCacheBackend(settings.LLM_CACHE_PATH, settings.LLM_CACHE_TTL, settings.LLM_CACHE_MAX_BYTES)
+                _llm_cache = LLMCache(backend)
+                logger.info(f"✅ LLM cache initialized ({settings.LLM_CACHE_BACKEND}, ttl={settings.LLM_CACHE_TTL}s)")
+    return _llm_cache
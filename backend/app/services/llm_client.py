@@ -0,0 +1,167 @@
+"""
+LLM Client - One shared, non-blocking Gemini client for analysis and generation
+All calls run on a dedicated event loop thread, so the gRPC channel and model
+objects are reused, concurrency is bounded by a single semaphore, and neither
+async handlers nor generation worker threads block on a round-trip.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from app.config import settings
+from app.services.llm_cache import get_llm_cache
+
+
+class LLMClient:
+    """Shared Gemini client with bounded concurrency, timeouts and retry with backoff"""
+
+    def __init__(
+        self,
+        max_concurrency: int = None,
+        timeout: float = None,
+        max_retries: int = None,
+        retry_backoff: float = None
+    ):
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.timeout = timeout or settings.LLM_TIMEOUT
+        self.max_retries = settings.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = settings.LLM_RETRY_BACKOFF if retry_backoff is None else retry_backoff
+        self.cache = get_llm_cache() if settings.LLM_CACHE_ENABLED else None
+
+        # Imported here, not at module level: the SDK takes ~0.5s to import and
+        # processes that never call the LLM should not pay for it
+        import google.generativeai as genai
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self._genai = genai
+
+        self._models: Dict[tuple, Any] = {}
+        self._models_lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Dedicated loop: every request shares it regardless of the caller's thread/loop
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client-loop", daemon=True)
+        self._thread.start()
+
+        logger.info(f"✅ LLMClient initialized (concurrency={self.max_concurrency}, timeout={self.timeout}s, retries={self.max_retries})")
+
+    def _get_model(self, model_name: str, generation_config: Optional[Dict[str, Any]]):
+        """Get a cached GenerativeModel for a model name + generation config"""
+        key = (model_name, tuple(sorted((generation_config or {}).items())))
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._genai.GenerativeModel(model_name, generation_config=generation_config)
+                self._models[key] = model
+            return model
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Timeouts, rate limits and transient server errors are worth retrying"""
+        if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+            return True
+        try:
+            from google.api_core import exceptions as api_exceptions
+            return isinstance(error, (
+                api_exceptions.ResourceExhausted,
+                api_exceptions.ServiceUnavailable,
+                api_exceptions.DeadlineExceeded,
+                api_exceptions.InternalServerError,
+                api_exceptions.Aborted,
+            ))
+        except ImportError:
+            return False
+
+    async def _generate_on_loop(
+        self,
+        prompt: str,
+        model_name: str,
+        generation_config: Optional[Dict[str, Any]]
+    ) -> str:
+        cache_key = None
+        if self.cache is not None:
+            # Cache IO (SQLite on disk) runs off the loop so it never stalls other in-flight calls
+            cache_key = self.cache.make_key(model_name, generation_config, prompt)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                return cached
+
+        model = self._get_model(model_name, generation_config)
+        started = time.monotonic()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    response = await asyncio.wait_for(
+                        model.generate_content_async(prompt),
+                        timeout=self.timeout
+                    )
+                text = response.text
+                if cache_key and text:
+                    await asyncio.to_thread(self.cache.set, cache_key, text, latency=time.monotonic() - started)
+                return text
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                # Exponential backoff with jitter (semaphore released while waiting)
+                delay = self.retry_backoff * (2 ** attempt) + random.uniform(0, self.retry_backoff)
+                logger.warning(f"⚠️ LLM call failed ({type(e).__name__}: {e}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def agenerate(
+        self,
+        prompt: str,
+        model_name: str = None,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Generate text without blocking the caller's event loop
+
+        Args:
+            prompt: Prompt text
+            model_name: Gemini model (defaults to settings.GEMINI_MODEL)
+            generation_config: Optional generation config (temperature, top_p, ...)
+
+        Returns:
+            Response text
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate_on_loop(prompt, model_name or settings.GEMINI_MODEL, generation_config),
+            self._loop
+        )
+        return await asyncio.wrap_future(future)
+
+    def generate(
+        self,
+        prompt: str,
+        model_name: str = None,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Blocking variant for synchronous callers (generation worker threads)"""
+        future = asyncio.run_coroutine_threadsafe(
+            self._generate_on_loop(prompt, model_name or settings.GEMINI_MODEL, generation_config),
+            self._loop
+        )
+        return future.result()
+
+    def close(self):
+        """Stop the client's event loop"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+# Singleton instance
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    """Get or create the shared LLM client"""
+    global _llm_client
+    if _llm_client is None:
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = LLMClient()
+    return _llm_client
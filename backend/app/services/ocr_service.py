@@ -0,0 +1,269 @@
+"""
+OCR Service - Bounded, memory-capped Tesseract workers
+OCR runs in a separate process pool, never in the API process. Each worker's
+data memory is capped (RLIMIT_DATA, inherited by the pdftoppm and tesseract
+subprocesses it starts), so a huge scan fails that page with MemoryError
+instead of getting the API OOM-killed. Unlike an address-space cap, it does
+not count shared libraries or the address ranges glibc and OpenMP reserve but
+never touch; tesseract is also limited to one OpenMP thread and two malloc
+arenas. Pages are rendered and recognised
+one at a time, at most OCR_WORKERS pages at once, and workers are recycled
+after OCR_MAX_TASKS_PER_CHILD pages to return fragmented memory.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from loguru import logger
+
+from app.config import settings
+from app.services.process_pool import kill_pool, start_process_group
+
+
+# ===== Worker process side (module level so it pickles under spawn) =====
+
+def _init_worker(memory_limit_mb: int, tesseract_cmd: Optional[str]):
+    """Cap the worker's memory and point pytesseract at the binary"""
+    start_process_group()  # A timed-out page kills the worker together with its pdftoppm/tesseract
+
+    # Inherited by pdftoppm/tesseract: every OpenMP thread adds a stack and every
+    # malloc arena up to 64MB, which one page at a time does not need
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    os.environ["MALLOC_ARENA_MAX"] = "2"
+
+    if memory_limit_mb > 0:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            # Windows / restricted containers: no cap, but still isolated from the API process
+            logger.warning(f"⚠️ Could not cap OCR worker memory: {e}")
+
+    if tesseract_cmd:
+        import pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _ocr_pdf_page(file_path: str, page_number: int, dpi: int, lang: str) -> str:
+    """Render one PDF page (1-based) and OCR it"""
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(
+        file_path,
+        first_page=page_number,
+        last_page=page_number,
+        dpi=dpi,
+        fmt='jpeg',
+        grayscale=True
+    )
+    if not images:
+        return ""
+
+    try:
+        # --psm 3 = Automatic page segmentation, --oem 3 = Default OCR Engine
+        return pytesseract.image_to_string(images[0], lang=lang, config='--psm 3 --oem 3')
+    finally:
+        for image in images:
+            image.close()
+
+
+def _ocr_image(image_path: str, lang: str) -> str:
+    """Preprocess an image (contrast, sharpness, threshold) and OCR it"""
+    import pytesseract
+    from PIL import Image, ImageEnhance, ImageFilter
+
+    with Image.open(image_path) as original:
+        image = original if original.mode in ['RGB', 'L'] else original.convert('RGB')
+
+        image = ImageEnhance.Contrast(image).enhance(2.0)
+        image = ImageEnhance.Sharpness(image).enhance(2.0)
+        image = ImageEnhance.Brightness(image).enhance(1.2)
+        image = image.convert('L')
+
+        # Binary threshold makes text clearer
+        threshold = 128
+        image = image.point(lambda x: 255 if x > threshold else 0)
+        image = image.filter(ImageFilter.SHARPEN)
+
+        # --psm 1 = Automatic page segmentation with orientation detection
+        return pytesseract.image_to_string(image, lang=lang, config='--psm 1 --oem 3')
+
+
+# ===== API process side =====
+
+class OCRService:
+    """Queue OCR work onto an isolated, memory-capped process pool"""
+
+    def __init__(self):
+        self.workers = settings.OCR_WORKERS
+        self.dpi = settings.OCR_DPI
+        self.max_pages = settings.OCR_MAX_PAGES
+        self.page_timeout = settings.OCR_PAGE_TIMEOUT
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.tesseract_cmd = self._find_tesseract()
+        self.available = settings.OCR_ENABLED and self.workers > 0 and self._check_available()
+
+    def _find_tesseract(self) -> Optional[str]:
+        possible_paths = [
+            '/usr/bin/tesseract',
+            '/usr/local/bin/tesseract',
+            'C:\\Program Files\\Tesseract-OCR\\tesseract.exe',  # Windows
+            '/opt/homebrew/bin/tesseract'  # Mac M1
+        ]
+        return next((path for path in possible_paths if os.path.exists(path)), None)
+
+    def _check_available(self) -> bool:
+        try:
+            import pytesseract  # noqa: F401
+            import pdf2image  # noqa: F401
+        except ImportError as e:
+            logger.warning(f"⚠️ OCR libraries not available: {e}")
+            logger.warning("Install with: pip install pytesseract pdf2image Pillow")
+            return False
+        if self.tesseract_cmd is None:
+            logger.warning("⚠️ Tesseract binary not found, OCR disabled")
+            logger.warning("Install system packages: sudo apt-get install tesseract-ocr tesseract-ocr-ben poppler-utils")
+            return False
+        logger.info(f"✅ OCR support available (tesseract at {self.tesseract_cmd})")
+        return True
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(settings.OCR_WORKER_MEMORY_MB, self.tesseract_cmd),
+                    max_tasks_per_child=settings.OCR_MAX_TASKS_PER_CHILD
+                )
+                logger.info(
+                    f"🏭 Started OCR pool ({self.workers} workers, "
+                    f"{settings.OCR_WORKER_MEMORY_MB}MB cap, {self.dpi} DPI)"
+                )
+            return self._pool
+
+    def _reset_pool(self, pool: Optional[ProcessPoolExecutor] = None):
+        """
+        Kill the pool's workers (a hung page would survive shutdown) and drop it;
+        the next call starts a fresh one. With a pool given, only that pool is
+        reset, so a caller seeing an already replaced pool fail leaves the new one alone.
+        """
+        with self._lock:
+            if pool is not None and pool is not self._pool:
+                return
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            kill_pool(pool)
+
+    def shutdown(self):
+        self._reset_pool()
+
+    def _run(self, fn, *args) -> str:
+        """Run one OCR task on the pool; failures are logged and yield ''"""
+        pool = None
+        try:
+            pool = self._get_pool()
+            return pool.submit(fn, *args).result(timeout=self.page_timeout)
+        except MemoryError:
+            logger.error(f"❌ OCR task exceeded the {settings.OCR_WORKER_MEMORY_MB}MB worker cap")
+        except FutureTimeoutError:
+            logger.error(f"❌ OCR task timed out after {self.page_timeout}s, killing OCR workers")
+            self._reset_pool(pool)
+        except BrokenProcessPool:
+            logger.error("❌ OCR worker died, restarting pool")
+            self._reset_pool(pool)
+        except Exception as e:
+            logger.error(f"❌ OCR error: {e}")
+        return ""
+
+    def ocr_pdf(self, file_path: str, num_pages: int) -> str:
+        """
+        OCR a PDF page by page (at most OCR_MAX_PAGES pages)
+
+        Args:
+            file_path: Path to the PDF file
+            num_pages: Page count of the PDF
+
+        Returns:
+            Text with '--- Page N ---' separators ('' if OCR is unavailable)
+        """
+        if not self.available:
+            return ""
+
+        total_pages = min(num_pages, self.max_pages)
+        if num_pages > total_pages:
+            logger.warning(f"⚠️ PDF has {num_pages} pages, OCR limited to first {total_pages} (OCR_MAX_PAGES)")
+
+        logger.info(f"🤖 OCR on {total_pages} page(s) of {os.path.basename(file_path)}")
+
+        # Submit all pages; the pool runs at most OCR_WORKERS of them at once
+        try:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_ocr_pdf_page, os.path.abspath(file_path), page_number, self.dpi, settings.OCR_LANG)
+                for page_number in range(1, total_pages + 1)
+            ]
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            return ""
+
+        sections: List[str] = []
+        for page_number, future in enumerate(futures, 1):
+            try:
+                page_text = future.result(timeout=self.page_timeout)
+                logger.info(f"📝 Page {page_number}: OCR extracted {len(page_text)} characters")
+            except MemoryError:
+                logger.error(f"❌ OCR page {page_number} exceeded the {settings.OCR_WORKER_MEMORY_MB}MB worker cap")
+                page_text = "[OCR failed: page too large for memory limit]"
+            except FutureTimeoutError:
+                # Kill the hung worker; the remaining pages would otherwise queue behind it
+                logger.error(f"❌ OCR page {page_number} timed out after {self.page_timeout}s, skipping remaining pages")
+                self._reset_pool(pool)
+                sections.append(f"--- Page {page_number} ---\n[OCR failed: timeout]")
+                break
+            except BrokenProcessPool:
+                logger.error(f"❌ OCR worker died on page {page_number}, restarting pool")
+                self._reset_pool(pool)
+                sections.append(f"--- Page {page_number} ---\n[OCR failed: worker died]")
+                break
+            except Exception as e:
+                logger.error(f"❌ OCR error on page {page_number}: {e}")
+                page_text = f"[OCR failed: {e}]"
+            sections.append(f"--- Page {page_number} ---\n{page_text}")
+
+        text = "\n".join(sections).strip()
+        logger.info(f"✅ OCR completed: {len(text)} total characters extracted")
+        return text
+
+    def ocr_image(self, image_path: str) -> str:
+        """OCR an image file (preprocessing happens in the worker too)"""
+        if not self.available:
+            return ""
+        return self._run(_ocr_image, os.path.abspath(image_path), settings.OCR_IMAGE_LANG).strip()
+
+
+# Singleton instance
+_ocr_service = None
+_ocr_service_lock = threading.Lock()
+
+def get_ocr_service() -> OCRService:
+    """Get or create the OCR service for this process"""
+    global _ocr_service
+    if _ocr_service is None:
+        with _ocr_service_lock:
+            if _ocr_service is None:
+                _ocr_service = OCRService()
+    return _ocr_service
+
+
+def shutdown_ocr_service():
+    """Stop the OCR pool if this process ever started the service"""
+    if _ocr_service is not None:
+        _ocr_service.shutdown()
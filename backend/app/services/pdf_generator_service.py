@@ -5,6 +5,7 @@ Uses ReportLab for professional PDF generation and Gemini for intelligent conten
 import os
 import io
 import re
+import copy
 import random
 import requests
 from datetime import datetime, timedelta
@@ -18,13 +19,15 @@ from reportlab.lib import colors
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from PIL import Image
-import google.generativeai as genai
 from sqlalchemy.orm import Session
 from loguru import logger
 
 from app.models import ExtractedData, QuestionnaireResponse, GeneratedDocument, GenerationStatus, VisaApplication
 from app.config import settings
 from app.services.auto_fill_service import auto_fill_questionnaire
+from app.services.field_context import FieldContext
+from app.services.llm_client import get_llm_client
+from app.services.render_service import get_render_service
 
 
 class PDFGeneratorService:
@@ -92,9 +95,9 @@ class PDFGeneratorService:
             VisaApplication.id == application_id
         ).first()
         
-        # Configure Gemini
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+        # Shared Gemini client (connection reuse + bounded concurrency across workers)
+        self.llm = get_llm_client()
+        self.model_name = 'models/gemini-2.5-flash'
         
         # Load all extracted data
         self.extracted_data = self._load_extracted_data()
@@ -103,6 +106,23 @@ class PDFGeneratorService:
         # Auto-fill missing data with realistic values
         self._auto_fill_missing_data()
         
+        # Resolve field lookups once; every document builder reads through it
+        self.fields = FieldContext(self.application, self.questionnaire_data, self.extracted_data, self.KEY_MAPPING)
+    
+    def for_session(self, db: Session) -> "PDFGeneratorService":
+        """
+        Copy of this generator bound to another DB session
+        Reuses the already loaded (and auto-filled) data so documents generated in
+        parallel stay consistent, while each worker commits through its own session.
+        The field context is read-only after construction, so clones share it.
+        """
+        clone = copy.copy(self)
+        clone.db = db
+        clone.application = db.query(VisaApplication).filter(
+            VisaApplication.id == self.application_id
+        ).first()
+        return clone
+        
     def _load_extracted_data(self) -> Dict[str, Any]:
         """Load all extracted data from database"""
         records = self.db.query(ExtractedData).filter(
@@ -277,76 +297,7 @@ class PDFGeneratorService:
     
     def _get_value(self, *keys) -> str:
         """Get value with priority: Application (name/email/phone) → Questionnaire → Extraction → KEY_MAPPING"""
-        
-        # PRIORITY 0: Use application data for name, email, phone (ALWAYS)
-        for key in keys:
-            clean_key = key.split('.')[-1] if '.' in key else key
-            
-            if self.application:
-                # Map questionnaire keys to application fields
-                if clean_key in ['full_name', 'applicant_name', 'name']:
-                    if self.application.applicant_name:
-                        return self.application.applicant_name
-                elif clean_key in ['email', 'applicant_email']:
-                    if self.application.applicant_email:
-                        return self.application.applicant_email
-                elif clean_key in ['phone', 'phone_number', 'applicant_phone']:
-                    if self.application.applicant_phone:
-                        return self.application.applicant_phone
-        
-        # Priority 1: Check questionnaire data (includes user input + auto-fill)
-        for key in keys:
-            # Remove document type prefix if present (e.g., 'passport_copy.full_name' → 'full_name')
-            clean_key = key.split('.')[-1] if '.' in key else key
-            
-            # Direct match in questionnaire
-            value = self.questionnaire_data.get(clean_key)
-            if value and str(value).strip():
-                logger.debug(f"✅ Found '{key}' in questionnaire: {value}")
-                return str(value)
-            
-            # Try with original key (for dotted keys in questionnaire)
-            value = self.questionnaire_data.get(key)
-            if value and str(value).strip():
-                logger.debug(f"✅ Found '{key}' in questionnaire: {value}")
-                return str(value)
-            
-            # Check KEY_MAPPING for alternative questionnaire keys
-            if clean_key in self.KEY_MAPPING:
-                for mapped_key in self.KEY_MAPPING[clean_key]:
-                    # Check if it's a simple key in questionnaire
-                    if '.' not in mapped_key:
-                        value = self.questionnaire_data.get(mapped_key)
-                        if value and str(value).strip():
-                            logger.debug(f"✅ Found '{key}' via mapping '{mapped_key}' in questionnaire: {value}")
-                            return str(value)
-        
-        # Priority 2: Check extracted data from documents
-        for key in keys:
-            if '.' in key:
-                doc_type, field = key.split('.', 1)
-                if doc_type in self.extracted_data:
-                    value = self.extracted_data[doc_type].get(field)
-                    if value and str(value).strip():
-                        logger.debug(f"✅ Found '{key}' in extracted_data: {value}")
-                        return str(value)
-        
-        # Priority 3: Try KEY_MAPPING alternatives in extracted data
-        for key in keys:
-            clean_key = key.split('.')[-1] if '.' in key else key
-            if clean_key in self.KEY_MAPPING:
-                for mapped_key in self.KEY_MAPPING[clean_key]:
-                    if '.' in mapped_key:
-                        doc_type, field = mapped_key.split('.', 1)
-                        if doc_type in self.extracted_data:
-                            value = self.extracted_data[doc_type].get(field)
-                            if value and str(value).strip():
-                                logger.debug(f"✅ Found '{key}' via mapping '{mapped_key}' in extraction: {value}")
-                                return str(value)
-        
-        # If still not found, log at debug level (these are optional fields)
-        logger.debug(f"⚠️  Missing value for keys: {keys} (even after auto-fill)")
-        return ""
+        return self.fields.get(*keys)
     
     def _create_document_record(self, doc_type: str, file_name: str) -> GeneratedDocument:
         """Create database record for generated document"""
@@ -374,8 +325,7 @@ class PDFGeneratorService:
     def _generate_content_with_ai(self, prompt: str) -> str:
         """Generate content using Gemini"""
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self.llm.generate(prompt, model_name=self.model_name)
         except Exception as e:
             print(f"AI generation error: {e}")
             return ""
@@ -940,14 +890,12 @@ class PDFGeneratorService:
             
             # Try WeasyPrint first, fallback to ReportLab if it fails
             try:
-                from app.services.template_renderer import TemplateRenderer
-                renderer = TemplateRenderer()
-                renderer.render_visiting_card(template_data, file_path)
+                get_render_service().render_template('visiting_card', template_data, file_path)
                 logger.info("✅ Visiting card generated with WeasyPrint template")
             except Exception as template_error:
                 logger.warning(f"⚠️ WeasyPrint failed: {template_error}. Falling back to ReportLab...")
                 # Fallback: Generate with ReportLab
-                self._generate_visiting_card_reportlab(template_data, file_path)
+                get_render_service().render_reportlab('visiting_card', template_data, file_path)
                 logger.info("✅ Visiting card generated with ReportLab fallback")
             
             self._update_progress(doc_record, 90)
@@ -964,7 +912,8 @@ class PDFGeneratorService:
             self.db.commit()
             raise
     
-    def _generate_visiting_card_reportlab(self, data: dict, file_path: str):
+    @staticmethod
+    def _generate_visiting_card_reportlab(data: dict, file_path: str):
         """Fallback: Generate ULTRA-PREMIUM luxury visiting card using ReportLab"""
         from reportlab.pdfgen import canvas as pdf_canvas
         from reportlab.lib import colors
@@ -1853,14 +1802,12 @@ Total word count: 950-1200 words (COUNT CAREFULLY - this fills 1.5-2 pages exact
             
             # Try WeasyPrint first, fallback to ReportLab if it fails
             try:
-                from app.services.template_renderer import TemplateRenderer
-                renderer = TemplateRenderer()
-                renderer.render_asset_valuation(template_data, file_path)
+                get_render_service().render_template('asset_valuation', template_data, file_path)
                 logger.info("✅ Asset valuation generated with WeasyPrint 13-page template")
             except Exception as template_error:
                 logger.warning(f"⚠️ WeasyPrint failed: {template_error}. Falling back to ReportLab...")
                 # Fallback: Generate with ReportLab
-                self._generate_asset_valuation_reportlab(template_data, file_path)
+                get_render_service().render_reportlab('asset_valuation', template_data, file_path)
                 logger.info("✅ Asset valuation generated with ReportLab fallback")
             
             self._update_progress(doc_record, 90)
@@ -1878,7 +1825,8 @@ Total word count: 950-1200 words (COUNT CAREFULLY - this fills 1.5-2 pages exact
             self.db.commit()
             raise
     
-    def _generate_asset_valuation_reportlab(self, data: dict, file_path: str):
+    @staticmethod
+    def _generate_asset_valuation_reportlab(data: dict, file_path: str):
         """Fallback: Generate ULTRA-PREMIUM LUXURY asset valuation using ReportLab"""
         from reportlab.pdfgen import canvas as pdf_canvas
         from reportlab.lib import colors
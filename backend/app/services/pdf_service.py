@@ -1,57 +1,85 @@
 """
 PDF Service - Enhanced version with complete OCR, image support, and better text extraction
+OCR itself runs in the memory-capped worker pool of OCRService.
 """
-import PyPDF2
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from loguru import logger
+import hashlib
 import os
-from PIL import Image
-import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from app.services.ocr_service import get_ocr_service
+from app.services.pdf_text_backends import extract_page_texts, get_text_backend
+
+
+# Bump when extraction output changes (quality rules, OCR handling); stored
+# extraction fingerprints from older versions then no longer match
+EXTRACTOR_VERSION = "1"
+
+# Parsed PDFs kept in memory, keyed by (path, mtime, size, backend) so edits invalidate them
+INSPECTION_CACHE_SIZE = 64
+
+
+@dataclass
+class PDFInspection:
+    """Everything one parse of a PDF yields (see PDFService.inspect)"""
+    file_path: str
+    file_size: int = 0
+    readable: bool = False
+    num_pages: int = 0
+    page_texts: List[str] = field(default_factory=list)  # Per page, "" where extraction failed
+    failed_pages: List[int] = field(default_factory=list)  # 0-based indexes
+    info: Dict[str, str] = field(default_factory=dict)  # Document info (title, producer, ...)
+    text: str = ""  # Pages joined with newlines, stripped
+    text_length: int = 0
+    word_count: int = 0
+    text_quality: str = 'unknown'  # 'good', 'poor', 'scanned'
+    needs_ocr: bool = False  # Too little / garbled text for the standard extraction to be trusted
+    ocr_text: Optional[str] = None  # Filled on first OCR of this file
+    error: Optional[str] = None
+    
+    @property
+    def file_size_mb(self) -> float:
+        return round(self.file_size / (1024 * 1024), 2)
+    
+    @property
+    def has_text(self) -> bool:
+        return self.text_length > 50
+
+
+_inspection_cache: "OrderedDict[Tuple[str, int, int, str], PDFInspection]" = OrderedDict()
+_inspection_cache_lock = threading.Lock()
 
 
 class PDFService:
     """Enhanced service for PDF processing with automatic OCR and image support"""
     
     def __init__(self):
-        """Initialize PDF service with OCR capabilities"""
-        self.ocr_available = self._check_ocr_availability()
-        self._configure_tesseract()
+        """Initialize PDF service (OCR is probed on first use, uploads only need the text backend)"""
+        self.text_backend = get_text_backend()
     
-    def _check_ocr_availability(self) -> bool:
-        """Check if OCR libraries are available"""
-        try:
-            import pytesseract
-            from pdf2image import convert_from_path
-            logger.info("✅ OCR support available (pytesseract + pdf2image)")
-            return True
-        except ImportError as e:
-            logger.warning(f"⚠️ OCR libraries not available: {str(e)}")
-            logger.warning("Install with: pip install pytesseract pdf2image Pillow")
-            logger.warning("Also install system packages: sudo apt-get install tesseract-ocr tesseract-ocr-ben")
-            return False
+    @property
+    def ocr(self):
+        return get_ocr_service()
     
-    def _configure_tesseract(self):
-        """Configure Tesseract for better accuracy"""
-        if not self.ocr_available:
-            return
+    @property
+    def ocr_available(self) -> bool:
+        return self.ocr.available
+    
+    def extraction_fingerprint(self, content_sha256: str) -> str:
+        """
+        Identity of an extraction: file bytes + extractor version + text backend
         
-        try:
-            import pytesseract
-            # Try to find tesseract executable (adjust path based on system)
-            possible_paths = [
-                '/usr/bin/tesseract',
-                '/usr/local/bin/tesseract',
-                'C:\\Program Files\\Tesseract-OCR\\tesseract.exe',  # Windows
-                '/opt/homebrew/bin/tesseract'  # Mac M1
-            ]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    pytesseract.pytesseract.tesseract_cmd = path
-                    logger.info(f"✅ Tesseract configured at: {path}")
-                    break
-        except Exception as e:
-            logger.warning(f"Could not configure Tesseract path: {str(e)}")
+        Args:
+            content_sha256: SHA-256 of the file bytes
+            
+        Returns:
+            Hex digest that changes whenever the extracted text could change
+        """
+        key = f"{content_sha256}:{EXTRACTOR_VERSION}:{self.text_backend.name}"
+        return hashlib.sha256(key.encode()).hexdigest()
     
     def extract_text_from_file(self, file_path: str) -> str:
         """
@@ -88,6 +116,98 @@ class PDFService:
             logger.error(f"❌ Error extracting text from file {file_path}: {str(e)}")
             return ""
     
+    def inspect(self, file_path: str) -> PDFInspection:
+        """
+        Parse a PDF once: page count, per-page text, metadata and text-quality stats
+        
+        Results are cached per (path, mtime, size), so every view below
+        (extraction, validation, metadata, page count) shares one parse.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            PDFInspection (error is set if the file could not be parsed)
+            
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        stat = os.stat(file_path)
+        cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, self.text_backend.name)
+        
+        with _inspection_cache_lock:
+            inspection = _inspection_cache.get(cache_key)
+            if inspection is not None:
+                _inspection_cache.move_to_end(cache_key)
+                return inspection
+        
+        inspection = self._parse_pdf(file_path, stat.st_size)
+        
+        with _inspection_cache_lock:
+            _inspection_cache[cache_key] = inspection
+            while len(_inspection_cache) > INSPECTION_CACHE_SIZE:
+                _inspection_cache.popitem(last=False)
+        
+        return inspection
+    
+    def _parse_pdf(self, file_path: str, file_size: int) -> PDFInspection:
+        """Single pass over a file with the configured text backend"""
+        inspection = PDFInspection(file_path=file_path, file_size=file_size)
+        
+        try:
+            logger.info(f"📖 Inspecting PDF: {os.path.basename(file_path)} ({self.text_backend.name})")
+            
+            num_pages, info, page_texts = extract_page_texts(file_path, self.text_backend)
+            inspection.num_pages = num_pages
+            inspection.info = info
+            inspection.readable = True
+            
+            for page_num, page_text in enumerate(page_texts):
+                if page_text is None:
+                    inspection.page_texts.append("")
+                    inspection.failed_pages.append(page_num)
+                else:
+                    inspection.page_texts.append(page_text)
+            
+        except Exception as e:
+            logger.error(f"❌ Error parsing PDF {file_path}: {str(e)}")
+            inspection.error = str(e)
+            return inspection
+        
+        failed = set(inspection.failed_pages)
+        inspection.text = "\n".join(
+            text for idx, text in enumerate(inspection.page_texts) if idx not in failed
+        ).strip()
+        self._assess_text_quality(inspection)
+        
+        logger.info(f"📊 {inspection.num_pages} page(s), {inspection.text_length} chars, {inspection.word_count} words - Quality: {inspection.text_quality}")
+        return inspection
+    
+    def _assess_text_quality(self, inspection: PDFInspection):
+        """Fill text-quality stats and the OCR verdict from inspection.text"""
+        text_length = len(inspection.text)
+        words = len(inspection.text.split())
+        
+        inspection.text_length = text_length
+        inspection.word_count = words
+        
+        if text_length < 50:
+            inspection.text_quality = 'scanned'
+        elif words < 20:
+            inspection.text_quality = 'poor'
+        else:
+            inspection.text_quality = 'good'
+        
+        # Criteria for triggering OCR:
+        # 1. Very little text extracted (< 100 chars)
+        # 2. Very few words (< 20 words)
+        # 3. Low character-to-word ratio (might be garbled)
+        inspection.needs_ocr = (
+            text_length < 100 or
+            words < 20 or
+            (words > 0 and (text_length / words) < 3)
+        )
+    
     def extract_text_from_pdf(
         self, 
         file_path: str, 
@@ -109,177 +229,65 @@ class PDFService:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"PDF file not found: {file_path}")
             
-            text = ""
+            inspection = self.inspect(file_path)
+            if inspection.error:
+                raise ValueError(inspection.error)
             
-            # Step 1: Try standard text extraction
-            logger.info(f"📖 Attempting standard PDF text extraction: {os.path.basename(file_path)}")
+            text = inspection.text
             
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                num_pages = len(pdf_reader.pages)
-                
-                logger.info(f"📄 PDF has {num_pages} page(s)")
-                
-                # Extract text from all pages
-                for page_num in range(num_pages):
-                    try:
-                        page = pdf_reader.pages[page_num]
-                        page_text = page.extract_text()
-                        text += page_text + "\n"
-                    except Exception as e:
-                        logger.warning(f"⚠️ Error extracting text from page {page_num + 1}: {str(e)}")
-                        continue
-            
-            # Clean and measure quality
-            text_clean = text.strip()
-            text_length = len(text_clean)
-            words = len(text_clean.split())
-            
-            logger.info(f"📊 Standard extraction: {text_length} chars, {words} words")
-            
-            # Step 2: Auto-detect if OCR is needed
-            needs_ocr = False
-            
-            if auto_detect:
-                # Criteria for triggering OCR:
-                # 1. Very little text extracted (< 100 chars)
-                # 2. Very few words (< 20 words)
-                # 3. Low character-to-word ratio (might be garbled)
-                
-                if text_length < 100:
-                    logger.info("🔍 Very little text found, will use OCR")
-                    needs_ocr = True
-                elif words < 20:
-                    logger.info("🔍 Too few words, will use OCR")
-                    needs_ocr = True
-                elif words > 0 and (text_length / words) < 3:
-                    logger.info("🔍 Poor text quality detected, will use OCR")
-                    needs_ocr = True
-            
-            # Step 3: OCR DISABLED - Not needed for this system
-            # All data comes from questionnaire, OCR was optional feature
-            if needs_ocr:
-                logger.info("ℹ️ OCR disabled (not needed - questionnaire provides all data)")
-            
-            logger.info(f"✅ Final extraction: {len(text_clean)} characters from {os.path.basename(file_path)}")
-            return text_clean
+            # Scanned / garbled PDFs go to the OCR workers
+            if auto_detect and inspection.needs_ocr:
+                if use_ocr and self.ocr_available:
+                    ocr_text = self.extract_text_with_ocr(file_path)
+                    if len(ocr_text) > len(text):
+                        logger.info(f"🤖 Using OCR text ({len(ocr_text)} chars vs {len(text)} standard)")
+                        text = ocr_text
+                else:
+                    logger.info("ℹ️ OCR not available (questionnaire provides all data)")
+            
+            logger.info(f"✅ Final extraction: {len(text)} characters from {os.path.basename(file_path)}")
+            return text
             
         except Exception as e:
             logger.error(f"❌ Error extracting text from PDF {file_path}: {str(e)}")
             
-            # OCR disabled - not needed for this application
-            logger.info("ℹ️ OCR disabled - questionnaire system handles all data collection")
-            
             return ""
     
     def extract_text_with_ocr(self, file_path: str) -> str:
         """
-        OCR DISABLED - Not needed since all data comes from questionnaire
+        OCR a PDF on the isolated OCR worker pool
+        
+        Pages are rendered one at a time at OCR_DPI, up to OCR_MAX_PAGES,
+        in memory-capped worker processes (see OCRService).
         
         Args:
             file_path: Path to the PDF file
             
         Returns:
-            Empty string (OCR disabled)
+            OCR text ('' if OCR is unavailable or failed)
         """
-        logger.info("ℹ️ OCR disabled - all data collected via questionnaire")
-        return ""  # OCR completely disabled to save memory
+        if not self.ocr_available:
+            logger.info("ℹ️ OCR not available - all data collected via questionnaire")
+            return ""
         
         try:
-            import pytesseract
-            from pdf2image import convert_from_path
-            
-            logger.info(f"🤖 Starting high-quality OCR on: {os.path.basename(file_path)}")
-            
-            # Check file size first
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            logger.info(f"📦 PDF file size: {file_size_mb:.2f} MB")
-            
-            # ULTRA-CONSERVATIVE limits for free tier (512MB RAM)
-            MAX_FILE_SIZE_MB = 2  # Only 2MB files for OCR (was 5MB)
-            if file_size_mb > MAX_FILE_SIZE_MB:
-                logger.warning(f"⚠️ File too large for OCR ({file_size_mb:.2f} MB > {MAX_FILE_SIZE_MB} MB). Using basic text extraction only.")
-                logger.warning(f"💡 For better OCR support, upgrade to paid plan or use smaller files.")
-                return f"[File too large for OCR: {file_size_mb:.2f} MB. Basic text extraction used. For OCR, use files <{MAX_FILE_SIZE_MB}MB or upgrade plan.]"
-            
-            # Get page count first without loading all pages
-            with open(file_path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                total_pages = len(pdf_reader.pages)
-            
-            # STRICT page limit for free tier
-            MAX_PAGES = 3  # Only 3 pages max (was 10)
-            if total_pages > MAX_PAGES:
-                logger.warning(f"⚠️ PDF has {total_pages} pages. Processing only first {MAX_PAGES} pages (free tier limit).")
-                logger.warning(f"💡 Upgrade to paid plan for unlimited page processing.")
-                total_pages = MAX_PAGES
-            
-            logger.info(f"🤖 Starting memory-efficient OCR on {total_pages} page(s)")
-            
-            text = ""
-            
-            # Process pages ONE AT A TIME to manage memory
-            for page_num in range(total_pages):
-                try:
-                    logger.info(f"🔍 OCR processing page {page_num+1}/{total_pages}...")
-                    
-                    # Convert SINGLE page to image (ultra memory efficient)
-                    images = convert_from_path(
-                        file_path,
-                        first_page=page_num + 1,
-                        last_page=page_num + 1,
-                        dpi=150,  # MINIMAL DPI for free tier (90% less memory than 400)
-                        fmt='jpeg',
-                        grayscale=True
-                    )
-                    
-                    if not images:
-                        logger.warning(f"⚠️ No image generated for page {page_num+1}")
-                        continue
-                    
-                    image = images[0]
-            
-                    # OCR the single page
-                    try:
-                        # Use English only for better reliability
-                        # --psm 3 = Automatic page segmentation (more reliable than psm 1)
-                        # --oem 3 = Default OCR Engine
-                        page_text = pytesseract.image_to_string(
-                            image,
-                            lang='eng',  # English only (more stable than eng+ben)
-                            config='--psm 3 --oem 3'
-                        )
-                        
-                        text += f"\n--- Page {page_num+1} ---\n{page_text}"
-                        logger.info(f"📝 Page {page_num+1}: Extracted {len(page_text)} characters")
-                        
-                    except Exception as ocr_error:
-                        logger.error(f"❌ OCR error on page {page_num+1}: {str(ocr_error)}")
-                        text += f"\n--- Page {page_num+1} ---\n[OCR failed: {str(ocr_error)}]\n"
-                    
-                    # Clean up memory after each page
-                    del images
-                    del image
-                    
-                except Exception as page_error:
-                    logger.error(f"❌ Error processing page {page_num+1}: {str(page_error)}")
-                    continue
-            
-            text_clean = text.strip()
-            logger.info(f"✅ OCR completed: {len(text_clean)} total characters extracted")
-            
-            if len(text_clean) < 50:
-                logger.warning(f"⚠️ OCR extracted very little text ({len(text_clean)} chars). Document may be blank or very low quality.")
-            
-            return text_clean
+            inspection = self.inspect(file_path)
+            if inspection.ocr_text is None:
+                inspection.ocr_text = self.ocr.ocr_pdf(file_path, inspection.num_pages)
+            
+            if len(inspection.ocr_text) < 50:
+                logger.warning(f"⚠️ OCR extracted very little text ({len(inspection.ocr_text)} chars). Document may be blank or very low quality.")
+            
+            return inspection.ocr_text
             
         except Exception as e:
-            logger.error(f"❌ Error performing OCR on {file_path}: {str(e)}", exc_info=True)
+            logger.error(f"❌ Error performing OCR on {file_path}: {str(e)}")
             return ""
     
     def extract_text_from_image(self, image_path: str) -> str:
         """
         Enhanced image text extraction with advanced preprocessing
+        (runs on the OCR worker pool)
         
         Args:
             image_path: Path to the image file
@@ -291,71 +299,14 @@ class PDFService:
             logger.warning("⚠️ OCR not available for image extraction")
             return ""
         
-        try:
-            import pytesseract
-            from PIL import Image, ImageEnhance, ImageFilter
-            
-            logger.info(f"📸 Starting enhanced OCR on image: {os.path.basename(image_path)}")
-            
-            # Load image
-            image = Image.open(image_path)
-            original_mode = image.mode
-            logger.info(f"📷 Image mode: {original_mode}, Size: {image.size}")
-            
-            # Convert to RGB if needed
-            if image.mode not in ['RGB', 'L']:
-                image = image.convert('RGB')
-                logger.info(f"Converted to RGB from {original_mode}")
-            
-            # ===== Enhanced preprocessing for better OCR =====
-            
-            # 1. Increase contrast significantly
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(2.0)  # ← INCREASED from 1.5 to 2.0
-            logger.info("✓ Contrast enhanced")
-            
-            # 2. Increase sharpness
-            enhancer = ImageEnhance.Sharpness(image)
-            image = enhancer.enhance(2.0)  # ← ADDED sharpness enhancement
-            logger.info("✓ Sharpness enhanced")
-            
-            # 3. Increase brightness slightly
-            enhancer = ImageEnhance.Brightness(image)
-            image = enhancer.enhance(1.2)
-            logger.info("✓ Brightness adjusted")
-            
-            # 4. Convert to grayscale for better OCR
-            image = image.convert('L')
-            logger.info("✓ Converted to grayscale")
-            
-            # 5. Apply threshold to make text clearer
-            # Convert to binary (black and white only)
-            threshold = 128
-            image = image.point(lambda x: 255 if x > threshold else 0)
-            logger.info("✓ Applied binary threshold")
-            
-            # 6. Apply additional sharpening filter
-            image = image.filter(ImageFilter.SHARPEN)
-            logger.info("✓ Applied sharpening filter")
-            
-            # ===== Perform OCR with optimal settings =====
-            text = pytesseract.image_to_string(
-                image,
-                lang='eng+ben',  # English + Bengali
-                config='--psm 1 --oem 3'  # ← CHANGED from psm 3 to psm 1 for better results
-            )
-            
-            text_clean = text.strip()
-            logger.info(f"✅ Extracted {len(text_clean)} characters from image: {os.path.basename(image_path)}")
-            
-            if len(text_clean) < 50:
-                logger.warning(f"⚠️ Very little text extracted ({len(text_clean)} chars). Image may be low quality or contain minimal text.")
-            
-            return text_clean
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting text from image {image_path}: {str(e)}", exc_info=True)
-            return ""
+        logger.info(f"📸 Starting enhanced OCR on image: {os.path.basename(image_path)}")
+        text_clean = self.ocr.ocr_image(image_path)
+        logger.info(f"✅ Extracted {len(text_clean)} characters from image: {os.path.basename(image_path)}")
+        
+        if len(text_clean) < 50:
+            logger.warning(f"⚠️ Very little text extracted ({len(text_clean)} chars). Image may be low quality or contain minimal text.")
+        
+        return text_clean
     
     def get_pdf_metadata(self, file_path: str) -> Dict[str, Any]:
         """
@@ -368,22 +319,16 @@ class PDFService:
             Dictionary containing PDF metadata
         """
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                
-                metadata = {
-                    'num_pages': len(pdf_reader.pages),
-                    'file_size': os.path.getsize(file_path),
-                    'file_size_mb': round(os.path.getsize(file_path) / (1024 * 1024), 2),
-                    'info': {}
-                }
-                
-                if pdf_reader.metadata:
-                    for key, value in pdf_reader.metadata.items():
-                        metadata['info'][key] = str(value)
-                
-                logger.info(f"📊 Extracted metadata from {file_path}: {metadata['num_pages']} pages")
-                return metadata
+            inspection = self.inspect(file_path)
+            if inspection.error:
+                raise ValueError(inspection.error)
+            
+            return {
+                'num_pages': inspection.num_pages,
+                'file_size': inspection.file_size,
+                'file_size_mb': inspection.file_size_mb,
+                'info': dict(inspection.info)
+            }
                 
         except Exception as e:
             logger.error(f"❌ Error extracting metadata from PDF {file_path}: {str(e)}")
@@ -398,15 +343,80 @@ class PDFService:
     def get_page_count(self, file_path: str) -> int:
         """Get the number of pages in a PDF file"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                page_count = len(pdf_reader.pages)
-                logger.info(f"📄 PDF {file_path} has {page_count} pages")
-                return page_count
+            inspection = self.inspect(file_path)
+            if inspection.error:
+                raise ValueError(inspection.error)
+            return inspection.num_pages
         except Exception as e:
             logger.error(f"❌ Error getting page count from PDF {file_path}: {str(e)}")
             return 0
     
+    def extract_and_validate(self, file_path: str) -> Dict[str, Any]:
+        """
+        Single-pass extraction: text, page count, metadata and quality verdict together
+        
+        Used by the background extraction pipeline so each upload is parsed once.
+        
+        Args:
+            file_path: Path to the PDF or image file
+            
+        Returns:
+            validate_pdf()-style dict plus 'text' and 'info' (PDF metadata)
+        """
+        # Images: OCR path, no PDF structure to validate
+        if os.path.exists(file_path) and not file_path.lower().endswith('.pdf'):
+            inspection = PDFInspection(file_path=file_path, file_size=os.path.getsize(file_path), readable=True, num_pages=1)
+            inspection.text = self.extract_text_from_file(file_path)
+            self._assess_text_quality(inspection)
+            result = self._validation_view(inspection)
+            result.update({'is_pdf': False, 'text': inspection.text, 'info': {}})
+            return result
+        
+        result = self.validate_pdf(file_path)
+        inspection = self.inspect(file_path) if result['readable'] else None
+        result['text'] = self.extract_text_from_pdf(file_path) if inspection else ""
+        result['info'] = dict(inspection.info) if inspection else {}
+        result['ocr_used'] = bool(inspection and inspection.ocr_text and result['text'] == inspection.ocr_text)
+        return result
+    
+    def structure_error(self, file_path: str) -> Optional[str]:
+        """
+        Cheap structural check (first and last KB only) so uploads can reject
+        non-PDFs and truncated files without parsing them
+
+        Returns:
+            Why the file is not a complete PDF, or None if it looks like one
+        """
+        try:
+            with open(file_path, 'rb') as file:
+                if b'%PDF-' not in file.read(1024):
+                    return "missing PDF header"
+                file.seek(max(os.path.getsize(file_path) - 1024, 0))
+                tail = file.read()
+        except OSError as e:
+            return f"unreadable file ({e})"
+        
+        # Every complete PDF ends with 'startxref <offset> %%EOF' (classic trailer or xref stream)
+        if b'%%EOF' not in tail or b'startxref' not in tail:
+            return "file is truncated or corrupt (no end-of-file trailer)"
+        return None
+    
+    def _validation_view(self, inspection: PDFInspection) -> Dict[str, Any]:
+        """validate_pdf() result for a successful inspection"""
+        return {
+            'valid': True,
+            'file_exists': True,
+            'is_pdf': True,
+            'readable': True,
+            'num_pages': inspection.num_pages,
+            'file_size_mb': inspection.file_size_mb,
+            'has_text': inspection.has_text,
+            'text_length': inspection.text_length,
+            'text_quality': inspection.text_quality,
+            'needs_ocr': inspection.text_quality in ('scanned', 'poor'),
+            'error': None
+        }
+    
     def validate_pdf(self, file_path: str) -> Dict[str, Any]:
         """
         Enhanced PDF validation with text quality assessment
@@ -447,34 +457,29 @@ class PDFService:
             # Get file size
             result['file_size_mb'] = round(os.path.getsize(file_path) / (1024 * 1024), 2)
             
-            # Try to read
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                result['num_pages'] = len(pdf_reader.pages)
-                result['readable'] = True
-                
-                # Extract text to assess quality
-                text = self.extract_text_from_pdf(file_path, use_ocr=False)
-                result['text_length'] = len(text)
-                result['has_text'] = len(text) > 50
-                
-                # Assess text quality
-                if len(text) < 50:
-                    result['text_quality'] = 'scanned'
-                    result['needs_ocr'] = True
-                elif len(text.split()) < 20:
-                    result['text_quality'] = 'poor'
-                    result['needs_ocr'] = True
-                else:
-                    result['text_quality'] = 'good'
-                    result['needs_ocr'] = False
-                
-                result['valid'] = True
-                
+            inspection = self.inspect(file_path)
+            if inspection.error:
+                raise ValueError(inspection.error)
+            result = self._validation_view(inspection)
+            
             logger.info(f"✅ PDF validation successful: {file_path} - Quality: {result['text_quality']}")
             return result
             
         except Exception as e:
             logger.error(f"❌ Error validating PDF {file_path}: {str(e)}")
             result['error'] = str(e)
-            return result
\ No newline at end of file
+            return result
+
+
+# Singleton instance (created on first use: probing OCR and text backends is not free)
+_pdf_service = None
+_pdf_service_lock = threading.Lock()
+
+def get_pdf_service() -> PDFService:
+    """Get or create the PDF service for this process"""
+    global _pdf_service
+    if _pdf_service is None:
+        with _pdf_service_lock:
+            if _pdf_service is None:
+                _pdf_service = PDFService()
+    return _pdf_service
@@ -0,0 +1,290 @@
+"""
+PDF Text Backends - Pluggable page text extraction for PDFService
+PyPDF2 is always available; pypdfium2 and PyMuPDF are optional and much faster.
+Large PDFs are split into page ranges and extracted in a process pool, so
+parsing uses every core instead of one GIL-bound Python loop.
+"""
+import multiprocessing
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.config import settings
+
+
+class PdfTextBackend(ABC):
+    """Page text extraction strategy (page texts are None where extraction failed)"""
+
+    name = "base"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def open_info(self, file_path: str) -> Tuple[int, Dict[str, str]]:
+        """Page count and document info"""
+
+    @abstractmethod
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[Optional[str]]:
+        """Text of pages [start, stop)"""
+
+    def extract_all(self, file_path: str) -> Tuple[int, Dict[str, str], List[Optional[str]]]:
+        """Page count, info and every page's text (one open where the library allows it)"""
+        num_pages, info = self.open_info(file_path)
+        return num_pages, info, self.extract_pages(file_path, 0, num_pages)
+
+
+class PyPDF2Backend(PdfTextBackend):
+    """Pure-Python fallback (matches the historical extraction output)"""
+
+    name = "pypdf2"
+
+    def _info(self, pdf_reader) -> Dict[str, str]:
+        if not pdf_reader.metadata:
+            return {}
+        return {key: str(value) for key, value in pdf_reader.metadata.items()}
+
+    def _pages(self, pdf_reader, start: int, stop: int) -> List[Optional[str]]:
+        texts = []
+        for page_num in range(start, stop):
+            try:
+                texts.append(pdf_reader.pages[page_num].extract_text())
+            except Exception as e:
+                logger.warning(f"⚠️ Error extracting text from page {page_num + 1}: {str(e)}")
+                texts.append(None)
+        return texts
+
+    def open_info(self, file_path: str) -> Tuple[int, Dict[str, str]]:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            return len(pdf_reader.pages), self._info(pdf_reader)
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[Optional[str]]:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            return self._pages(PyPDF2.PdfReader(file), start, stop)
+
+    def extract_all(self, file_path: str) -> Tuple[int, Dict[str, str], List[Optional[str]]]:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            num_pages = len(pdf_reader.pages)
+            return num_pages, self._info(pdf_reader), self._pages(pdf_reader, 0, num_pages)
+
+
+class PdfiumBackend(PdfTextBackend):
+    """pypdfium2 (PDFium, C++)"""
+
+    name = "pypdfium2"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            import pypdfium2  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _info(self, pdf) -> Dict[str, str]:
+        return {f"/{key}": str(value) for key, value in pdf.get_metadata_dict(skip_empty=True).items()}
+
+    def _pages(self, pdf, start: int, stop: int) -> List[Optional[str]]:
+        texts = []
+        for page_num in range(start, stop):
+            try:
+                page = pdf[page_num]
+                textpage = page.get_textpage()
+                texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Error extracting text from page {page_num + 1}: {str(e)}")
+                texts.append(None)
+        return texts
+
+    def open_info(self, file_path: str) -> Tuple[int, Dict[str, str]]:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf), self._info(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[Optional[str]]:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return self._pages(pdf, start, stop)
+        finally:
+            pdf.close()
+
+    def extract_all(self, file_path: str) -> Tuple[int, Dict[str, str], List[Optional[str]]]:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            return len(pdf), self._info(pdf), self._pages(pdf, 0, len(pdf))
+        finally:
+            pdf.close()
+
+
+class PyMuPDFBackend(PdfTextBackend):
+    """PyMuPDF (MuPDF, C)"""
+
+    name = "pymupdf"
+
+    @staticmethod
+    def _module():
+        try:
+            import pymupdf
+        except ImportError:
+            import fitz as pymupdf  # Older releases only ship the fitz name
+        return pymupdf
+
+    @classmethod
+    def is_available(cls) -> bool:
+        try:
+            cls._module()
+            return True
+        except ImportError:
+            return False
+
+    def _info(self, doc) -> Dict[str, str]:
+        return {f"/{key[0].upper()}{key[1:]}": str(value) for key, value in (doc.metadata or {}).items() if value}
+
+    def _pages(self, doc, start: int, stop: int) -> List[Optional[str]]:
+        texts = []
+        for page_num in range(start, stop):
+            try:
+                texts.append(doc[page_num].get_text())
+            except Exception as e:
+                logger.warning(f"⚠️ Error extracting text from page {page_num + 1}: {str(e)}")
+                texts.append(None)
+        return texts
+
+    def open_info(self, file_path: str) -> Tuple[int, Dict[str, str]]:
+        with self._module().open(file_path) as doc:
+            return doc.page_count, self._info(doc)
+
+    def extract_pages(self, file_path: str, start: int, stop: int) -> List[Optional[str]]:
+        with self._module().open(file_path) as doc:
+            return self._pages(doc, start, stop)
+
+    def extract_all(self, file_path: str) -> Tuple[int, Dict[str, str], List[Optional[str]]]:
+        with self._module().open(file_path) as doc:
+            return doc.page_count, self._info(doc), self._pages(doc, 0, doc.page_count)
+
+
+TEXT_BACKENDS = {
+    backend.name: backend for backend in (PyPDF2Backend, PdfiumBackend, PyMuPDFBackend)
+}
+
+# Preference order for PDF_TEXT_BACKEND=auto
+AUTO_BACKEND_ORDER = ["pypdfium2", "pymupdf", "pypdf2"]
+
+
+def get_text_backend(name: str = None) -> PdfTextBackend:
+    """
+    Resolve a backend by name ('auto' picks the fastest installed one)
+    Unknown or uninstalled backends fall back to PyPDF2.
+    """
+    name = (name or settings.PDF_TEXT_BACKEND or "pypdf2").lower()
+
+    if name == "auto":
+        for candidate in AUTO_BACKEND_ORDER:
+            if TEXT_BACKENDS[candidate].is_available():
+                return TEXT_BACKENDS[candidate]()
+
+    backend_cls = TEXT_BACKENDS.get(name)
+    if backend_cls is None or not backend_cls.is_available():
+        logger.warning(f"⚠️ PDF text backend '{name}' not available, falling back to PyPDF2")
+        return PyPDF2Backend()
+    return backend_cls()
+
+
+# ===== Parallel page extraction =====
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _extract_page_range(backend_name: str, file_path: str, start: int, stop: int) -> List[Optional[str]]:
+    """Process pool entry point (module level so it pickles)"""
+    return TEXT_BACKENDS[backend_name]().extract_pages(file_path, start, stop)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # spawn: the API process runs threads, which fork does not copy safely
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=min(settings.PDF_EXTRACT_WORKERS, os.cpu_count() or 1),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"🏭 Started PDF extraction process pool ({settings.PDF_EXTRACT_WORKERS} workers)")
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the extraction process pool (application shutdown)"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_page_texts(
+    file_path: str,
+    backend: PdfTextBackend = None,
+    parallel: bool = None
+) -> Tuple[int, Dict[str, str], List[Optional[str]]]:
+    """
+    Page count, info and per-page text, fanned out across processes for large PDFs
+
+    Args:
+        file_path: Path to the PDF file
+        backend: Text backend (defaults to settings.PDF_TEXT_BACKEND)
+        parallel: Force (True) or disable (False) the process pool; None decides by page count
+
+    Returns:
+        Tuple of (num_pages, info, page_texts) with None for pages that failed
+    """
+    backend = backend or get_text_backend()
+    workers = min(settings.PDF_EXTRACT_WORKERS, os.cpu_count() or 1)  # No gain from more processes than cores
+
+    if parallel is False or workers <= 1:
+        return backend.extract_all(file_path)
+
+    num_pages, info = backend.open_info(file_path)
+    if parallel is None and num_pages < settings.PDF_PARALLEL_MIN_PAGES:
+        return num_pages, info, backend.extract_pages(file_path, 0, num_pages)
+
+    # Contiguous ranges, a few per worker so uneven pages balance out
+    chunk_size = max(1, -(-num_pages // (workers * 2)))
+    ranges = [(start, min(start + chunk_size, num_pages)) for start in range(0, num_pages, chunk_size)]
+
+    try:
+        pool = _get_process_pool()
+        futures = [
+            pool.submit(_extract_page_range, backend.name, os.path.abspath(file_path), start, stop)
+            for start, stop in ranges
+        ]
+        page_texts: List[Optional[str]] = []
+        for future in futures:
+            page_texts.extend(future.result())
+    except Exception as e:
+        # Broken pool (worker killed, spawn unavailable) must not fail the extraction
+        logger.warning(f"⚠️ Parallel PDF extraction failed ({type(e).__name__}: {e}), extracting sequentially")
+        shutdown_process_pool()
+        return num_pages, info, backend.extract_pages(file_path, 0, num_pages)
+
+    logger.info(f"⚡ Extracted {num_pages} pages in {len(ranges)} chunks across {workers} processes ({backend.name})")
+    return num_pages, info, page_texts
@@ -0,0 +1,36 @@
+"""
+Process Pool helpers - Hard stop for worker pools running hung native code
+ProcessPoolExecutor.shutdown() never interrupts a running task, so a worker
+stuck in tesseract or a PDF render keeps its memory until it finishes. The
+OCR and render services kill their pool's processes instead when a task
+times out.
+"""
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from loguru import logger
+
+
+def start_process_group():
+    """Pool initializer step: make the worker a process group leader, so kill_pool also reaches its subprocesses"""
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+
+def kill_pool(pool: ProcessPoolExecutor):
+    """Shut a pool down and kill its workers (and their process groups), pending tasks are cancelled"""
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for process in processes:
+        if not process.is_alive():
+            continue
+        try:
+            if hasattr(os, "killpg") and os.getpgid(process.pid) == process.pid:
+                os.killpg(process.pid, signal.SIGKILL)  # Worker plus pdftoppm/tesseract it started
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass  # Exited meanwhile
+        logger.warning(f"🔪 Killed pool worker {process.pid}")
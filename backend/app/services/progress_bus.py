@@ -0,0 +1,169 @@
+"""
+Progress Bus - In-process pub/sub for generation and analysis progress
+Workers publish a snapshot whenever they persist progress; Server-Sent Events
+streams forward it to the browser, so clients no longer poll status endpoints.
+
+Subscribers keep only the latest event: a slow client skips intermediate
+snapshots instead of queueing them. The bus is local to the process, so a
+stream re-reads the database after PROGRESS_STREAM_RESYNC idle seconds to
+pick up work done by workers in other processes.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from loguru import logger
+
+from app.config import settings
+
+# Headers for text/event-stream responses (no proxy buffering, no caching)
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+
+def generation_topic(application_id: int) -> str:
+    return f"generation:{application_id}"
+
+
+def analysis_topic(application_id: int) -> str:
+    return f"analysis:{application_id}"
+
+
+class Subscription:
+    """One listener on a topic, bound to the event loop that created it"""
+
+    def __init__(self, bus: "ProgressBus", topic: str):
+        self.bus = bus
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._latest: Optional[Dict[str, Any]] = None
+
+    def _offer(self, event: Dict[str, Any]):
+        # Called from any thread; the asyncio.Event is only touched on its own loop
+        self._latest = event
+        self.loop.call_soon_threadsafe(self._ready.set)
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Latest event published since the previous call, or None after `timeout` seconds"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        event, self._latest = self._latest, None
+        return event
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+
+class ProgressBus:
+    """Topic → subscribers; publish() is thread-safe and never blocks the worker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Listen to a topic (call from the event loop that will consume it)"""
+        subscription = Subscription(self, topic)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def publish(self, topic: str, event: Dict[str, Any]) -> int:
+        """Deliver an event to the topic's current subscribers; returns how many got it"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription._offer(event)
+            except RuntimeError:
+                # Subscriber's loop already closed (shutdown)
+                self._unsubscribe(subscription)
+        return len(subscribers)
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+
+def format_sse(data: Dict[str, Any], event: str = "progress") -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_progress(
+    topic: str,
+    snapshot: Callable[[], Optional[Dict[str, Any]]],
+    is_final: Callable[[Dict[str, Any]], bool],
+    complete: Callable[[Dict[str, Any]], Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for one topic
+
+    Args:
+        topic: Bus topic to follow
+        snapshot: Reads the current state from the database (sync, run in the threadpool)
+        is_final: True for a state after which nothing more will be published
+        complete: Optional enrichment of a final bus event (e.g. lists only the database has)
+
+    Sends the database state once, then every published event, until a final
+    state has been sent. Idle periods trigger a database re-read (sent only if
+    it changed) and otherwise a keep-alive comment.
+    """
+    subscription = get_progress_bus().subscribe(topic)  # Before the snapshot, so nothing is missed
+    try:
+        state = await run_in_threadpool(snapshot)
+        if state is not None:
+            yield format_sse(state)
+            if is_final(state):
+                return
+
+        while True:
+            event = await subscription.next(settings.PROGRESS_STREAM_RESYNC)
+            if event is None:
+                fresh = await run_in_threadpool(snapshot)
+                if fresh is None or fresh == state:
+                    yield ": keep-alive\n\n"
+                    continue
+                event = fresh
+            elif is_final(event) and complete is not None:
+                event = await run_in_threadpool(complete, event)
+
+            state = event
+            yield format_sse(state)
+            if is_final(state):
+                return
+    finally:
+        subscription.close()
+
+
+# Singleton instance
+_progress_bus = None
+_progress_bus_lock = threading.Lock()
+
+def get_progress_bus() -> ProgressBus:
+    """Get or create the progress bus for this process"""
+    global _progress_bus
+    if _progress_bus is None:
+        with _progress_bus_lock:
+            if _progress_bus is None:
+                _progress_bus = ProgressBus()
+    return _progress_bus
+
+
+def publish_progress(topic: str, event: Dict[str, Any]):
+    """Best-effort publish: progress reporting must never break the worker"""
+    try:
+        get_progress_bus().publish(topic, event)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not publish progress for {topic}: {e}")
@@ -0,0 +1,171 @@
+"""
+Questionnaire Store - Batched persistence for questionnaire responses
+A save is one prefetch of the application's existing answers plus one bulk
+INSERT ... ON CONFLICT (application_id, question_key) DO UPDATE, instead of a
+SELECT per answer. Per-section progress counters are stored on the
+application and adjusted by the answers each save changes, so progress never
+needs a full read of the responses.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from loguru import logger
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.models import QuestionnaireResponse, QuestionCategory, QuestionDataType, VisaApplication
+from app.services.smart_questionnaire_service import (
+    QUESTION_INDEX_VERSION,
+    count_answers,
+    update_answer_counters,
+    progress_from_counters
+)
+
+# Columns refreshed when a key is answered again (text/category keep their first value)
+UPSERT_UPDATE_COLUMNS = ('answer', 'answered_at')
+
+
+def load_answers(db: Session, application_id: int, question_keys: Iterable[str] = None) -> Dict[str, str]:
+    """Saved answers of an application as {question_key: answer} (one query, optionally only some keys)"""
+    query = db.query(QuestionnaireResponse.question_key, QuestionnaireResponse.answer).filter(
+        QuestionnaireResponse.application_id == application_id
+    )
+    if question_keys is not None:
+        query = query.filter(QuestionnaireResponse.question_key.in_(list(question_keys)))
+    return {question_key: answer for question_key, answer in query.all()}
+
+
+def build_response_row(
+    application_id: int,
+    question_key: str,
+    answer: str,
+    question_text: str = None,
+    is_required: bool = False,
+    answered_at: datetime = None
+) -> Dict[str, Any]:
+    """Column values for one questionnaire_responses row"""
+    return {
+        'application_id': application_id,
+        'question_key': question_key,
+        'question_text': question_key.replace('_', ' ').title() if question_text is None else question_text,
+        'answer': answer,
+        'category': QuestionCategory.PERSONAL,
+        'data_type': QuestionDataType.TEXT,
+        'is_required': is_required,
+        'answered_at': answered_at or datetime.now()
+    }
+
+
+def upsert_responses(db: Session, application_id: int, rows: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Insert or update many responses of one application in a single statement
+
+    Args:
+        db: Database session (the caller commits)
+        application_id: Application the rows belong to
+        rows: Row dicts from build_response_row(); a repeated key keeps its last value
+
+    Returns:
+        The written {question_key: answer}
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement
+    rows_by_key = {row['question_key']: row for row in rows}
+
+    if rows_by_key:
+        dialect = db.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            _upsert_on_conflict(db, dialect, list(rows_by_key.values()))
+        else:
+            _upsert_split(db, application_id, rows_by_key)
+        logger.info(f"💾 Upserted {len(rows_by_key)} responses for application {application_id}")
+
+    return {key: row['answer'] for key, row in rows_by_key.items()}
+
+
+def save_answers(db: Session, application: VisaApplication, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Upsert responses and move the application's progress counters by what changed
+
+    Args:
+        db: Database session (the caller commits; lock the application row to serialise saves)
+        application: Application the rows belong to
+        rows: Row dicts from build_response_row()
+
+    Returns:
+        Progress payload after the save
+    """
+    written_keys = {row['question_key'] for row in rows}
+    counters = _stored_counters(application)
+    if counters is None:
+        # First save since the counters were added (or the questions changed): one full read
+        previous = load_answers(db, application.id)
+        counters = count_answers(previous)
+    else:
+        previous = load_answers(db, application.id, written_keys) if written_keys else {}
+
+    written = upsert_responses(db, application.id, rows)
+    update_answer_counters(counters, previous, written)
+    _store_counters(application, counters)
+    return progress_from_counters(counters)
+
+
+def get_application_progress(db: Session, application: VisaApplication) -> Dict[str, Any]:
+    """
+    Progress from the stored counters, rebuilding them from the saved answers when missing or stale
+    A rebuild first takes the application row lock the saves hold, so a save
+    committed meanwhile is counted instead of overwritten.
+    """
+    counters = _stored_counters(application)
+    if counters is None:
+        db.query(VisaApplication).filter(
+            VisaApplication.id == application.id
+        ).with_for_update().populate_existing().first()
+        counters = _stored_counters(application)
+        if counters is None:
+            counters = count_answers(load_answers(db, application.id))
+            _store_counters(application, counters)
+    return progress_from_counters(counters)
+
+
+def _stored_counters(application: VisaApplication) -> Optional[Dict[str, List[int]]]:
+    stored = application.questionnaire_progress
+    if not stored or stored.get('version') != QUESTION_INDEX_VERSION:
+        return None
+    return {section_key: list(values) for section_key, values in stored.get('sections', {}).items()}
+
+
+def _store_counters(application: VisaApplication, counters: Dict[str, List[int]]):
+    # Reassign (not mutate) so the JSON column is flagged dirty
+    application.questionnaire_progress = {'version': QUESTION_INDEX_VERSION, 'sections': counters}
+
+
+def _upsert_on_conflict(db: Session, dialect: str, rows: List[Dict[str, Any]]):
+    """Native INSERT ... ON CONFLICT DO UPDATE (backed by uq_questionnaire_responses_app_key)"""
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(QuestionnaireResponse).values(rows)
+    set_ = {column: stmt.excluded[column] for column in UPSERT_UPDATE_COLUMNS}
+    set_['updated_at'] = func.now()
+    db.execute(stmt.on_conflict_do_update(index_elements=['application_id', 'question_key'], set_=set_))
+
+
+def _upsert_split(db: Session, application_id: int, rows_by_key: Dict[str, Dict[str, Any]]):
+    """Fallback for databases without ON CONFLICT: one executemany UPDATE and one executemany INSERT"""
+    existing_ids = dict(db.query(QuestionnaireResponse.question_key, QuestionnaireResponse.id).filter(
+        QuestionnaireResponse.application_id == application_id,
+        QuestionnaireResponse.question_key.in_(list(rows_by_key))
+    ).all())
+
+    updates = [
+        {'id': existing_ids[key], **{column: row[column] for column in UPSERT_UPDATE_COLUMNS}}
+        for key, row in rows_by_key.items() if key in existing_ids
+    ]
+    inserts = [row for key, row in rows_by_key.items() if key not in existing_ids]
+
+    if updates:
+        db.execute(update(QuestionnaireResponse), updates)
+    if inserts:
+        db.execute(insert(QuestionnaireResponse), inserts)
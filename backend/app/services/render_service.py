@@ -0,0 +1,175 @@
+"""
+Render Service - Isolated renderer processes for template documents
+WeasyPrint and ReportLab renders are CPU-bound and can briefly need hundreds
+of MB. They run in a pool of long-lived spawn workers, so a big render
+neither holds the GIL against request handling nor leaves its peak RSS in
+the API process. Each worker keeps its own warmed TemplateRenderer (bytecode
+cache, compiled templates, fonts) and is recycled after
+RENDER_MAX_TASKS_PER_CHILD renders to cap memory creep.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from app.config import settings
+from app.services.process_pool import kill_pool, start_process_group
+
+# Document → (TemplateRenderer method, ReportLab fallback on PDFGeneratorService)
+RENDERERS = {
+    "visiting_card": ("render_visiting_card", "_generate_visiting_card_reportlab"),
+    "asset_valuation": ("render_asset_valuation", "_generate_asset_valuation_reportlab"),
+}
+
+
+class RenderError(Exception):
+    """A render did not produce its PDF (worker died or timed out)"""
+    pass
+
+
+# ===== Worker process side (module level so it pickles under spawn) =====
+
+def _init_worker():
+    """Load WeasyPrint, templates and fonts once per worker instead of on its first job"""
+    start_process_group()
+    if not settings.TEMPLATE_WARMUP:
+        return
+    try:
+        from app.services.template_renderer import get_template_renderer
+        get_template_renderer().warm_up()
+    except Exception as e:
+        # Template renders fail over to ReportLab; the worker is still useful
+        logger.warning(f"⚠️ Renderer worker warm-up skipped: {e}")
+
+
+def _ping() -> bool:
+    return True
+
+
+def _render_template(document: str, data: Dict[str, Any], output_path: str) -> str:
+    from app.services.template_renderer import get_template_renderer
+    method_name, _ = RENDERERS[document]
+    return getattr(get_template_renderer(), method_name)(data, output_path)
+
+
+def _render_reportlab(document: str, data: Dict[str, Any], output_path: str) -> str:
+    from app.services.pdf_generator_service import PDFGeneratorService
+    _, method_name = RENDERERS[document]
+    getattr(PDFGeneratorService, method_name)(data, output_path)
+    return output_path
+
+
+# ===== API process side =====
+
+class RenderService:
+    """Queue document renders onto an isolated process pool (inline when RENDER_WORKERS=0)"""
+
+    def __init__(self):
+        self.workers = settings.RENDER_WORKERS
+        self.timeout = settings.RENDER_TIMEOUT
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    max_tasks_per_child=settings.RENDER_MAX_TASKS_PER_CHILD
+                )
+                logger.info(
+                    f"🏭 Started renderer pool ({self.workers} workers, "
+                    f"recycled every {settings.RENDER_MAX_TASKS_PER_CHILD} renders)"
+                )
+            return self._pool
+
+    def _reset_pool(self, pool: Optional[ProcessPoolExecutor] = None):
+        """
+        Kill a hung or broken pool; the next call starts a fresh one
+        With `pool`, only resets if that pool is still current (a concurrent
+        call may already have replaced it).
+        """
+        with self._lock:
+            if pool is not None and pool is not self._pool:
+                return
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            kill_pool(pool)
+
+    def shutdown(self):
+        self._reset_pool()
+
+    def warm_up(self):
+        """Start the renderer processes now (each warms its renderer) rather than on the first document"""
+        if self.workers <= 0:
+            _init_worker()
+            return
+        pool = self._get_pool()
+        futures = [pool.submit(_ping) for _ in range(self.workers)]
+        try:
+            for future in futures:
+                future.result(timeout=self.timeout)
+        except (FutureTimeoutError, BrokenProcessPool):
+            self._reset_pool(pool)
+            raise RenderError("Renderer processes failed to start")
+
+    def _run(self, fn, document: str, data: Dict[str, Any], output_path: str) -> str:
+        """Run one render; errors propagate so callers can fall back or fail the document"""
+        output_path = os.path.abspath(output_path)
+        if self.workers <= 0:
+            return fn(document, data, output_path)
+
+        pool = self._get_pool()
+        try:
+            return pool.submit(fn, document, data, output_path).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            logger.error(f"⏱️ Rendering {document} timed out after {self.timeout}s, killing renderer workers")
+            self._reset_pool(pool)
+            raise RenderError(f"Rendering {document} timed out after {self.timeout}s")
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise RenderError(f"Renderer worker died while rendering {document}, restarting pool")
+
+    def render_template(self, document: str, data: Dict[str, Any], output_path: str) -> str:
+        """
+        Render a document from its HTML template with WeasyPrint
+
+        Args:
+            document: Key of RENDERERS (e.g. 'visiting_card')
+            data: Template context
+            output_path: Where the PDF is written
+
+        Returns:
+            Path to the generated PDF
+        """
+        return self._run(_render_template, document, data, output_path)
+
+    def render_reportlab(self, document: str, data: Dict[str, Any], output_path: str) -> str:
+        """Render a document with its ReportLab fallback (same arguments as render_template)"""
+        return self._run(_render_reportlab, document, data, output_path)
+
+
+# Singleton instance
+_render_service = None
+_render_service_lock = threading.Lock()
+
+def get_render_service() -> RenderService:
+    """Get or create the render service for this process"""
+    global _render_service
+    if _render_service is None:
+        with _render_service_lock:
+            if _render_service is None:
+                _render_service = RenderService()
+    return _render_service
+
+
+def shutdown_render_service():
+    """Stop the renderer pool if this process ever started the service"""
+    if _render_service is not None:
+        _render_service.shutdown()
@@ -2,7 +2,10 @@
 Smart Questionnaire Service - Enhanced questionnaire with conditional logic
 Based on sample analysis and all 13 generated documents
 """
-from typing import Dict, List, Any
+import hashlib
+import re
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 # Complete Smart Questionnaire Structure
@@ -751,95 +754,245 @@ def get_section_by_key(section_key: str) -> Dict[str, Any]:
     return SMART_QUESTIONNAIRE_STRUCTURE.get(section_key, {})
 
 
-def get_all_questions() -> List[Dict[str, Any]]:
-    """Get all questions as a flat list"""
-    all_questions = []
+# ===== Compiled questions (built once at import) =====
+# Each question dict is compiled into a validator object: validation rules are
+# read once, regexes are precompiled, and the type dispatch happens here rather
+# than on every answer.
+
+DEFAULT_EMAIL_PATTERN = "^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$"
+
+VALID = (True, "")
+
+
+class CompiledQuestion:
+    """A question's validation rules, resolved once; validate() is the hot path"""
+
+    __slots__ = ("key", "label", "section", "required", "empty_result")
+
+    def __init__(self, question: Dict[str, Any], section: str = None):
+        self.key = question.get("key")
+        self.label = question.get("label", "")
+        self.section = section or question.get("section")
+        self.required = bool(question.get("required", False))
+        # Result for an empty answer: optional fields with no answer are valid
+        self.empty_result = (False, f"{question.get('label')} is required") if self.required else VALID
+
+    def validate(self, answer: Any) -> tuple[bool, str]:
+        if not answer:
+            return self.empty_result
+        return VALID
+
+
+class EmailQuestion(CompiledQuestion):
+    __slots__ = ("match",)
+
+    INVALID = (False, "Invalid email format")
+
+    def __init__(self, question: Dict[str, Any], section: str = None):
+        super().__init__(question, section)
+        self.match = re.compile(question.get("validation", {}).get("pattern", DEFAULT_EMAIL_PATTERN)).match
+
+    def validate(self, answer: Any) -> tuple[bool, str]:
+        if not answer:
+            return self.empty_result
+        if not self.match(str(answer)):
+            return self.INVALID
+        return VALID
+
+
+class NumberQuestion(CompiledQuestion):
+    __slots__ = ("min", "max", "below_min", "above_max")
+
+    INVALID = (False, "Must be a valid number")
+
+    def __init__(self, question: Dict[str, Any], section: str = None):
+        super().__init__(question, section)
+        validation = question.get("validation", {})
+        self.min = validation.get("min")
+        self.max = validation.get("max")
+        self.below_min = (False, f"Must be at least {self.min}")
+        self.above_max = (False, f"Must be at most {self.max}")
+
+    def validate(self, answer: Any) -> tuple[bool, str]:
+        if not answer:
+            return self.empty_result
+        try:
+            num = float(answer)
+        except (ValueError, TypeError):
+            return self.INVALID
+        if self.min is not None and num < self.min:
+            return self.below_min
+        if self.max is not None and num > self.max:
+            return self.above_max
+        return VALID
+
+
+class TextQuestion(CompiledQuestion):
+    __slots__ = ("min_length", "max_length", "too_short", "too_long")
+
+    def __init__(self, question: Dict[str, Any], section: str = None):
+        super().__init__(question, section)
+        validation = question.get("validation", {})
+        self.min_length = validation.get("min_length")
+        self.max_length = validation.get("max_length")
+        self.too_short = (False, f"Must be at least {self.min_length} characters")
+        self.too_long = (False, f"Must be at most {self.max_length} characters")
+
+    def validate(self, answer: Any) -> tuple[bool, str]:
+        if not answer:
+            return self.empty_result
+        if self.min_length is None and self.max_length is None:
+            return VALID
+        length = len(str(answer))
+        if self.min_length is not None and length < self.min_length:
+            return self.too_short
+        if self.max_length is not None and length > self.max_length:
+            return self.too_long
+        return VALID
+
+
+# Question types with type-specific rules; every other type only checks "required"
+QUESTION_TYPES = {
+    "email": EmailQuestion,
+    "number": NumberQuestion,
+    "text": TextQuestion,
+}
+
+
+def compile_question(question: Dict[str, Any], section: str = None) -> CompiledQuestion:
+    """Compile one question dict into its validator"""
+    return QUESTION_TYPES.get(question.get("type"), CompiledQuestion)(question, section)
+
+
+def _build_question_index():
+    questions = []
+    index = {}
     for section_key, section in SMART_QUESTIONNAIRE_STRUCTURE.items():
         for question in section.get("questions", []):
             question_with_section = question.copy()
             question_with_section["section"] = section_key
-            all_questions.append(question_with_section)
-    return all_questions
+            questions.append(question_with_section)
+            index[question["key"]] = compile_question(question, section_key)
+    return tuple(questions), index
+
+
+_ALL_QUESTIONS, _QUESTIONS_BY_KEY = _build_question_index()
+
+# Read-only view: question key -> compiled question
+QUESTION_INDEX = MappingProxyType(_QUESTIONS_BY_KEY)
+
+# (total, required) question counts per section
+SECTION_TOTALS: Dict[str, tuple] = {
+    section_key: (
+        len(section.get("questions", [])),
+        sum(1 for q in section.get("questions", []) if q.get("required"))
+    )
+    for section_key, section in SMART_QUESTIONNAIRE_STRUCTURE.items()
+}
+TOTAL_QUESTIONS = len(QUESTION_INDEX)
+TOTAL_REQUIRED = sum(1 for info in QUESTION_INDEX.values() if info.required)
+
+# Changes whenever a question is added, moved or made (non-)required; stored counters
+# carrying another version are recomputed from the saved answers
+QUESTION_INDEX_VERSION = hashlib.sha1(
+    repr(sorted((key, info.section, info.required) for key, info in QUESTION_INDEX.items())).encode()
+).hexdigest()[:12]
+
+
+def get_all_questions() -> List[Dict[str, Any]]:
+    """Get all questions as a flat list"""
+    return [question.copy() for question in _ALL_QUESTIONS]
 
 
 def get_required_questions() -> List[Dict[str, Any]]:
     """Get only required questions"""
-    all_questions = get_all_questions()
-    return [q for q in all_questions if q.get("required", False)]
+    return [question.copy() for question in _ALL_QUESTIONS if question.get("required", False)]
+
+
+def get_compiled_question(question_key: str) -> Optional[CompiledQuestion]:
+    """Compiled question for a key (None for unknown keys)"""
+    return _QUESTIONS_BY_KEY.get(question_key)
 
 
 def validate_answer(question: Dict[str, Any], answer: Any) -> tuple[bool, str]:
     """Validate an answer against question validation rules"""
-    if question.get("required") and not answer:
-        return False, f"{question.get('label')} is required"
-    
-    if not answer:
-        return True, ""  # Optional field with no answer is valid
-    
-    validation = question.get("validation", {})
-    
-    # Type-specific validation
-    if question["type"] == "email":
-        import re
-        pattern = validation.get("pattern", "^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$")
-        if not re.match(pattern, str(answer)):
-            return False, "Invalid email format"
-    
-    elif question["type"] == "number":
-        try:
-            num = float(answer)
-            if "min" in validation and num < validation["min"]:
-                return False, f"Must be at least {validation['min']}"
-            if "max" in validation and num > validation["max"]:
-                return False, f"Must be at most {validation['max']}"
-        except (ValueError, TypeError):
-            return False, "Must be a valid number"
-    
-    elif question["type"] == "text":
-        if "min_length" in validation and len(str(answer)) < validation["min_length"]:
-            return False, f"Must be at least {validation['min_length']} characters"
-        if "max_length" in validation and len(str(answer)) > validation["max_length"]:
-            return False, f"Must be at most {validation['max_length']} characters"
-    
-    return True, ""
+    # Hot paths look the compiled question up by key instead (get_compiled_question)
+    return compile_question(question).validate(answer)
 
 
-def calculate_progress(answers: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate questionnaire completion progress"""
-    all_questions = get_all_questions()
-    required_questions = get_required_questions()
-    
-    total_questions = len(all_questions)
-    total_required = len(required_questions)
-    
-    answered_total = sum(1 for q in all_questions if answers.get(q["key"]))
-    answered_required = sum(1 for q in required_questions if answers.get(q["key"]))
-    
-    # Section-wise progress
+# ===== Progress counters =====
+# Progress is kept as per-section [answered, required_answered] counters, so a save
+# only touches the keys it writes and a read is O(sections).
+
+def count_answers(answers: Dict[str, Any]) -> Dict[str, List[int]]:
+    """Per-section [answered, required_answered] counters for a full set of answers"""
+    counters = {section_key: [0, 0] for section_key in SECTION_TOTALS}
+    for question_key, answer in answers.items():
+        info = QUESTION_INDEX.get(question_key)
+        if info is None or not answer:
+            continue
+        counters[info.section][0] += 1
+        if info.required:
+            counters[info.section][1] += 1
+    return counters
+
+
+def update_answer_counters(
+    counters: Dict[str, List[int]],
+    previous: Dict[str, Any],
+    current: Dict[str, Any]
+) -> Dict[str, List[int]]:
+    """
+    Apply changed answers to counters in place
+
+    Args:
+        counters: Counters from count_answers()
+        previous: Answers before the save for (at least) the keys in current; missing = unanswered
+        current: Answers written by the save
+    """
+    for question_key, answer in current.items():
+        info = QUESTION_INDEX.get(question_key)
+        if info is None:
+            continue
+        delta = bool(answer) - bool(previous.get(question_key))
+        if delta:
+            counters[info.section][0] += delta
+            if info.required:
+                counters[info.section][1] += delta
+    return counters
+
+
+def progress_from_counters(counters: Dict[str, List[int]]) -> Dict[str, Any]:
+    """Build the progress payload from section counters"""
+    answered_total = 0
+    answered_required = 0
     section_progress = {}
-    for section_key, section in SMART_QUESTIONNAIRE_STRUCTURE.items():
-        section_questions = section.get("questions", [])
-        section_required = [q for q in section_questions if q.get("required")]
-        
-        section_answered = sum(1 for q in section_questions if answers.get(q["key"]))
-        section_required_answered = sum(1 for q in section_required if answers.get(q["key"]))
-        
+    for section_key, (section_total, section_required) in SECTION_TOTALS.items():
+        section_answered, section_required_answered = counters.get(section_key, (0, 0))
+        answered_total += section_answered
+        answered_required += section_required_answered
+
         section_progress[section_key] = {
-            "total": len(section_questions),
+            "total": section_total,
             "answered": section_answered,
-            "required": len(section_required),
+            "required": section_required,
             "required_answered": section_required_answered,
-            "percentage": (section_answered / len(section_questions) * 100) if section_questions else 0,
-            "required_percentage": (section_required_answered / len(section_required) * 100) if section_required else 100
+            "percentage": (section_answered / section_total * 100) if section_total else 0,
+            "required_percentage": (section_required_answered / section_required * 100) if section_required else 100
         }
-    
+
     return {
-        "total_questions": total_questions,
+        "total_questions": TOTAL_QUESTIONS,
         "answered_questions": answered_total,
-        "total_required": total_required,
+        "total_required": TOTAL_REQUIRED,
         "answered_required": answered_required,
-        "overall_percentage": (answered_total / total_questions * 100) if total_questions else 0,
-        "required_percentage": (answered_required / total_required * 100) if total_required else 0,
-        "is_complete": answered_required == total_required,
+        "overall_percentage": (answered_total / TOTAL_QUESTIONS * 100) if TOTAL_QUESTIONS else 0,
+        "required_percentage": (answered_required / TOTAL_REQUIRED * 100) if TOTAL_REQUIRED else 0,
+        "is_complete": answered_required == TOTAL_REQUIRED,
         "section_progress": section_progress
     }
+
+
+def calculate_progress(answers: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate questionnaire completion progress"""
+    return progress_from_counters(count_answers(answers))
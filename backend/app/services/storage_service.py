@@ -1,14 +1,50 @@
 """
 Storage Service - File management utilities for uploaded documents
 """
+import asyncio
 import os
-import uuid
+import time
 import shutil
-from typing import Optional, Tuple
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 from loguru import logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.models import Document, StoredBlob
+
+# Read uploads in 1MB chunks so a file is never held in memory as a whole
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _write_chunk(f, hasher, chunk: bytes):
+    hasher.update(chunk)
+    f.write(chunk)
+
+
+def _sync_file(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+class FileTooLargeError(ValueError):
+    """Raised as soon as a streamed upload crosses the size limit"""
+    pass
+
+
+@dataclass
+class StoredFile:
+    """Result of a streamed upload"""
+    file_path: str
+    unique_filename: str
+    file_size: int
+    sha256: str
+    is_duplicate: bool = False  # Bytes were already in the blob store
 
 
 class StorageService:
@@ -19,63 +55,282 @@ class StorageService:
         self.upload_dir = Path(settings.UPLOAD_FOLDER)
         self.generated_dir = Path(settings.GENERATED_FOLDER)
         
+        self.blob_dir = self.upload_dir / "blobs"
+        
         # Ensure directories exist
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.generated_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+    
+    async def _stream_to_temp(self, upload_file, max_size: int = None) -> Tuple[str, int, str]:
+        """
+        Copy an upload into a temp file in the upload directory
+        
+        Returns:
+            Tuple of (temp_path, file_size, sha256)
+        """
+        max_size = settings.MAX_FILE_SIZE if max_size is None else max_size
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.upload_dir, prefix=".upload_", suffix=".part")
+        hasher = hashlib.sha256()
+        file_size = 0
+        
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = await upload_file.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    
+                    file_size += len(chunk)
+                    if file_size > max_size:
+                        raise FileTooLargeError(
+                            f"File size exceeds maximum allowed size of {max_size / (1024*1024):.1f}MB"
+                        )
+                    
+                    # Hashing, writing and the fsync block, so they run off the event loop
+                    await asyncio.to_thread(_write_chunk, f, hasher, chunk)
+                
+                await asyncio.to_thread(_sync_file, f)
+                
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        return temp_path, file_size, hasher.hexdigest()
     
-    def save_file(
+    # ===== Content-addressed blob store =====
+    
+    def blob_path(self, sha256: str, extension: str = "") -> Path:
+        """Hash-sharded location of a blob: blobs/ab/cd/<sha256><ext>"""
+        return self.blob_dir / sha256[:2] / sha256[2:4] / f"{sha256}{extension}"
+    
+    def is_blob_path(self, file_path: str) -> bool:
+        """Check whether a path lives in the (shared) blob store"""
+        try:
+            Path(file_path).resolve().relative_to(self.blob_dir.resolve())
+            return True
+        except ValueError:
+            return False
+    
+    async def save_upload_blob(
         self,
-        file_content: bytes,
+        upload_file,
         original_filename: str,
-        application_number: str,
-        document_type: str
-    ) -> Tuple[str, str]:
+        max_size: int = None
+    ) -> StoredFile:
         """
-        Save uploaded file to storage
+        Stream an upload into the content-addressed blob store
+        
+        Identical bytes are stored once: if the blob already exists the
+        streamed copy is dropped. No reference is taken here; call
+        acquire_blob() in the transaction that creates the Document.
         
         Args:
-            file_content: Binary content of the file
-            original_filename: Original name of the uploaded file
-            application_number: Application number for organizing files
-            document_type: Type of document (passport_copy, nid_bangla, etc.)
+            upload_file: FastAPI UploadFile (anything with async read(size))
+            original_filename: Original name (used for the blob's extension)
+            max_size: Size limit in bytes (defaults to settings.MAX_FILE_SIZE)
             
         Returns:
-            Tuple of (file_path, unique_filename)
+            StoredFile pointing at the blob path
+            
+        Raises:
+            FileTooLargeError: If the upload exceeds max_size
         """
+        file_extension = self._get_file_extension(original_filename)
+        temp_path, file_size, sha256 = await self._stream_to_temp(upload_file, max_size)
+        
+        file_path = self.blob_path(sha256, file_extension)
+        is_duplicate = file_path.exists()
+        
         try:
-            # Extract file extension
-            file_extension = self._get_file_extension(original_filename)
-            
-            # Generate unique filename
-            unique_id = uuid.uuid4().hex[:8]
-            unique_filename = f"{application_number}_{document_type}_{unique_id}{file_extension}"
-            
-            # Full file path
-            file_path = self.upload_dir / unique_filename
-            
-            # Save file
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
-            
-            logger.info(f"File saved: {unique_filename} ({len(file_content)} bytes)")
-            
-            return str(file_path), unique_filename
-            
-        except Exception as e:
-            logger.error(f"Error saving file: {str(e)}")
+            if is_duplicate:
+                os.remove(temp_path)
+                os.utime(file_path)  # Fresh mtime: garbage collection skips it until the row is committed
+            else:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
             raise
+        
+        if is_duplicate:
+            logger.info(f"♻️ Duplicate upload {original_filename} → existing blob {sha256[:12]} ({file_size} bytes)")
+        else:
+            logger.info(f"File saved: blob {sha256[:12]}{file_extension} ({file_size} bytes)")
+        
+        return StoredFile(
+            file_path=str(file_path),
+            unique_filename=file_path.name,
+            file_size=file_size,
+            sha256=sha256,
+            is_duplicate=is_duplicate
+        )
     
-    def delete_file(self, file_path: str) -> bool:
+    def get_blob(self, db: Session, sha256: str) -> Optional[StoredBlob]:
+        """Get the blob row for a hash (extraction/analysis results are reusable)"""
+        if not sha256:
+            return None
+        return db.query(StoredBlob).filter(StoredBlob.sha256 == sha256).first()
+    
+    def acquire_blob(
+        self,
+        db: Session,
+        stored: StoredFile,
+        mime_type: str = None,
+        extracted_text: str = None,
+        extraction_metadata: Dict[str, Any] = None
+    ) -> StoredBlob:
+        """
+        Take a reference on a blob, creating its row on first use
+        
+        Runs in the caller's transaction, so the reference is only kept if
+        the Document that owns it is committed. The row is keyed by hash
+        alone: when the same bytes were first stored under another
+        extension, the new copy is dropped and the Document must point at
+        the returned blob's file_path.
+        """
+        blob = db.query(StoredBlob).filter(
+            StoredBlob.sha256 == stored.sha256
+        ).with_for_update().first()
+        
+        if blob is None:
+            try:
+                with db.begin_nested():
+                    blob = StoredBlob(
+                        sha256=stored.sha256,
+                        file_path=stored.file_path,
+                        file_size=stored.file_size,
+                        mime_type=mime_type,
+                        ref_count=1,
+                        extracted_text=extracted_text,
+                        extraction_metadata=extraction_metadata or {},
+                        analysis_results={}
+                    )
+                    db.add(blob)
+                return blob
+            except IntegrityError:
+                # Another upload of the same bytes created the row first
+                blob = db.query(StoredBlob).filter(
+                    StoredBlob.sha256 == stored.sha256
+                ).with_for_update().first()
+        
+        if blob.file_path != stored.file_path and not stored.is_duplicate and os.path.exists(stored.file_path):
+            # Fresh copy under a different extension (.jpg vs .jpeg); no row references it
+            os.remove(stored.file_path)
+            logger.info(f"♻️ Blob {stored.sha256[:12]} already stored as {Path(blob.file_path).name}")
+        
+        blob.ref_count = (blob.ref_count or 0) + 1
+        blob.last_referenced_at = datetime.now()
+        if blob.extracted_text is None and extracted_text is not None:
+            blob.extracted_text = extracted_text
+            blob.extraction_metadata = extraction_metadata or {}
+        return blob
+    
+    def release_blob(self, db: Session, sha256: str) -> bool:
+        """
+        Drop a reference on a blob; the last reference deletes the row
+        
+        The file stays until collect_garbage() finds it unreferenced, so a
+        caller whose commit fails never ends up with a row but no file.
+        
+        Returns:
+            True if the blob row was deleted
+        """
+        blob = db.query(StoredBlob).filter(
+            StoredBlob.sha256 == sha256
+        ).with_for_update().first()
+        
+        if blob is None:
+            logger.warning(f"Blob not found for release: {sha256[:12]}")
+            return False
+        
+        blob.ref_count = max((blob.ref_count or 0) - 1, 0)
+        if blob.ref_count > 0:
+            return False
+        
+        db.delete(blob)
+        db.flush()
+        logger.info(f"🗑️ Blob {sha256[:12]} unreferenced, file left for garbage collection")
+        return True
+    
+    def discard_unreferenced_blob(self, db: Session, stored: StoredFile) -> bool:
+        """Remove a freshly stored blob file if no committed row references it (failed uploads)"""
+        if stored.is_duplicate or self.get_blob(db, stored.sha256) is not None:
+            return False
+        if os.path.exists(stored.file_path):
+            os.remove(stored.file_path)
+            return True
+        return False
+    
+    def collect_garbage(self, db: Session, min_age_seconds: int = 3600) -> int:
+        """
+        Remove blobs without references: zero-ref rows and orphaned files
+        
+        Args:
+            db: Database session
+            min_age_seconds: Zero-ref rows and orphaned files younger than this are kept (uploads in flight)
+            
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        
+        # Zero-ref rows, filtered and deleted in SQL (no blob text/results loaded); their files are swept below
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=min_age_seconds)
+        unreferenced = db.query(StoredBlob).filter(
+            StoredBlob.ref_count <= 0,
+            StoredBlob.created_at < stale_before
+        ).delete(synchronize_session=False)
+        db.commit()
+        if unreferenced:
+            logger.info(f"🗑️ Blob GC deleted {unreferenced} unreferenced blob rows")
+        
+        # Every remaining row keeps its file; documents point at blob paths too
+        # (also keeps copies written before paths were unified)
+        known_paths = set()
+        for (file_path,) in db.query(StoredBlob.file_path):
+            known_paths.add(str(Path(file_path).resolve()))
+        for (file_path,) in db.query(Document.file_path).filter(Document.blob_sha256.isnot(None)):
+            known_paths.add(str(Path(file_path).resolve()))
+        
+        cutoff = time.time() - min_age_seconds
+        for path in self.blob_dir.rglob('*'):
+            try:
+                if path.is_file() and str(path.resolve()) not in known_paths and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass  # Swept by another process
+        
+        if removed:
+            logger.info(f"🗑️ Blob GC removed {removed} files")
+        return removed
+    
+    def delete_file(self, file_path: str, db: Session = None) -> bool:
         """
         Delete file from storage
         
+        Blob-store files are shared, so they are only released (and removed
+        by collect_garbage once unreferenced) when a db session is given.
+        
         Args:
             file_path: Path to the file to delete
+            db: Session used to release a blob reference
             
         Returns:
             True if deleted successfully, False otherwise
         """
         try:
+            if self.is_blob_path(file_path):
+                if db is None:
+                    logger.warning(f"Refusing to delete shared blob without a session: {file_path}")
+                    return False
+                sha256 = Path(file_path).name.split('.')[0]
+                return self.release_blob(db, sha256)
+            
             if os.path.exists(file_path):
                 os.remove(file_path)
                 logger.info(f"File deleted: {file_path}")
@@ -132,6 +387,22 @@ class StorageService:
             logger.error(f"Error getting file size: {str(e)}")
             return 0
     
+    def hash_file(self, file_path: str) -> str:
+        """
+        SHA-256 of a stored file, read in chunks
+        
+        Args:
+            file_path: Path to the file
+            
+        Returns:
+            Hex digest (raises if the file is missing)
+        """
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+    
     def validate_file_size(self, file_size: int) -> bool:
         """
         Validate file size against maximum allowed
@@ -177,14 +448,17 @@ class StorageService:
             Dictionary with storage stats
         """
         try:
-            upload_files = list(self.upload_dir.glob('*'))
+            upload_files = [f for f in self.upload_dir.rglob('*') if not f.name.endswith('.part')]
             generated_files = list(self.generated_dir.glob('*'))
             
             upload_size = sum(f.stat().st_size for f in upload_files if f.is_file())
             generated_size = sum(f.stat().st_size for f in generated_files if f.is_file())
             
+            blob_files_count = sum(1 for f in self.blob_dir.rglob('*') if f.is_file())
+            
             return {
                 'upload_files_count': len([f for f in upload_files if f.is_file()]),
+                'blob_files_count': blob_files_count,
                 'generated_files_count': len([f for f in generated_files if f.is_file()]),
                 'upload_size_mb': round(upload_size / (1024 * 1024), 2),
                 'generated_size_mb': round(generated_size / (1024 * 1024), 2),
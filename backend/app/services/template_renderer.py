@@ -1,22 +1,74 @@
 """
 Template-based PDF generation using HTML templates
-Renders professional documents using Jinja2 templates and WeasyPrint
+Renders professional documents using Jinja2 templates and WeasyPrint.
+One renderer per process (get_template_renderer): compiled templates come
+from a Jinja bytecode cache and font configurations are reused across renders
+instead of rebuilt per PDF. Templates <link> their stylesheet from css/, so it
+cascades as an author stylesheet (WeasyPrint treats CSS objects passed to
+write_pdf as user stylesheets).
 """
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML, CSS
-from typing import Dict, Any
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from loguru import logger
+from weasyprint import HTML
+from weasyprint.text.fonts import FontConfiguration
+from typing import Dict, Any, List
 import random
 
+from app.config import settings
+
+TEMPLATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates'))
+
+# Templates rendered by this service; each links its stylesheet css/<template name>.css
+TEMPLATES = (
+    'visiting_card_template.html',
+    'asset_valuation_template_13page.html',
+    'asset_valuation_template.html',
+)
+
 
 class TemplateRenderer:
     """Renders HTML templates to PDF using WeasyPrint"""
     
     def __init__(self):
-        # Setup Jinja2 environment
-        template_dir = os.path.join(os.path.dirname(__file__), '..', 'templates')
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+        # Setup Jinja2 environment (compiled templates survive restarts and worker recycling)
+        os.makedirs(settings.TEMPLATE_CACHE_FOLDER, exist_ok=True)
+        self.env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATE_CACHE_FOLDER),
+            auto_reload=settings.DEBUG
+        )
+        
+        # Idle font configurations; a render borrows one exclusively (Pango font maps are not thread-safe)
+        self._font_configs: List[FontConfiguration] = []
+        self._font_configs_lock = threading.Lock()
+    
+    @contextmanager
+    def _font_config(self):
+        with self._font_configs_lock:
+            font_config = self._font_configs.pop() if self._font_configs else None
+        if font_config is None:
+            font_config = FontConfiguration()
+        try:
+            yield font_config
+        finally:
+            with self._font_configs_lock:
+                self._font_configs.append(font_config)
+    
+    def _write_pdf(self, html_content: str, output_path: str = None):
+        """Render template HTML, resolving its stylesheet link (returns bytes when output_path is None)"""
+        with self._font_config() as font_config:
+            return HTML(string=html_content, base_url=TEMPLATE_DIR).write_pdf(output_path, font_config=font_config)
+    
+    def warm_up(self):
+        """Render a sample card so the first real job finds templates compiled and fonts loaded"""
+        for name in TEMPLATES:
+            self.env.get_template(name)
+        self._write_pdf(self.env.get_template('visiting_card_template.html').render())
+        logger.info("🔥 Template renderer warmed up")
         
     def _format_currency(self, value: str) -> str:
         """Format number as currency with commas"""
@@ -89,7 +141,7 @@ class TemplateRenderer:
         
         # Generate PDF using WeasyPrint
         try:
-            HTML(string=html_content).write_pdf(output_path)
+            self._write_pdf(html_content, output_path)
         except Exception as e:
             # Enhanced error message
             import traceback
@@ -252,7 +304,7 @@ class TemplateRenderer:
         html_content = template.render(**template_data)
         
         # Generate PDF using WeasyPrint
-        HTML(string=html_content).write_pdf(output_path)
+        self._write_pdf(html_content, output_path)
         
         return output_path
     
@@ -344,6 +396,20 @@ class TemplateRenderer:
         html_content = template.render(**template_data)
         
         # Generate PDF using WeasyPrint
-        HTML(string=html_content).write_pdf(output_path)
+        self._write_pdf(html_content, output_path)
         
         return output_path
+
+
+# Singleton instance
+_template_renderer = None
+_template_renderer_lock = threading.Lock()
+
+def get_template_renderer() -> TemplateRenderer:
+    """Get or create the template renderer for this process"""
+    global _template_renderer
+    if _template_renderer is None:
+        with _template_renderer_lock:
+            if _template_renderer is None:
+                _template_renderer = TemplateRenderer()
+    return _template_renderer
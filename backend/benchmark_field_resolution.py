@@ -0,0 +1,184 @@
+"""
+Micro-benchmark PDF field resolution per document (per-call key walk vs FieldContext)
+
+Usage:
+    python benchmark_field_resolution.py [--repeat N]
+
+Replays, for every generate_* builder of PDFGeneratorService, the _get_value()
+calls written in its source (collected with ast) against a realistic
+application. The baseline is the resolver _get_value used before FieldContext:
+re-split keys, walk KEY_MAPPING and probe questionnaire/extraction per call,
+formatting debug f-strings. Both must return identical values.
+
+The context is built once per application (reported separately) and every
+lookup reads its frozen tables; the last row times a whole job including
+the build.
+"""
+import argparse
+import ast
+import inspect
+import os
+import sys
+import timeit
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loguru import logger
+
+from app.services import pdf_generator_service
+from app.services.auto_fill_service import auto_fill_questionnaire
+from app.services.field_context import FieldContext
+
+KEY_MAPPING = pdf_generator_service.PDFGeneratorService.KEY_MAPPING
+
+
+def walk_value(application, questionnaire_data, extracted_data, *keys) -> str:
+    """Reference: the per-call resolver FieldContext replaced"""
+    for key in keys:
+        clean_key = key.split('.')[-1] if '.' in key else key
+        if application:
+            if clean_key in ['full_name', 'applicant_name', 'name']:
+                if application.applicant_name:
+                    return application.applicant_name
+            elif clean_key in ['email', 'applicant_email']:
+                if application.applicant_email:
+                    return application.applicant_email
+            elif clean_key in ['phone', 'phone_number', 'applicant_phone']:
+                if application.applicant_phone:
+                    return application.applicant_phone
+
+    for key in keys:
+        clean_key = key.split('.')[-1] if '.' in key else key
+        value = questionnaire_data.get(clean_key)
+        if value and str(value).strip():
+            logger.debug(f"✅ Found '{key}' in questionnaire: {value}")
+            return str(value)
+        value = questionnaire_data.get(key)
+        if value and str(value).strip():
+            logger.debug(f"✅ Found '{key}' in questionnaire: {value}")
+            return str(value)
+        if clean_key in KEY_MAPPING:
+            for mapped_key in KEY_MAPPING[clean_key]:
+                if '.' not in mapped_key:
+                    value = questionnaire_data.get(mapped_key)
+                    if value and str(value).strip():
+                        logger.debug(f"✅ Found '{key}' via mapping '{mapped_key}' in questionnaire: {value}")
+                        return str(value)
+
+    for key in keys:
+        if '.' in key:
+            doc_type, field = key.split('.', 1)
+            if doc_type in extracted_data:
+                value = extracted_data[doc_type].get(field)
+                if value and str(value).strip():
+                    logger.debug(f"✅ Found '{key}' in extracted_data: {value}")
+                    return str(value)
+
+    for key in keys:
+        clean_key = key.split('.')[-1] if '.' in key else key
+        if clean_key in KEY_MAPPING:
+            for mapped_key in KEY_MAPPING[clean_key]:
+                if '.' in mapped_key:
+                    doc_type, field = mapped_key.split('.', 1)
+                    if doc_type in extracted_data:
+                        value = extracted_data[doc_type].get(field)
+                        if value and str(value).strip():
+                            logger.debug(f"✅ Found '{key}' via mapping '{mapped_key}' in extraction: {value}")
+                            return str(value)
+
+    logger.debug(f"⚠️  Missing value for keys: {keys} (even after auto-fill)")
+    return ""
+
+
+def builder_lookups():
+    """{builder name: [key tuples of its literal _get_value() calls, in source order]}"""
+    tree = ast.parse(inspect.getsource(pdf_generator_service))
+    lookups = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("generate_"):
+            calls = []
+            for call in ast.walk(node):
+                if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                        and call.func.attr == "_get_value"
+                        and all(isinstance(arg, ast.Constant) and isinstance(arg.value, str) for arg in call.args)):
+                    calls.append(tuple(arg.value for arg in call.args))
+            if calls:
+                lookups[node.name] = calls
+    return lookups
+
+
+def sample_application():
+    """Application row, questionnaire (user answers + auto-fill) and extraction of a typical applicant"""
+    application = SimpleNamespace(applicant_name="John Doe", applicant_email="john@example.com", applicant_phone="")
+    answers = {"job_title": "Engineer", "company_name": "Acme Ltd", "arrival_date": "2026-12-01", "travel_purpose": ""}
+    questionnaire, _ = auto_fill_questionnaire(answers)
+    questionnaire = {**questionnaire, **{k: v for k, v in answers.items() if v}}
+    extracted = {
+        "passport_copy": {"passport_number": "A1234567", "date_of_birth": "1990-01-01", "issue_date": "2020-01-01", "confidence": 92},
+        "nid_bangla": {"nid_number": "1234567890", "father_name": "Richard Doe", "permanent_address": "Dhaka"},
+        "hotel_booking": {"hotel_name": "Hotel Borg", "check_in_date": "2026-12-01"},
+    }
+    return application, questionnaire, extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF field resolution per document")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")  # Debug off, as in production
+
+    application, questionnaire, extracted = sample_application()
+    lookups = builder_lookups()
+
+    def per_call(calls):
+        return [walk_value(application, questionnaire, extracted, *keys) for keys in calls]
+
+    def build():
+        return FieldContext(application, questionnaire, extracted, KEY_MAPPING)
+
+    def context(fields, calls):
+        return [fields.get(*keys) for keys in calls]
+
+    fields = build()
+    for name, calls in lookups.items():
+        if per_call(calls) != context(fields, calls):
+            print(f"❌ FieldContext disagrees with the per-call resolver in {name}")
+            return 1
+
+    print("=" * 80)
+    print(f"FIELD RESOLUTION BENCHMARK - {len(lookups)} document builders, best of {args.repeat}")
+    print("=" * 80)
+
+    t_build = min(timeit.repeat(build, number=1, repeat=args.repeat))
+    print(f"context build (once per application): {t_build * 1e6:.1f} µs "
+          f"({len(questionnaire)} answers, {sum(len(d) for d in extracted.values())} extracted fields)")
+    print()
+    print(f"{'document builder':<30} {'lookups':>7} {'per-call µs':>12} {'context µs':>11} {'speedup':>8}")
+
+    totals = {"per_call": 0.0, "context": 0.0}
+    for name, calls in sorted(lookups.items()):
+        t_per_call = min(timeit.repeat(lambda: per_call(calls), number=1, repeat=args.repeat))
+        t_context = min(timeit.repeat(lambda: context(fields, calls), number=1, repeat=args.repeat))
+        totals["per_call"] += t_per_call
+        totals["context"] += t_context
+        print(f"{name:<30} {len(calls):>7} {t_per_call * 1e6:>12.1f} {t_context * 1e6:>11.1f} "
+              f"{t_per_call / t_context:>7.1f}x")
+
+    print("-" * 80)
+    print(f"{'all documents':<30} {sum(len(c) for c in lookups.values()):>7} {totals['per_call'] * 1e6:>12.1f} "
+          f"{totals['context'] * 1e6:>11.1f} {totals['per_call'] / totals['context']:>7.1f}x")
+
+    # A generation job: one context build, then every document's lookups against it
+    all_calls = [keys for calls in lookups.values() for keys in calls]
+    t_job = min(timeit.repeat(lambda: context(build(), all_calls), number=1, repeat=args.repeat))
+    print(f"{'whole job incl. build':<30} {len(all_calls):>7} {totals['per_call'] * 1e6:>12.1f} "
+          f"{t_job * 1e6:>11.1f} {totals['per_call'] / t_job:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Benchmark PDF text extraction per backend (sequential vs process pool)
+
+Usage:
+    python benchmark_pdf_extraction.py [pdf_dir] [--repeat N]
+
+Defaults to the sample PDFs in ../sample. Backends that are not installed
+(pypdfium2, PyMuPDF) are skipped.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loguru import logger
+
+from app.config import settings
+from app.services.pdf_text_backends import (
+    AUTO_BACKEND_ORDER, TEXT_BACKENDS, extract_page_texts, shutdown_process_pool
+)
+
+
+def time_extraction(pdf_files, backend, parallel, repeat):
+    """Best-of-N wall time to extract every file, plus total characters"""
+    best = None
+    chars = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        chars = 0
+        for pdf_file in pdf_files:
+            _, _, page_texts = extract_page_texts(pdf_file, backend, parallel=parallel)
+            chars += len("\n".join(text for text in page_texts if text is not None))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, chars
+
+
+def main():
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample")
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction backends")
+    parser.add_argument("pdf_dir", nargs="?", default=default_dir)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.remove()  # Per-page logging would dominate the timings
+
+    pdf_files = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+    if not pdf_files:
+        print(f"❌ No PDFs found in {args.pdf_dir}")
+        return 1
+
+    print("=" * 80)
+    print(f"PDF EXTRACTION BENCHMARK - {len(pdf_files)} files, best of {args.repeat}")
+    print(f"Process pool: {min(settings.PDF_EXTRACT_WORKERS, os.cpu_count() or 1)} workers, CPUs: {os.cpu_count()}")
+    print("=" * 80)
+
+    baseline = None
+    for name in reversed(AUTO_BACKEND_ORDER):  # pypdf2 first, as the baseline
+        backend_cls = TEXT_BACKENDS[name]
+        if not backend_cls.is_available():
+            print(f"{name:<12} not installed, skipped")
+            continue
+
+        backend = backend_cls()
+        sequential, chars = time_extraction(pdf_files, backend, False, args.repeat)
+        parallel, _ = time_extraction(pdf_files, backend, True, args.repeat)
+        baseline = baseline or sequential
+
+        print(
+            f"{name:<12} sequential {sequential:7.3f}s  "
+            f"parallel {parallel:7.3f}s  "
+            f"speedup vs pypdf2 {baseline / min(sequential, parallel):5.1f}x  "
+            f"({chars} chars)"
+        )
+
+    shutdown_process_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Micro-benchmark the intelligent questionnaire analyzer (rebuilt requirements table vs import-time registry)
+
+Usage:
+    python benchmark_questionnaire_analyzer.py [--uploaded N] [--repeat N]
+
+The baseline is the lookup path the analyzer used before the registry: every
+get_requirements() call rebuilt the whole document → FieldRequirement table.
+Both paths must produce identical questions and summaries.
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loguru import logger
+
+from app.models import DocumentType
+from app.services.document_requirements import _build_requirements
+from app.services.intelligent_questionnaire_analyzer import IntelligentQuestionnaireAnalyzer
+
+
+class RebuildingRequirementsMapping:
+    """Reference: the table is rebuilt on every lookup, as get_requirements() used to"""
+
+    @staticmethod
+    def get_requirements(document_type):
+        return _build_requirements().get(document_type, [])
+
+    @staticmethod
+    def get_critical_requirements(document_type):
+        return [r for r in RebuildingRequirementsMapping.get_requirements(document_type) if r.priority == "critical"]
+
+
+def make_request(rng: random.Random, uploaded_count: int):
+    """Uploaded document types plus extracted data with mixed confidence"""
+    uploaded = rng.sample(list(DocumentType), uploaded_count)
+    extracted = {}
+    for doc_type in uploaded:
+        extracted[doc_type.value] = {
+            "confidence": rng.choice([40, 72, 95]),
+            "full_name": "John Doe",
+            "passport_number": "A1234567",
+            "date_of_birth": "1990-01-01",
+            "account_number": "",
+        }
+    return uploaded, extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the intelligent questionnaire analyzer")
+    parser.add_argument("--uploaded", type=int, default=6, help="Uploaded documents per request")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    logger.remove()  # The analyzer logs every step; keep the timings clean
+
+    rng = random.Random(42)
+    uploaded, extracted = make_request(rng, args.uploaded)
+
+    rebuilding = IntelligentQuestionnaireAnalyzer()
+    rebuilding.requirements_map = RebuildingRequirementsMapping()
+    registry = IntelligentQuestionnaireAnalyzer()
+
+    def run(analyzer):
+        questions, summary = analyzer.analyze_and_generate_questions(list(uploaded), extracted)
+        return sorted(q.field_key for q in questions), summary
+
+    if run(rebuilding) != run(registry):
+        print("❌ Registry lookups disagree with the rebuilt table")
+        return 1
+
+    print("=" * 80)
+    print(f"QUESTIONNAIRE ANALYZER BENCHMARK - {args.uploaded} uploaded documents, best of {args.repeat}")
+    print("=" * 80)
+
+    timings = {}
+    for name, analyzer in (("rebuilt", rebuilding), ("registry", registry)):
+        timings[name] = min(timeit.repeat(lambda: run(analyzer), number=1, repeat=args.repeat))
+        print(f"{name:<12} {timings[name] * 1e6:10.1f} µs per request")
+
+    print(f"speedup      {timings['rebuilt'] / timings['registry']:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
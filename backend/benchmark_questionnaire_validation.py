@@ -0,0 +1,102 @@
+"""
+Micro-benchmark smart questionnaire validation (dict interpreter vs compiled questions)
+
+Usage:
+    python benchmark_questionnaire_validation.py [--answers N] [--repeat N]
+
+The baseline is the per-request path smart-save used before questions were
+compiled: rebuild {key: question} from get_all_questions() and interpret each
+question dict per answer. Both paths must return identical results.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.smart_questionnaire_service import get_all_questions, get_compiled_question
+
+
+def interpret_answer(question, answer):
+    """Reference: the dict-interpreting validate_answer the compiled questions replaced"""
+    if question.get("required") and not answer:
+        return False, f"{question.get('label')} is required"
+    if not answer:
+        return True, ""
+    validation = question.get("validation", {})
+    if question["type"] == "email":
+        pattern = validation.get("pattern", "^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{2,}$")
+        if not re.match(pattern, str(answer)):
+            return False, "Invalid email format"
+    elif question["type"] == "number":
+        try:
+            num = float(answer)
+            if "min" in validation and num < validation["min"]:
+                return False, f"Must be at least {validation['min']}"
+            if "max" in validation and num > validation["max"]:
+                return False, f"Must be at most {validation['max']}"
+        except (ValueError, TypeError):
+            return False, "Must be a valid number"
+    elif question["type"] == "text":
+        if "min_length" in validation and len(str(answer)) < validation["min_length"]:
+            return False, f"Must be at least {validation['min_length']} characters"
+        if "max_length" in validation and len(str(answer)) > validation["max_length"]:
+            return False, f"Must be at most {validation['max_length']} characters"
+    return True, ""
+
+
+SAMPLE_VALUES = ["", None, "x", "John Doe", "a" * 150, "john@example.com", "bad@", "42", "-1", "3000", "abc", ["item"], 0, 7.5]
+
+
+def interpreted_save(answers):
+    questions_map = {q["key"]: q for q in get_all_questions()}
+    results = []
+    for key, answer in answers:
+        question = questions_map.get(key)
+        if question is not None:
+            results.append(interpret_answer(question, answer))
+    return results
+
+
+def compiled_save(answers):
+    results = []
+    for key, answer in answers:
+        question = get_compiled_question(key)
+        if question is not None:
+            results.append(question.validate(answer))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark questionnaire answer validation")
+    parser.add_argument("--answers", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    keys = [q["key"] for q in get_all_questions()]
+    answers = [(rng.choice(keys), rng.choice(SAMPLE_VALUES)) for _ in range(args.answers)]
+
+    if interpreted_save(answers) != compiled_save(answers):
+        print("❌ Compiled validation disagrees with the reference interpreter")
+        return 1
+
+    print("=" * 80)
+    print(f"QUESTIONNAIRE VALIDATION BENCHMARK - {args.answers} answers, best of {args.repeat}")
+    print("=" * 80)
+
+    timings = {}
+    for name, fn in (("interpreted", interpreted_save), ("compiled", compiled_save)):
+        timings[name] = min(timeit.repeat(lambda: fn(answers), number=1, repeat=args.repeat))
+        print(f"{name:<12} {timings[name] * 1e6:10.1f} µs per save  ({timings[name] * 1e9 / args.answers:7.1f} ns per answer)")
+
+    print(f"speedup      {timings['interpreted'] / timings['compiled']:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
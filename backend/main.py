@@ -9,6 +9,11 @@ import sys
 
 from app.config import settings
 from app.api import router as api_router
+from app.services.generation_queue import get_worker_pool
+from app.services.extraction_pipeline import get_extraction_pipeline
+from app.services.pdf_text_backends import shutdown_process_pool
+from app.services.ocr_service import shutdown_ocr_service
+from app.services.render_service import shutdown_render_service
 
 
 # Configure logger
@@ -70,18 +75,38 @@ async def health_check():
     }
 
 
+@app.get("/health/llm-cache")
+async def llm_cache_stats():
+    """LLM response cache hit/miss counters (latency and quota saved)"""
+    if not settings.LLM_CACHE_ENABLED:
+        return {"enabled": False}
+    from app.services.llm_cache import get_llm_cache
+    return {"enabled": True, **get_llm_cache().stats()}
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup"""
     logger.info(f"Starting {settings.APP_NAME} v{settings.VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"Database: {settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}")
+    
+    # Start document generation workers (set GENERATION_WORKERS=0 to run them only in worker.py)
+    get_worker_pool().start()
+    
+    # Start background text extraction (re-submits documents left pending)
+    get_extraction_pipeline().start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown"""
     logger.info(f"Shutting down {settings.APP_NAME}")
+    get_worker_pool().stop()
+    get_extraction_pipeline().stop()
+    shutdown_process_pool()
+    shutdown_ocr_service()
+    shutdown_render_service()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Import-time check for API cold start
+
+Imports the app in a fresh interpreter under `python -X importtime` and fails
+when any heavy engine (PDF rendering, OCR, LLM SDK) is loaded at import:
+those stay behind service factories until first use, so a process that only
+serves reads or uploads never pays for them. Prints the total import time and
+the slowest top-level packages so time-to-healthy can be tracked.
+
+Usage:
+    python test_import_time.py [--module main] [--budget-ms 1500]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Top-level packages that must only load on first use
+HEAVY_MODULES = {
+    "reportlab", "weasyprint", "jinja2", "google.generativeai",
+    "PyPDF2", "pypdfium2", "fitz", "PIL", "pytesseract", "pdf2image",
+}
+
+
+def measure_imports(module: str):
+    """[(module name, self µs, cumulative µs)] of a fresh `import <module>`, in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def heavy_modules_loaded(imports):
+    """Entries of HEAVY_MODULES that were imported (directly or through a submodule)"""
+    names = {name for name, _, _ in imports}
+    return sorted(
+        heavy for heavy in HEAVY_MODULES
+        if any(name == heavy or name.startswith(heavy + ".") for name in names)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check what importing the app loads and how long it takes")
+    parser.add_argument("--module", default="main", help="Module to import (default: main, the API app)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail when the import takes longer")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"IMPORT TIME CHECK - import {args.module}")
+    print("=" * 80)
+
+    try:
+        imports = measure_imports(args.module)
+    except RuntimeError as e:
+        print(f"❌ import {args.module} failed: {e}")
+        return 1
+
+    total_ms = next(cumulative for name, _, cumulative in imports if name == args.module) / 1000
+    by_package = defaultdict(int)
+    for name, self_us, _ in imports:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"total: {total_ms:.0f} ms, {len(imports)} modules")
+    print()
+    print(f"{'top-level package':<30} {'ms':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"{package:<30} {self_us / 1000:>8.1f}")
+    print()
+
+    failures = 0
+    heavy = heavy_modules_loaded(imports)
+    if heavy:
+        failures += 1
+        print(f"❌ Heavy modules loaded at import: {', '.join(heavy)}")
+    else:
+        print("✅ No heavy modules loaded at import")
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            failures += 1
+            print(f"❌ Import took {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        else:
+            print(f"✅ Import within budget ({total_ms:.0f} / {args.budget_ms:.0f} ms)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
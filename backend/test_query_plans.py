@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Query plan check for hot per-application queries
+
+Runs the real service code paths against the configured Postgres database
+(migrated to head), captures the SELECTs they issue and EXPLAINs each one with
+sequential scans disabled. With enable_seqscan = off the planner only falls
+back to a Seq Scan when no index can serve the filter, so any Seq Scan on a
+hot table means a missing index.
+
+Usage:
+    DATABASE_URL=postgresql://... python test_query_plans.py
+
+Skips (exit 0) when DATABASE_URL is not Postgres or cannot be reached.
+"""
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.database import SessionLocal, engine
+from app.models import Document, ExtractedData, GeneratedDocument, GenerationStatus
+from app.services.analysis_pipeline import latest_session
+from app.services.bundle_service import collect_bundle_members
+from app.services.generation_queue import (
+    _status_without_job, build_generation_status, completed_documents, get_active_job, get_documents_to_generate
+)
+from app.services.questionnaire_store import load_answers
+
+# Tables that grow with every application; plans on these must use an index
+HOT_TABLES = {
+    "documents", "extracted_data", "generated_documents",
+    "questionnaire_responses", "analysis_sessions", "generation_jobs"
+}
+
+APPLICATION_ID = 1
+
+HOT_PATHS = [
+    ("generation status", lambda db: build_generation_status(db, APPLICATION_ID)),
+    ("generation status without job", lambda db: _status_without_job(db, APPLICATION_ID)),
+    ("completed documents", lambda db: completed_documents(db, APPLICATION_ID)),
+    ("active generation job", lambda db: get_active_job(db, APPLICATION_ID)),
+    ("documents to generate", lambda db: get_documents_to_generate(
+        db, SimpleNamespace(id=APPLICATION_ID, application_type="business")
+    )),
+    ("bundle members", lambda db: collect_bundle_members(db, APPLICATION_ID)),
+    ("latest analysis session", lambda db: latest_session(db, APPLICATION_ID)),
+    ("questionnaire answers", lambda db: load_answers(db, APPLICATION_ID)),
+    ("questionnaire answers by key", lambda db: load_answers(db, APPLICATION_ID, ["full_name", "email"])),
+    ("application documents", lambda db: db.query(Document).filter(Document.application_id == APPLICATION_ID).all()),
+    ("uploaded documents", lambda db: db.query(Document).filter(
+        Document.application_id == APPLICATION_ID, Document.is_uploaded == True
+    ).all()),
+    ("extracted data", lambda db: db.query(ExtractedData).filter(ExtractedData.application_id == APPLICATION_ID).all()),
+    ("extracted data by document", lambda db: db.query(ExtractedData).filter(
+        ExtractedData.document_id.in_([1, 2, 3])
+    ).all()),
+    ("generated documents", lambda db: db.query(GeneratedDocument).filter(
+        GeneratedDocument.application_id == APPLICATION_ID,
+        GeneratedDocument.status == GenerationStatus.COMPLETED
+    ).all()),
+]
+
+
+def capture_selects(fn):
+    """Run a code path and return the (statement, parameters) of every SELECT it issued"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        db.rollback()
+        db.close()
+    return statements
+
+
+def seq_scans(plan, found=None):
+    """Relations read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan tree"""
+    found = [] if found is None else found
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        seq_scans(child, found)
+    return found
+
+
+def main():
+    if engine.dialect.name != "postgresql":
+        print(f"⏭️  Skipped: needs Postgres (DATABASE_URL uses {engine.dialect.name})")
+        return 0
+    try:
+        with engine.connect():
+            pass
+    except OperationalError as e:
+        print(f"⏭️  Skipped: Postgres not reachable ({e.orig})")
+        return 0
+
+    print("=" * 80)
+    print("QUERY PLAN CHECK - hot per-application queries")
+    print("=" * 80)
+
+    failures = 0
+    for name, fn in HOT_PATHS:
+        for statement, parameters in capture_selects(fn):
+            with engine.connect() as conn:
+                conn.exec_driver_sql("SET enable_seqscan = off")
+                plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            scanned = sorted({table for table in seq_scans(plan[0]["Plan"]) if table in HOT_TABLES})
+            if scanned:
+                failures += 1
+                print(f"❌ {name}: sequential scan on {', '.join(scanned)}")
+                print(f"   {' '.join(statement.split())[:200]}")
+            else:
+                print(f"✅ {name}")
+
+    print()
+    if failures:
+        print(f"❌ {failures} queries scan hot tables sequentially")
+        return 1
+    print("✅ All hot queries use indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
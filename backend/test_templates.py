@@ -76,6 +76,47 @@ def test_asset_valuation():
         traceback.print_exc()
         return False
 
+def test_linked_stylesheet_matches_inline():
+    """Linked stylesheet renders pixel-identical to the template's former inline <style>"""
+    print("\n" + "=" * 60)
+    print("Testing Linked Stylesheet vs Inline <style>")
+    print("=" * 60)
+    
+    from pdf2image import convert_from_bytes
+    from PIL import ImageChops
+    from weasyprint import HTML
+    from app.services.template_renderer import TEMPLATE_DIR
+    
+    renderer = TemplateRenderer()
+    html = renderer.env.get_template('visiting_card_template.html').render(
+        full_name='MD SWAPON SHEIKH', designation='CEO & Managing Director', phone='+880 1777-265211',
+        email='swapon@company.com', website='www.swcompany.com', address='Chandpur Sadar, Chandpur, Bangladesh'
+    )
+    
+    # Before: stylesheet inlined as it was in the template (author origin)
+    link = '<link rel="stylesheet" href="css/visiting_card_template.css">'
+    with open(os.path.join(TEMPLATE_DIR, 'css', 'visiting_card_template.css'), encoding='utf-8') as f:
+        inline_html = html.replace(link, f"<style>\n{f.read()}</style>")
+    
+    try:
+        before = convert_from_bytes(HTML(string=inline_html).write_pdf(), dpi=100)
+        after = convert_from_bytes(renderer._write_pdf(html), dpi=100)
+        if len(before) != len(after):
+            print(f"❌ ERROR: {len(before)} page(s) inline vs {len(after)} linked")
+            return False
+        for number, (page_before, page_after) in enumerate(zip(before, after), 1):
+            diff = ImageChops.difference(page_before.convert('RGB'), page_after.convert('RGB')).getbbox()
+            if diff:
+                print(f"❌ ERROR: page {number} differs in region {diff}")
+                return False
+        print(f"✅ SUCCESS: {len(after)} page(s) identical with the linked stylesheet")
+        return True
+    except Exception as e:
+        print(f"❌ ERROR: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 if __name__ == "__main__":
     print("\n🚀 Starting Template Generation Tests\n")
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -84,6 +125,7 @@ if __name__ == "__main__":
     # Run tests
     visiting_card_ok = test_visiting_card()
     asset_valuation_ok = test_asset_valuation()
+    stylesheet_ok = test_linked_stylesheet_matches_inline()
     
     # Summary
     print("\n" + "=" * 60)
@@ -91,8 +133,9 @@ if __name__ == "__main__":
     print("=" * 60)
     print(f"Visiting Card: {'✅ PASSED' if visiting_card_ok else '❌ FAILED'}")
     print(f"Asset Valuation: {'✅ PASSED' if asset_valuation_ok else '❌ FAILED'}")
+    print(f"Linked Stylesheet: {'✅ PASSED' if stylesheet_ok else '❌ FAILED'}")
     
-    if visiting_card_ok and asset_valuation_ok:
+    if visiting_card_ok and asset_valuation_ok and stylesheet_ok:
         print("\n🎉 All tests passed! Templates are working correctly.")
         print("\nGenerated files:")
         print("  - generated/test_visiting_card.pdf")
@@ -0,0 +1,51 @@
+"""
+Standalone document generation worker
+Runs a GenerationWorkerPool without the API so generation capacity can be scaled
+independently: `python worker.py --workers 4` (run as many processes as needed)
+"""
+import argparse
+import signal
+import sys
+import threading
+
+from loguru import logger
+
+from app.config import settings
+from app.services.generation_queue import GenerationWorkerPool
+from app.services.render_service import shutdown_render_service
+
+
+# Configure logger
+logger.remove()
+logger.add(
+    sys.stdout,
+    colorize=True,
+    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
+    level=settings.LOG_LEVEL
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run document generation workers")
+    parser.add_argument("--workers", type=int, default=max(settings.GENERATION_WORKERS, 1),
+                        help="Number of worker threads in this process")
+    args = parser.parse_args()
+
+    pool = GenerationWorkerPool(num_workers=args.workers)
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"Received signal {signum}, stopping workers...")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    pool.start()
+    stop_event.wait()
+    pool.stop()
+    shutdown_render_service()
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,7 @@ import {
 } from '@mui/icons-material';
 import { documentService } from '../services/apiService';
 import { API_BASE_URL } from '../config';
+import { subscribeToProgress } from '../services/progressStream';
 
 /**
  * AnalysisSection Component - Redesigned
@@ -83,11 +84,11 @@ const AnalysisSection = ({ applicationId, onAnalysisComplete, onOpenQuestionnair
     };
   }, [isAnalyzing]);
 
-  // Cleanup polling on unmount
+  // Close the status stream on unmount
   useEffect(() => {
     return () => {
       if (polling) {
-        clearInterval(polling);
+        polling();
       }
     };
   }, [polling]);
@@ -152,41 +153,37 @@ const AnalysisSection = ({ applicationId, onAnalysisComplete, onOpenQuestionnair
   };
 
   const startPolling = () => {
-    // Clear existing polling
+    // Close any existing stream
     if (polling) {
-      clearInterval(polling);
+      polling();
     }
 
-    // Poll every 2 seconds
-    const interval = setInterval(async () => {
-      try {
-        const response = await fetch(`${API_BASE_URL}/analysis/status/${applicationId}`);
-        if (response.ok) {
-          const data = await response.json();
-          setAnalysisStatus(data);
-
-          // Stop polling if completed or failed
-          if (data.status === 'completed' || data.status === 'failed') {
-            clearInterval(interval);
-            setPolling(null);
-            setIsAnalyzing(false);
-
-            if (data.status === 'completed') {
-              fetchAnalysisResults(true); // true = show popup
-              if (onAnalysisComplete) {
-                onAnalysisComplete(data);
-              }
-            } else if (data.status === 'failed') {
-              setError('Analysis failed. Please try again.');
+    // Live updates over SSE (falls back to polling every 2 seconds)
+    const stop = subscribeToProgress({
+      streamUrl: `${API_BASE_URL}/analysis/events/${applicationId}`,
+      pollUrl: `${API_BASE_URL}/analysis/status/${applicationId}`,
+      isFinal: (data) => data.status === 'completed' || data.status === 'failed',
+      onUpdate: (data) => {
+        setAnalysisStatus(data);
+
+        if (data.status === 'completed' || data.status === 'failed') {
+          setPolling(null);
+          setIsAnalyzing(false);
+
+          if (data.status === 'completed') {
+            fetchAnalysisResults(true); // true = show popup
+            if (onAnalysisComplete) {
+              onAnalysisComplete(data);
             }
+          } else if (data.status === 'failed') {
+            setError('Analysis failed. Please try again.');
           }
         }
-      } catch (err) {
-        console.error('Error polling status:', err);
       }
-    }, 2000);
+    });
 
-    setPolling(interval);
+    // Functional form: store the stop function itself, not its result
+    setPolling(() => stop);
   };
 
   const fetchAnalysisResults = async (showPopup = true) => {
@@ -30,6 +30,7 @@ import {
   Download
 } from '@mui/icons-material';
 import axios from 'axios';
+import { subscribeToProgress } from '../services/progressStream';
 
 /**
  * GenerationSection Component - Enhanced
@@ -44,6 +45,7 @@ const GenerationSection = ({ applicationId, applicantName = 'Applicant' }) => {
   const [completedDocuments, setCompletedDocuments] = useState([]);
   const [errors, setErrors] = useState([]);
   const [isGenerating, setIsGenerating] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false); // Opened once the job is queued
   const [isDownloading, setIsDownloading] = useState(false);
 
   // All 16 document types for final ZIP
@@ -108,41 +110,34 @@ const GenerationSection = ({ applicationId, applicantName = 'Applicant' }) => {
     fetchInitialStatus();
   }, [applicationId]);
 
-  // Poll for status updates during generation
+  // Live status updates during generation (SSE, falls back to polling)
   useEffect(() => {
-    let interval;
-    
-    if (isGenerating) {
-      interval = setInterval(async () => {
-        try {
-          const response = await axios.get(
-            `${API_BASE_URL}/generate/${applicationId}/status`
-          );
-          
-          const data = response.data;
-          setStatus(data.status);
-          setProgress(data.progress);
-          setCurrentDocument(data.current_document);
-          setDocumentsCompleted(data.documents_completed);
-          setTotalDocuments(data.total_documents); // Get dynamic count from backend
-          setCompletedDocuments(data.completed_documents || []);
-          setErrors(data.errors || []);
-          
-          // Stop polling if completed or failed
-          if (data.status === 'completed' || data.status === 'failed') {
-            setIsGenerating(false);
-            clearInterval(interval);
-          }
-        } catch (error) {
-          console.error('Error fetching generation status:', error);
+    if (!isStreaming) return undefined;
+
+    const stop = subscribeToProgress({
+      streamUrl: `${API_BASE_URL}/generate/${applicationId}/events`,
+      pollUrl: `${API_BASE_URL}/generate/${applicationId}/status`,
+      isFinal: (data) => ['completed', 'failed', 'partial'].includes(data.status),
+      onUpdate: (data) => {
+        setStatus(data.status);
+        setProgress(data.progress);
+        setCurrentDocument(data.current_document);
+        setDocumentsCompleted(data.documents_completed);
+        setTotalDocuments(data.total_documents); // Get dynamic count from backend
+        if (data.completed_documents) {
+          setCompletedDocuments(data.completed_documents);
         }
-      }, 2000); // Poll every 2 seconds
-    }
-    
-    return () => {
-      if (interval) clearInterval(interval);
-    };
-  }, [isGenerating, applicationId]);
+        setErrors(data.errors || []);
+
+        if (['completed', 'failed', 'partial'].includes(data.status)) {
+          setIsGenerating(false);
+          setIsStreaming(false);
+        }
+      }
+    });
+
+    return stop;
+  }, [isStreaming, applicationId]);
 
   const startGeneration = async () => {
     try {
@@ -152,6 +147,8 @@ const GenerationSection = ({ applicationId, applicantName = 'Applicant' }) => {
       setErrors([]);
       
       await axios.post(`${API_BASE_URL}/generate/${applicationId}/start`);
+      // Subscribe after queueing, so the stream does not replay the previous run's final status
+      setIsStreaming(true);
     } catch (error) {
       console.error('Error starting generation:', error);
       setIsGenerating(false);
@@ -0,0 +1,54 @@
+/**
+ * Progress streams - live status via Server-Sent Events
+ * Falls back to polling the status endpoint when EventSource is unavailable
+ * or the stream cannot be kept open (e.g. a proxy that buffers responses).
+ *
+ * Returns a function that stops listening.
+ */
+export const subscribeToProgress = ({ streamUrl, pollUrl, isFinal, onUpdate, pollInterval = 2000 }) => {
+  let source = null;
+  let timer = null;
+  let stopped = false;
+
+  const stop = () => {
+    stopped = true;
+    if (source) source.close();
+    if (timer) clearInterval(timer);
+  };
+
+  const handle = (data) => {
+    if (stopped) return;
+    onUpdate(data);
+    if (isFinal(data)) stop();
+  };
+
+  const startPolling = () => {
+    if (stopped || timer) return;
+    timer = setInterval(async () => {
+      try {
+        const response = await fetch(pollUrl);
+        if (response.ok) {
+          handle(await response.json());
+        }
+      } catch (err) {
+        console.error('Error polling status:', err);
+      }
+    }, pollInterval);
+  };
+
+  if (typeof window !== 'undefined' && 'EventSource' in window) {
+    source = new EventSource(streamUrl);
+    source.addEventListener('progress', (event) => handle(JSON.parse(event.data)));
+    source.onerror = () => {
+      // The server closes the stream after a final status (already stopped then)
+      if (stopped) return;
+      source.close();
+      source = null;
+      startPolling();
+    };
+  } else {
+    startPolling();
+  }
+
+  return stop;
+};